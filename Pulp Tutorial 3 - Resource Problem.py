@@ -48,3 +48,6 @@ print("Production of Car B = {}".format(B.varValue))
 print('Model profit vs non-model profit = {} vs {}'.format(
     pulp.value(model.objective), '300,000'))
 
+
+# What-if scenarios on profits and capacities (template model, process pool)
+# are in pulp_resource_scenarios.py
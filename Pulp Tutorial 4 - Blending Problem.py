@@ -28,4 +28,43 @@ ing_weight = pulp.LpVariable.dicts("weight kg", ((i, j) for i in sausage_types f
                                                  j in ingredients),
                                    lowBound=0,
                                    cat='Continuous')
-print(ing_weight)
\ No newline at end of file
+print(ing_weight)
+
+# Objective Function
+cost = {'pork': 4.32, 'wheat': 2.46, 'starch': 1.86}
+model += (pulp.lpSum(cost[j] * ing_weight[(i, j)] for i in sausage_types
+                     for j in ingredients)), 'Total cost of ingredients'
+
+# Constraints
+"""Note: 350 economy and 500 premium sausages of 0.05 kg each.  Economy
+       sausages are at least 40% pork and premium sausages at least 60%;
+       both are at most 25% starch.  30 kg of pork, 20 kg of wheat and
+       17 kg of starch are available, and at least 23 kg of pork has to be
+       used because it is going out of date.
+"""
+demand = {'economy': 350 * 0.05, 'premium': 500 * 0.05}
+min_pork = {'economy': 0.4, 'premium': 0.6}
+available = {'pork': 30, 'wheat': 20, 'starch': 17}
+
+for i in sausage_types:
+    total = pulp.lpSum(ing_weight[(i, j)] for j in ingredients)
+    model += total == demand[i]
+    model += ing_weight[(i, 'pork')] >= min_pork[i] * total
+    model += ing_weight[(i, 'starch')] <= 0.25 * total
+
+for j in ingredients:
+    model += pulp.lpSum(ing_weight[(i, j)]
+                        for i in sausage_types) <= available[j]
+model += pulp.lpSum(ing_weight[(i, 'pork')] for i in sausage_types) >= 23
+
+# Solve our problem
+model.solve()
+print(pulp.LpStatus[model.status])
+
+for var in ing_weight:
+    print('{} weight: {} kg'.format(var, ing_weight[var].value()))
+print('Total cost: {:.2f}'.format(pulp.value(model.objective)))
+
+
+# The same model from cost / composition / demand arrays, for hundreds of
+# products and ingredients, is in pulp_blending.py
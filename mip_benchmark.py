@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for the MIP / LP models in the repository.
+
+Each model is registered as a named case, built with the modeling layer it
+is written in (PuLP or Pyomo), and solved with every backend available on
+the machine:
+
+    cbc     PuLP's bundled CBC (PULP_CBC_CMD, or Pyomo's cbc plugin pointed
+            at the same executable)
+    glpk    glpsol, when installed
+    highs   highspy (pulp.HiGHS, or Pyomo's appsi Highs)
+
+Every repetition runs in a fresh (spawned) process, so peak RSS is per run
+and the solver's child process (CBC, glpsol) is included. A run records
+build time, solve time, status, objective, nodes, gap and peak RSS; the
+suite writes the median over repetitions to a JSON file and can compare it
+against a stored baseline:
+
+    python mip_benchmark.py --repeat 5
+    python mip_benchmark.py --update-baseline
+    python mip_benchmark.py --cases p0033 warehouse --backends highs
+
+The committed baseline (data/mip_benchmark_baseline.json) holds only what
+is portable across machines: status, objective and node count per
+case/backend. Wall-clock times and RSS depend on the host, so they are
+stored (and compared) only in a baseline written with --timings, which is
+meant to stay on the machine that recorded it:
+
+    python mip_benchmark.py --update-baseline --timings --baseline local.json
+    python mip_benchmark.py --baseline local.json
+
+The exit code is 1 when a regression is flagged.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import importlib
+import multiprocessing
+from datetime import datetime, timezone
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Pyomo case builders live in pyomo/
+sys.path.append(os.path.join(ROOT, 'pyomo'))
+
+BACKENDS = ('cbc', 'glpk', 'highs')
+BASELINE = os.path.join(ROOT, 'data', 'mip_benchmark_baseline.json')
+CASES = {}
+
+
+LAYER_MODULES = {'pulp': ('pulp',), 'pyomo': ('pyomo.environ',)}
+
+
+def register_case(name, layer, requires=()):
+    ''' Decorator registering a builder as a benchmark case.
+
+        layer :    'pulp' (builder returns an LpProblem) or 'pyomo' (builder
+                   returns a model with a single active Objective).
+        requires : modules the builder imports; they are imported before
+                   the build timer starts.
+    '''
+    def wrap(builder):
+        CASES[name] = (layer, builder, LAYER_MODULES[layer] + tuple(requires))
+        return builder
+    return wrap
+
+
+# Cases -----------------------------------------------------------------------
+@register_case('resource', 'pulp')
+def resource_case():
+    ''' Pulp Tutorial 3 - Resource Problem.py: car production profit. '''
+    import pulp
+    model = pulp.LpProblem('Profit_maximisation_problem', pulp.LpMaximize)
+    A = pulp.LpVariable('A', lowBound=0, cat='Integer')
+    B = pulp.LpVariable('B', lowBound=0, cat='Integer')
+    model += 30000 * A + 45000 * B, 'Profit'
+    model += 3 * A + 4 * B <= 30
+    model += 5 * A + 6 * B <= 60
+    model += 1.5 * A + 3 * B <= 21
+    return model
+
+
+@register_case('blending', 'pulp', requires=('pulp_blending',))
+def blending_case():
+    ''' Pulp Tutorial 4 - Blending Problem.py: sausage blend at least cost. '''
+    from pulp_blending import blend_arrays, build_blend_pulp, sausage_data
+    return build_blend_pulp(blend_arrays(**sausage_data()))[0]
+
+
+@register_case('blending_200x50', 'pulp', requires=('pulp_blending',))
+def blending_large_case():
+    ''' Random 200 products x 50 ingredients blend (pulp_blending). '''
+    from pulp_blending import random_blend, build_blend_pulp
+    return build_blend_pulp(random_blend(200, 50))[0]
+
+
+@register_case('p0033', 'pulp')
+def p0033_case():
+    ''' MIPLIB p0033 read from data/p0033.mps.txt (optimum 3089). '''
+    import pulp
+    return pulp.LpProblem.fromMPS(os.path.join(ROOT, 'data',
+                                               'p0033.mps.txt'))[1]
+
+
+@register_case('warehouse', 'pyomo', requires=('warehouse_matrix_model',))
+def warehouse_case(n_sites=20, n_customers=200, P=5, seed=0):
+    ''' ch3 warehouse location (P-median) on random distances. '''
+    from warehouse_matrix_model import build_warehouse_model
+    rng = np.random.default_rng(seed)
+    return build_warehouse_model(rng.uniform(1, 100, (n_sites, n_customers)),
+                                 P)
+
+
+@register_case('diet', 'pyomo', requires=('pyomo_ex_diet_problem',))
+def diet_case():
+    ''' pyomo_ex_diet_problem.py with the Pyomo Gallery data (diet.dat). '''
+    from pyomo_ex_diet_problem import model
+    return model.create_instance(os.path.join(ROOT, 'pyomo', 'diet.dat'))
+
+
+# Backends --------------------------------------------------------------------
+def _cbc_path():
+    import pulp
+    return pulp.PULP_CBC_CMD().path
+
+
+def backend_available(layer, backend):
+    if layer == 'pulp':
+        import pulp
+        solver = {'cbc': pulp.PULP_CBC_CMD, 'glpk': pulp.GLPK_CMD,
+                  'highs': pulp.HiGHS}[backend]
+        return solver(msg=False).available()
+    from pyomo.environ import SolverFactory
+    if backend == 'cbc':
+        return SolverFactory('cbc', executable=_cbc_path()).available(
+            exception_flag=False)
+    if backend == 'glpk':
+        return SolverFactory('glpk').available(exception_flag=False)
+    return SolverFactory('appsi_highs').available(exception_flag=False)
+
+
+def _relative_gap(objective, bound):
+    if objective is None or bound is None:
+        return None
+    return abs(objective - bound) / max(abs(objective), 1e-10)
+
+
+def _cbc_log_stats(path):
+    ''' Enumerated nodes and gap from a CBC log. '''
+    nodes = gap = None
+    with open(path) as f:
+        for line in f:
+            if line.startswith('Enumerated nodes:'):
+                nodes = int(line.split(':')[1])
+            elif line.startswith('Gap:'):
+                gap = float(line.split(':')[1])
+    return nodes, gap
+
+
+def _solve_pulp(problem, backend, time_limit):
+    import pulp
+    log = 'cbc_{}.log'.format(os.getpid())
+    if backend == 'cbc':
+        solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit,
+                                   logPath=log)
+    elif backend == 'glpk':
+        solver = pulp.GLPK_CMD(msg=False, timeLimit=time_limit)
+    else:
+        solver = pulp.HiGHS(msg=False, timeLimit=time_limit)
+    start = time.perf_counter()
+    problem.solve(solver)
+    elapsed = time.perf_counter() - start
+    status = {pulp.LpSolutionOptimal: 'optimal',
+              pulp.LpSolutionIntegerFeasible: 'feasible',
+              pulp.LpSolutionInfeasible: 'infeasible',
+              pulp.LpSolutionUnbounded: 'unbounded'}.get(problem.sol_status,
+                                                         'no_solution')
+    objective = pulp.value(problem.objective)
+    nodes = gap = None
+    if backend == 'cbc':
+        nodes, gap = _cbc_log_stats(log)
+        os.remove(log)
+    elif backend == 'highs':
+        info = problem.solverModel.getInfo()
+        nodes = info.mip_node_count if info.mip_node_count >= 0 else None
+        # PuLP hands HiGHS a negated objective when maximizing, so use the
+        # solver's own relative gap rather than mip_dual_bound
+        if problem.isMIP():
+            gap = info.mip_gap
+    return elapsed, status, objective, nodes, gap
+
+
+def _solve_pyomo(model, backend, time_limit):
+    from pyomo.environ import SolverFactory, Objective, value
+    from pyomo.opt import TerminationCondition
+    objective = next(model.component_data_objects(Objective, active=True))
+    if backend == 'highs':
+        from pyomo.contrib.appsi.solvers import Highs
+        opt = Highs()
+        opt.config.time_limit = time_limit
+        opt.config.load_solution = False
+        start = time.perf_counter()
+        res = opt.solve(model)
+        elapsed = time.perf_counter() - start
+        status = str(res.termination_condition).split('.')[-1]
+        info = opt._solver_model.getInfo()
+        nodes = info.mip_node_count if info.mip_node_count >= 0 else None
+        return (elapsed, status, res.best_feasible_objective, nodes,
+                _relative_gap(res.best_feasible_objective,
+                              res.best_objective_bound))
+    if backend == 'cbc':
+        opt = SolverFactory('cbc', executable=_cbc_path())
+        opt.options['sec'] = time_limit
+    else:
+        opt = SolverFactory('glpk')
+        opt.options['tmlim'] = time_limit
+    start = time.perf_counter()
+    res = opt.solve(model, load_solutions=False)
+    elapsed = time.perf_counter() - start
+    condition = res.solver.termination_condition
+    status = str(condition)
+    obj = None
+    if len(res.solution) > 0:
+        model.solutions.load_from(res)
+        obj = value(objective)
+    try:
+        nodes = int(res.solver.statistics.branch_and_bound
+                    .number_of_bounded_subproblems)
+    except (AttributeError, TypeError, ValueError):
+        nodes = None
+    if condition == TerminationCondition.optimal:
+        return elapsed, status, obj, nodes, 0.0
+    bound = res.problem[0].lower_bound if objective.is_minimizing() \
+        else res.problem[0].upper_bound
+    return elapsed, status, obj, nodes, _relative_gap(obj, bound)
+
+
+# Runner ----------------------------------------------------------------------
+def _peak_rss():
+    ''' Peak RSS in MiB of this process and of its waited-for children. '''
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) \
+        / 1024.0
+
+
+def run_case(name, backend, time_limit=60):
+    ''' Build and solve one case once, in the current process. '''
+    layer, builder, requires = CASES[name]
+    for module in requires:
+        importlib.import_module(module)
+    start = time.perf_counter()
+    model = builder()
+    build_time = time.perf_counter() - start
+    solve = _solve_pulp if layer == 'pulp' else _solve_pyomo
+    solve_time, status, objective, nodes, gap = solve(model, backend,
+                                                      time_limit)
+    if status == 'optimal' and gap is None:
+        gap = 0.0
+    return {'build_time': build_time, 'solve_time': solve_time,
+            'status': status, 'objective': objective, 'nodes': nodes,
+            'gap': gap, 'peak_rss_mb': _peak_rss()}
+
+
+def _median(values):
+    values = [v for v in values if v is not None]
+    return float(np.median(values)) if values else None
+
+
+def run_suite(cases=None, backends=BACKENDS, repeat=3, time_limit=60,
+              output='mip_benchmark_results.json'):
+    ''' Run every case on every available backend repeat times.
+
+        Returns the results dict that is also written to output.
+    '''
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for name in cases or list(CASES):
+        layer = CASES[name][0]
+        for backend in backends:
+            if not backend_available(layer, backend):
+                print('{:<15} | {:<5} | not available'.format(name, backend))
+                continue
+            runs = []
+            for _ in range(repeat):
+                with ProcessPoolExecutor(max_workers=1,
+                                         mp_context=context) as pool:
+                    runs.append(pool.submit(run_case, name, backend,
+                                            time_limit).result())
+            summary = {
+                'case': name, 'backend': backend, 'layer': layer,
+                'runs': runs, 'status': runs[-1]['status'],
+                'objective': runs[-1]['objective'],
+                'build_time': _median([r['build_time'] for r in runs]),
+                'solve_time': _median([r['solve_time'] for r in runs]),
+                'nodes': _median([r['nodes'] for r in runs]),
+                'gap': _median([r['gap'] for r in runs]),
+                'peak_rss_mb': max([r['peak_rss_mb'] or 0 for r in runs])}
+            results['{}/{}'.format(name, backend)] = summary
+            print(format_summary(summary))
+    document = {'meta': _environment(repeat, time_limit), 'results': results}
+    if output:
+        with open(output, 'w') as f:
+            json.dump(document, f, indent=1)
+    return document
+
+
+def _environment(repeat, time_limit):
+    versions = {}
+    for package in ('pulp', 'pyomo', 'highspy', 'scipy', 'numpy'):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'repeat': repeat, 'time_limit': time_limit,
+            'versions': versions}
+
+
+def format_summary(summary):
+    def num(x, spec):
+        return 'n/a' if x is None else format(x, spec)
+    return ('{case:<15} | {backend:<5} | {status:<10} | obj => {obj:>12} | '
+            'build => {build:>7}s | solve => {solve:>7}s | nodes => '
+            '{nodes:>6} | gap => {gap:>8} | rss => {rss:>7} MiB'.format(
+                case=summary['case'], backend=summary['backend'],
+                status=summary['status'],
+                obj=num(summary['objective'], '.4f'),
+                build=num(summary['build_time'], '.3f'),
+                solve=num(summary['solve_time'], '.3f'),
+                nodes=num(summary['nodes'], '.0f'),
+                gap=num(summary['gap'], '.2e'),
+                rss=num(summary['peak_rss_mb'], '.1f')))
+
+
+# Baseline Comparison ---------------------------------------------------------
+PORTABLE_FIELDS = ('status', 'objective', 'nodes')
+HOST_FIELDS = ('build_time', 'solve_time', 'peak_rss_mb')
+
+
+def baseline_document(results, timings=False):
+    ''' Baseline from a run_suite document.
+
+        Without timings only the portable fields are kept; with timings the
+        host fields and the host description are kept as well, and compare
+        checks them only against a run on the same kind of host.
+    '''
+    fields = PORTABLE_FIELDS + (HOST_FIELDS if timings else ())
+    meta = dict(results['meta']) if timings else {
+        'time_limit': results['meta']['time_limit'],
+        'versions': results['meta']['versions']}
+    meta['timings'] = timings
+    return {'meta': meta,
+            'results': {key: {field: summary[field] for field in fields}
+                        for key, summary in results['results'].items()}}
+
+
+def _same_host(meta, other):
+    return all(meta.get(key) == other.get(key)
+               for key in ('platform', 'cpus', 'python'))
+
+
+def compare(results, baseline, time_tol=0.5, min_seconds=0.05, rss_tol=0.25,
+            obj_tol=1e-6, node_tol=1.0, min_nodes=10):
+    ''' Regressions of results against baseline (see baseline_document).
+
+        Flags a case/backend whose status is no longer optimal, whose
+        objective moved by more than obj_tol (relative) or whose node count
+        grew by more than node_tol (relative) and min_nodes. If the baseline
+        has timings and was recorded on the same host (platform, CPU count,
+        Python), median build / solve times that grew by more than time_tol
+        (relative) and min_seconds, and peak RSS that grew by more than
+        rss_tol, are flagged too. Returns a list of messages; pairs missing
+        from either side are skipped.
+    '''
+    messages = []
+    check_host = (baseline['meta'].get('timings', False)
+                  and _same_host(baseline['meta'], results['meta']))
+    for key, new in results['results'].items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        if old['status'] == 'optimal' and new['status'] != 'optimal':
+            messages.append('{}: status {} -> {}'.format(
+                key, old['status'], new['status']))
+        if old['objective'] is not None and (
+                new['objective'] is None
+                or _relative_gap(old['objective'], new['objective'])
+                > obj_tol):
+            messages.append('{}: objective {} -> {}'.format(
+                key, old['objective'], new['objective']))
+        if (old.get('nodes') is not None and new['nodes'] is not None
+                and new['nodes'] > old['nodes'] * (1 + node_tol)
+                and new['nodes'] - old['nodes'] > min_nodes):
+            messages.append('{}: nodes {:.0f} -> {:.0f}'.format(
+                key, old['nodes'], new['nodes']))
+        if not check_host:
+            continue
+        for field in ('build_time', 'solve_time'):
+            if old[field] is None or new[field] is None:
+                continue
+            if (new[field] > old[field] * (1 + time_tol)
+                    and new[field] - old[field] > min_seconds):
+                messages.append('{}: {} {:.3f}s -> {:.3f}s'.format(
+                    key, field, old[field], new[field]))
+        if (old['peak_rss_mb'] and new['peak_rss_mb']
+                and new['peak_rss_mb'] > old['peak_rss_mb'] * (1 + rss_tol)):
+            messages.append('{}: peak RSS {:.1f} -> {:.1f} MiB'.format(
+                key, old['peak_rss_mb'], new['peak_rss_mb']))
+    return messages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES))
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS,
+                        default=list(BACKENDS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--time-limit', type=float, default=60)
+    parser.add_argument('--output', default='mip_benchmark_results.json')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write the results as the new baseline')
+    parser.add_argument('--timings', action='store_true',
+                        help='keep times and RSS in the new baseline '
+                             '(only compared on the same host)')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.cases, args.backends, args.repeat,
+                        args.time_limit, args.output)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline_document(results, args.timings), f,
+                      indent=1)
+        print('Baseline written => {}'.format(args.baseline))
+        return 0
+    if not os.path.exists(args.baseline):
+        print('No baseline at {}'.format(args.baseline))
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['meta'].get('timings') and not _same_host(
+            baseline['meta'], results['meta']):
+        print('Baseline timings are from another host; comparing status, '
+              'objective and nodes only')
+    regressions = compare(results, baseline)
+    for message in regressions:
+        print('REGRESSION ' + message)
+    print('Regressions => {}'.format(len(regressions)))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,11 +7,29 @@ Linear Optomization : they involve maximizing or minimizing a linear objective
 
 """
 
+import os
+import importlib.util
 from pulp import *
-import cbcpy as cbc
-solver1 = cbc.OsiClpSolverInterface()
-solver1.readMps()
-
 
+# The MPS reader lives in scipy_mps.py at the repository root; load that
+# file directly instead of editing sys.path
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+_spec = importlib.util.spec_from_file_location(
+    'scipy_mps', os.path.join(root, 'scipy_mps.py'))
+scipy_mps = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(scipy_mps)
 
+# p0033 from MIPLIB, known optimum 3089. The file is parsed into CSR arrays
+# once and cached next to it as memory-mapped .npy files; solve_mps runs
+# branch-and-bound in-process (scipy milp / HiGHS)
+mps_path = os.path.join(root, 'data', 'p0033.mps.txt')
+model = scipy_mps.cached_read_mps(mps_path)
+res = scipy_mps.solve_mps(model)
+print('Rows => {} | Columns => {} | Objective => {:.0f}'.format(
+    model['A'].shape[0], model['A'].shape[1], res.fun))
 
+# The same file through PuLP and CBC, for comparison
+variables, problem = LpProblem.fromMPS(mps_path)
+problem.solve(PULP_CBC_CMD(msg=False))
+print('PuLP => {} | Objective => {:.0f}'.format(
+    LpStatus[problem.status], value(problem.objective)))
@@ -10,13 +10,20 @@ Sources:
 """
 
 
+import os
+import importlib.util
 import numpy as np
-from scipy.optimize import minimize
 
-def rosen(x):
-    """The Rosenbrock function"""
-    return sum(100.0*(x[1:]-x[:-1]**2.0)**2.0 + (1-x[:-1])**2.0)
+# Shared Rosenbrock helpers live in scipy_rosen.py at the repository root;
+# load that file directly instead of editing sys.path
+_spec = importlib.util.spec_from_file_location(
+    'scipy_rosen', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'scipy_rosen.py'))
+scipy_rosen = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(scipy_rosen)
+rosen, rosen_grad = scipy_rosen.rosen, scipy_rosen.rosen_grad
+rosen_hessp, minimize_auto = scipy_rosen.rosen_hessp, scipy_rosen.minimize_auto
 
 x0 = np.array([1.3, 0.7, 0.8, 1.9, 1.2])
-res = minimize(rosen, x0, method='nelder-mead',
-               options={'xatol': 1e-8, 'disp': True})
\ No newline at end of file
+res = minimize_auto(rosen, x0, jac=rosen_grad, hessp=rosen_hessp,
+                    options={'disp': True})
\ No newline at end of file
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Data-driven blending model (generalizes 'Pulp Tutorial 4 - Blending
+Problem.py').
+
+Products p are blended from ingredients i. w[p,i] is the kg of ingredient i
+in product p, only for the allowed (p, i) pairs:
+
+    min   sum cost[i] w[p,i]
+    s.t.  sum_i w[p,i] == demand[p]                               (demand)
+          sum_i comp[i,k] w[p,i] >= spec_min[p,k] sum_i w[p,i]    (spec_min)
+          sum_i comp[i,k] w[p,i] <= spec_max[p,k] sum_i w[p,i]    (spec_max)
+          min_use[i] <= sum_p w[p,i] <= supply[i]                 (supply)
+          w >= 0
+
+comp[i,k] is the share of attribute k in ingredient i. In the sausage
+tutorial the attributes are the ingredients themselves (comp is the
+identity): economy sausages are at least 40% pork, premium at least 60%,
+and both at most 25% starch.
+
+blend_arrays turns the tables into a CSR constraint matrix with NumPy
+only; spec rows are written as sum_i (comp[i,k] - spec[p,k]) w[p,i] and
+rows whose spec is infinite are not generated. From there the model is
+either handed to PuLP one row at a time (build_blend_pulp, each row an
+LpAffineExpression over a CSR slice) or solved directly through the
+matrix interface (solve_blend_highs, scipy linprog / HiGHS).
+
+Ref : http://benalexkeen.com/linear-programming-with-python-and-pulp-part-4/
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+import pulp
+from scipy import sparse
+from scipy.optimize import linprog
+
+
+# Data ------------------------------------------------------------------------
+def sausage_data():
+    ''' The tutorial's data: 350 economy and 500 premium sausages of 50 g,
+        30 kg pork / 20 kg wheat / 17 kg starch available and at least
+        23 kg of pork (going out of date) to be used.
+    '''
+    inf = np.inf
+    return {'products': ['economy', 'premium'],
+            'ingredients': ['pork', 'wheat', 'starch'],
+            'attributes': ['pork', 'wheat', 'starch'],
+            'cost': np.array([4.32, 2.46, 1.86]),
+            'supply': np.array([30.0, 20.0, 17.0]),
+            'min_use': np.array([23.0, 0.0, 0.0]),
+            'demand': np.array([350 * 0.05, 500 * 0.05]),
+            'composition': np.eye(3),
+            'spec_min': np.array([[0.4, -inf, -inf], [0.6, -inf, -inf]]),
+            'spec_max': np.array([[inf, inf, 0.25], [inf, inf, 0.25]])}
+
+
+def _limits(spec, shape, missing):
+    ''' Spec table with NaN (or no table) meaning no limit. '''
+    if spec is None:
+        return np.full(shape, missing)
+    spec = np.asarray(spec, dtype=float)
+    return np.where(np.isnan(spec), missing, spec)
+
+
+def blend_arrays(cost, composition, demand, spec_min=None, spec_max=None,
+                 supply=None, min_use=None, allowed=None, **labels):
+    ''' Build the blending LP as arrays.
+
+        cost (I,), composition (I, K), demand (P,), spec_min / spec_max
+        (P, K) with -inf / inf (or NaN) for no limit, supply / min_use (I,),
+        allowed (P, I) boolean mask of usable pairs (all by default).
+        labels : optional products / ingredients / attributes name lists.
+        Returns a dict with c, A (CSR), row_lower, row_upper, the pair
+        arrays pair_product / pair_ingredient, row_kind and the inputs
+        (with the defaults filled in).
+    '''
+    cost = np.asarray(cost, dtype=float)
+    composition = np.asarray(composition, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    n_products, n_ingredients = demand.size, cost.size
+    n_attributes = composition.shape[1]
+    shape = (n_products, n_attributes)
+    spec_min = _limits(spec_min, shape, -np.inf)
+    spec_max = _limits(spec_max, shape, np.inf)
+    supply = np.full(n_ingredients, np.inf) if supply is None else \
+        np.asarray(supply, dtype=float)
+    min_use = np.zeros(n_ingredients) if min_use is None else \
+        np.asarray(min_use, dtype=float)
+    if allowed is None:
+        allowed = np.ones((n_products, n_ingredients), dtype=bool)
+
+    # Columns are the allowed pairs, sorted by product
+    pair_product, pair_ingredient = np.nonzero(allowed)
+    n_pairs = pair_product.size
+    cols = np.arange(n_pairs)
+    blocks = []
+
+    # Demand: one row per product
+    blocks.append((pair_product, cols, np.ones(n_pairs), demand, demand,
+                   'demand'))
+
+    # Specs: one row per (product, attribute) with a finite limit
+    for spec, lower in ((spec_min, True), (spec_max, False)):
+        limited = np.isfinite(spec)
+        row_of = np.cumsum(limited.ravel()).reshape(shape) - 1
+        p, k = np.nonzero(limited[pair_product])
+        if not p.size:
+            continue
+        pp, ii = pair_product[p], pair_ingredient[p]
+        values = composition[ii, k] - spec[pp, k]
+        n_rows = int(limited.sum())
+        bounds = (np.zeros(n_rows), np.full(n_rows, np.inf)) if lower else \
+            (np.full(n_rows, -np.inf), np.zeros(n_rows))
+        blocks.append((row_of[pp, k], cols[p], values, bounds[0], bounds[1],
+                       'spec_min' if lower else 'spec_max'))
+
+    # Supply: one row per ingredient
+    blocks.append((pair_ingredient, cols, np.ones(n_pairs), min_use, supply,
+                   'supply'))
+
+    rows, columns, values, row_lower, row_upper, row_kind = [], [], [], [], \
+        [], []
+    offset = 0
+    for r, c, v, lo, up, kind in blocks:
+        rows.append(r + offset)
+        columns.append(c)
+        values.append(v)
+        row_lower.append(lo)
+        row_upper.append(up)
+        row_kind.append(np.full(lo.size, kind))
+        offset += lo.size
+    A = sparse.csr_matrix((np.concatenate(values),
+                           (np.concatenate(rows), np.concatenate(columns))),
+                          shape=(offset, n_pairs))
+    A.eliminate_zeros()
+    return dict(labels, c=cost[pair_ingredient], A=A,
+                row_lower=np.concatenate(row_lower),
+                row_upper=np.concatenate(row_upper),
+                row_kind=np.concatenate(row_kind),
+                pair_product=pair_product, pair_ingredient=pair_ingredient,
+                n_products=n_products, n_ingredients=n_ingredients,
+                cost=cost, composition=composition, demand=demand,
+                spec_min=spec_min, spec_max=spec_max, supply=supply,
+                min_use=min_use)
+
+
+# Builders --------------------------------------------------------------------
+def _pair_names(data):
+    products = data.get('products')
+    ingredients = data.get('ingredients')
+    p, i = data['pair_product'].tolist(), data['pair_ingredient'].tolist()
+    if products is None or ingredients is None:
+        return ['w_{}_{}'.format(a, b) for a, b in zip(p, i)]
+    return ['w_{}_{}'.format(products[a], ingredients[b])
+            for a, b in zip(p, i)]
+
+
+def build_blend_pulp(data):
+    ''' LpProblem from blend_arrays output, one LpAffineExpression per CSR
+        row (no per-term Python arithmetic).
+
+        Returns (problem, variables), variables in pair order.
+    '''
+    problem = pulp.LpProblem('Cost_minimisation_blend_problem',
+                             pulp.LpMinimize)
+    variables = [pulp.LpVariable(name, lowBound=0)
+                 for name in _pair_names(data)]
+    problem += pulp.LpAffineExpression(zip(variables, data['c'].tolist()))
+    A = data['A']
+    indptr, indices = A.indptr.tolist(), A.indices.tolist()
+    values = A.data.tolist()
+    lower, upper = data['row_lower'].tolist(), data['row_upper'].tolist()
+    kinds = data['row_kind'].tolist()
+    for r in range(A.shape[0]):
+        a, b = indptr[r], indptr[r + 1]
+        terms = list(zip([variables[j] for j in indices[a:b]], values[a:b]))
+        name = '{}_{}'.format(kinds[r], r)
+        lo, up = lower[r], upper[r]
+        if lo == up:
+            problem.addConstraint(pulp.LpConstraint(
+                pulp.LpAffineExpression(terms), pulp.LpConstraintEQ,
+                rhs=lo), name)
+            continue
+        if up != np.inf:
+            problem.addConstraint(pulp.LpConstraint(
+                pulp.LpAffineExpression(terms), pulp.LpConstraintLE,
+                rhs=up), name)
+        if lo != -np.inf and (lo != 0 or kinds[r] != 'supply'):
+            problem.addConstraint(pulp.LpConstraint(
+                pulp.LpAffineExpression(terms), pulp.LpConstraintGE,
+                rhs=lo), name + '_lo')
+    return problem, variables
+
+
+def build_blend_loops(data):
+    ''' Baseline: the tutorial's style, LpVariable.dicts and nested
+        generator sums with dict lookups for every term.
+    '''
+    composition = data['composition']
+    spec_min, spec_max = data['spec_min'], data['spec_max']
+    cost, supply, min_use = data['cost'], data['supply'], data['min_use']
+    demand = data['demand']
+    pairs = list(zip(data['pair_product'].tolist(),
+                     data['pair_ingredient'].tolist()))
+    uses = {}
+    for p, i in pairs:
+        uses.setdefault(p, []).append(i)
+    makes = {}
+    for p, i in pairs:
+        makes.setdefault(i, []).append(p)
+    problem = pulp.LpProblem('Cost_minimisation_blend_problem',
+                             pulp.LpMinimize)
+    w = pulp.LpVariable.dicts('w', pairs, lowBound=0, cat='Continuous')
+    problem += pulp.lpSum(cost[i] * w[p, i] for p, i in pairs)
+    for p in range(data['n_products']):
+        total = pulp.lpSum(w[p, i] for i in uses.get(p, []))
+        problem += total == demand[p]
+        for k in range(composition.shape[1]):
+            content = pulp.lpSum(composition[i, k] * w[p, i]
+                                 for i in uses.get(p, []))
+            if np.isfinite(spec_min[p, k]):
+                problem += content >= spec_min[p, k] * total
+            if np.isfinite(spec_max[p, k]):
+                problem += content <= spec_max[p, k] * total
+    for i in range(data['n_ingredients']):
+        used = pulp.lpSum(w[p, i] for p in makes.get(i, []))
+        if np.isfinite(supply[i]):
+            problem += used <= supply[i]
+        if min_use[i] > 0:
+            problem += used >= min_use[i]
+    return problem, w
+
+
+# Solve -----------------------------------------------------------------------
+def solve_blend_pulp(problem, variables, solver=None):
+    ''' Solve with PuLP (CBC by default); returns (status, cost, w). '''
+    problem.solve(solver or pulp.PULP_CBC_CMD(msg=False))
+    return (pulp.LpStatus[problem.status], pulp.value(problem.objective),
+            np.array([v.varValue for v in variables], dtype=float))
+
+
+def solve_blend_highs(data):
+    ''' Solve the arrays directly with scipy linprog (HiGHS).
+
+        Returns (status, cost, w) with w in pair order.
+    '''
+    A, lower, upper = data['A'], data['row_lower'], data['row_upper']
+    eq = lower == upper
+    le = np.isfinite(upper) & ~eq
+    ge = np.isfinite(lower) & ~eq
+    res = linprog(data['c'],
+                  A_ub=sparse.vstack([A[le], -A[ge]]).tocsr(),
+                  b_ub=np.concatenate([upper[le], -lower[ge]]),
+                  A_eq=A[eq], b_eq=lower[eq], bounds=(0, None),
+                  method='highs')
+    return res.message, res.fun, res.x
+
+
+def blend_table(data, w):
+    ''' (P, I) array of kg per product and ingredient. '''
+    table = np.zeros((data['n_products'], data['n_ingredients']))
+    table[data['pair_product'], data['pair_ingredient']] = w
+    return table
+
+
+# Benchmark -------------------------------------------------------------------
+def random_blend(n_products, n_ingredients, n_attributes=5, per_product=None,
+                 seed=0):
+    ''' Feasible random instance.
+
+        per_product : ingredients allowed per product (all by default).
+        Specs are set around a random feasible recipe, so the model always
+        has a solution.
+    '''
+    rng = np.random.default_rng(seed)
+    if per_product is None or per_product >= n_ingredients:
+        allowed = np.ones((n_products, n_ingredients), dtype=bool)
+    else:
+        keys = rng.random((n_products, n_ingredients))
+        cut = np.partition(keys, per_product - 1, axis=1)[:, per_product - 1]
+        allowed = keys <= cut[:, None]
+    composition = rng.dirichlet(np.ones(n_attributes), n_ingredients)
+    demand = rng.uniform(10, 100, n_products)
+    recipe = rng.random((n_products, n_ingredients)) * allowed
+    recipe *= (demand / recipe.sum(axis=1))[:, None]
+    share = recipe @ composition / demand[:, None]
+    spec_min = np.where(rng.random(share.shape) < 0.5, share * 0.9, -np.inf)
+    spec_max = np.where(rng.random(share.shape) < 0.5, share * 1.1, np.inf)
+    return blend_arrays(rng.uniform(1, 10, n_ingredients), composition,
+                        demand, spec_min, spec_max,
+                        supply=recipe.sum(axis=0) * 1.5, allowed=allowed)
+
+
+def benchmark_blend_build(sizes=((10, 3), (200, 50), (2000, 500)),
+                          per_product=None, loops_max_pairs=10**6,
+                          solve_max_pairs=10**4):
+    ''' Build time of the arrays alone (the matrix interface), the CSR-row
+        PuLP model and the nested-loop PuLP model, plus a HiGHS solve on
+        the smaller sizes.
+    '''
+    for n_products, n_ingredients in sizes:
+        start = time.perf_counter()
+        data = random_blend(n_products, n_ingredients,
+                            per_product=per_product)
+        arrays = time.perf_counter() - start
+        n_pairs = data['pair_product'].size
+        line = 'products x ingredients => {:>5,} x {:<4,} | vars => {:>9,}' \
+            ' | rows => {:>7,} | arrays => {:6.2f}s'.format(
+                n_products, n_ingredients, n_pairs, data['A'].shape[0],
+                arrays)
+        start = time.perf_counter()
+        problem, variables = build_blend_pulp(data)
+        line += ' | pulp rows => {:6.2f}s'.format(time.perf_counter() - start)
+        if n_pairs <= loops_max_pairs:
+            start = time.perf_counter()
+            build_blend_loops(data)
+            line += ' | pulp loops => {:6.2f}s'.format(
+                time.perf_counter() - start)
+        if n_pairs <= solve_max_pairs:
+            start = time.perf_counter()
+            status, cost, _ = solve_blend_highs(data)
+            line += ' | highs solve => {:6.2f}s'.format(
+                time.perf_counter() - start)
+        print(line)
+        del problem, variables
+
+
+if __name__ == '__main__':
+    data = blend_arrays(**sausage_data())
+    status, cost, w = solve_blend_pulp(*build_blend_pulp(data))
+    print('Status => {} | Cost => {:.3f}'.format(status, cost))
+    print(blend_table(data, w))
+    benchmark_blend_build()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+What-if scenarios for the car production problem in
+'Pulp Tutorial 3 - Resource Problem.py'.
+
+    max   profit_a A + profit_b B
+    s.t.  3 A   + 4 B <= days
+          5 A   + 6 B <= engineer
+          1.5 A + 3 B <= detailer
+          A, B >= 0 integer
+
+The tutorial hardcodes the profits (30,000 / 45,000) and capacities
+(30 / 60 / 21). Scenarios are given column-wise, as a DataFrame (or dict of
+arrays) with the SCENARIO_COLUMNS. The LpProblem is built once per worker
+process and each scenario only swaps the objective coefficients and the
+right-hand sides before calling the solver (CBC by default, one CBC
+process per worker). run_scenarios splits the scenarios into chunks for a
+process pool and returns one columnar DataFrame with status, objective, A
+and B per scenario, in input order.
+
+Ref : http://benalexkeen.com/linear-programming-with-python-and-pulp-part-3/
+"""
+
+# Import Libraries ------------------------------------------------------------
+import os
+import time
+import numpy as np
+import pandas as pd
+import pulp
+from concurrent.futures import ProcessPoolExecutor
+
+SCENARIO_COLUMNS = ('profit_a', 'profit_b', 'days', 'engineer', 'detailer')
+BASE_SCENARIO = {'profit_a': 30000, 'profit_b': 45000, 'days': 30,
+                 'engineer': 60, 'detailer': 21}
+USAGE = {'days': (3, 4), 'engineer': (5, 6), 'detailer': (1.5, 3)}
+
+
+# Template --------------------------------------------------------------------
+def resource_problem(integer=True):
+    ''' The tutorial model with the base scenario's data.
+
+        Returns (problem, (A, B)); rows are named after the capacities.
+    '''
+    cat = 'Integer' if integer else 'Continuous'
+    problem = pulp.LpProblem('Profit_maximisation_problem', pulp.LpMaximize)
+    A = pulp.LpVariable('A', lowBound=0, cat=cat)
+    B = pulp.LpVariable('B', lowBound=0, cat=cat)
+    problem += (BASE_SCENARIO['profit_a'] * A
+                + BASE_SCENARIO['profit_b'] * B), 'Profit'
+    for name, (a, b) in USAGE.items():
+        problem += a * A + b * B <= BASE_SCENARIO[name], name
+    return problem, (A, B)
+
+
+def _solver(name, time_limit=None):
+    if name == 'cbc':
+        return pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit)
+    if name == 'highs':
+        return pulp.HiGHS(msg=False, timeLimit=time_limit)
+    raise ValueError('Unknown solver {}'.format(name))
+
+
+class ResourceScenarioSolver(object):
+    ''' One LpProblem template, re-solved with swapped coefficients. '''
+
+    def __init__(self, solver='cbc', integer=True, time_limit=None):
+        self.problem, (self.A, self.B) = resource_problem(integer)
+        self.solver = _solver(solver, time_limit)
+
+    def solve(self, profit_a, profit_b, days, engineer, detailer):
+        ''' Returns (status, objective, A, B); NaN values without a
+            solution.
+        '''
+        problem = self.problem
+        problem.objective[self.A] = profit_a
+        problem.objective[self.B] = profit_b
+        problem.constraints['days'].changeRHS(days)
+        problem.constraints['engineer'].changeRHS(engineer)
+        problem.constraints['detailer'].changeRHS(detailer)
+        problem.solve(self.solver)
+        status = pulp.LpStatus[problem.status]
+        if problem.status != pulp.LpStatusOptimal:
+            return status, np.nan, np.nan, np.nan
+        return (status, pulp.value(problem.objective), self.A.varValue,
+                self.B.varValue)
+
+    def solve_columns(self, columns):
+        ''' Solve every scenario in a dict of equal-length arrays. '''
+        n = len(columns['profit_a'])
+        status = np.empty(n, dtype=object)
+        values = np.empty((n, 3))
+        rows = zip(*[np.asarray(columns[c], dtype=float).tolist()
+                     for c in SCENARIO_COLUMNS])
+        for i, row in enumerate(rows):
+            status[i], values[i, 0], values[i, 1], values[i, 2] = \
+                self.solve(*row)
+        return {'status': status, 'objective': values[:, 0],
+                'A': values[:, 1], 'B': values[:, 2]}
+
+
+# Process Pool ----------------------------------------------------------------
+_worker = None
+
+
+def _init_worker(solver, integer, time_limit):
+    # One template (and one CBC command) per worker process
+    global _worker
+    _worker = ResourceScenarioSolver(solver, integer, time_limit)
+
+
+def _solve_chunk(columns):
+    return _worker.solve_columns(columns)
+
+
+def _as_columns(scenarios):
+    missing = [c for c in SCENARIO_COLUMNS if c not in scenarios]
+    if missing:
+        raise KeyError('Scenarios are missing columns {}'.format(missing))
+    return {c: np.asarray(scenarios[c], dtype=float)
+            for c in SCENARIO_COLUMNS}
+
+
+def run_scenarios(scenarios, workers=None, solver='cbc', integer=True,
+                  time_limit=None, chunks_per_worker=4):
+    ''' Solve every scenario and return a columnar DataFrame.
+
+        scenarios : DataFrame or dict of arrays with SCENARIO_COLUMNS.
+        workers :   pool size (default os.cpu_count()); 1 runs in-process.
+        The result holds the scenario columns followed by status,
+        objective, A and B.
+    '''
+    columns = _as_columns(scenarios)
+    n = len(columns['profit_a'])
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n == 0:
+        results = [ResourceScenarioSolver(solver, integer, time_limit)
+                   .solve_columns(columns)]
+    else:
+        n_chunks = min(n, workers * chunks_per_worker)
+        bounds = np.linspace(0, n, n_chunks + 1).astype(int)
+        chunks = [{c: v[lo:hi] for c, v in columns.items()}
+                  for lo, hi in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(solver, integer,
+                                           time_limit)) as pool:
+            results = list(pool.map(_solve_chunk, chunks))
+    frame = pd.DataFrame(columns)
+    for key in ('status', 'objective', 'A', 'B'):
+        frame[key] = np.concatenate([r[key] for r in results])
+    return frame
+
+
+def random_scenarios(n, spread=0.3, seed=0):
+    ''' Base scenario with every profit and capacity scaled by
+        U(1 - spread, 1 + spread).
+    '''
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({c: BASE_SCENARIO[c] * rng.uniform(1 - spread,
+                                                          1 + spread, n)
+                         for c in SCENARIO_COLUMNS})
+
+
+# Benchmark -------------------------------------------------------------------
+def _rebuild_solve(scenarios, solver='cbc'):
+    ''' Baseline: the tutorial's build-and-solve, once per scenario. '''
+    for row in scenarios.itertuples(index=False):
+        problem = pulp.LpProblem('Profit_maximisation_problem',
+                                 pulp.LpMaximize)
+        A = pulp.LpVariable('A', lowBound=0, cat='Integer')
+        B = pulp.LpVariable('B', lowBound=0, cat='Integer')
+        problem += row.profit_a * A + row.profit_b * B, 'Profit'
+        problem += 3 * A + 4 * B <= row.days
+        problem += 5 * A + 6 * B <= row.engineer
+        problem += 1.5 * A + 3 * B <= row.detailer
+        problem.solve(_solver(solver))
+
+
+def benchmark_scenarios(sizes=(100, 1000, 5000), workers=None,
+                        rebuild_max=1000):
+    ''' Scenarios per second: rebuild per scenario, template in-process and
+        template over a process pool.
+    '''
+    workers = workers or os.cpu_count() or 1
+    print('cpus => {}'.format(os.cpu_count()))
+    for n in sizes:
+        scenarios = random_scenarios(n)
+        line = 'scenarios => {:>6,}'.format(n)
+        if n <= rebuild_max:
+            start = time.perf_counter()
+            _rebuild_solve(scenarios)
+            line += ' | rebuild => {:7.1f}/s'.format(
+                n / (time.perf_counter() - start))
+        for n_workers in sorted({1, workers, 2 * workers}):
+            start = time.perf_counter()
+            result = run_scenarios(scenarios, workers=n_workers)
+            elapsed = time.perf_counter() - start
+            label = 'template' if n_workers == 1 else \
+                'pool x{}'.format(n_workers)
+            line += ' | {} => {:7.1f}/s'.format(label, n / elapsed)
+        print(line + ' | optimal => {}'.format(
+            int((result['status'] == 'Optimal').sum())))
+
+
+if __name__ == '__main__':
+    # The tutorial's own instance: A = 2, B = 6, profit 330,000
+    base = pd.DataFrame([BASE_SCENARIO])
+    print(run_scenarios(base, workers=1))
+    benchmark_scenarios()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk loading of NumPy arrays into Pyomo Params and fixed Vars.
+
+ch4.py zips arrays into dicts, declares premiums and incurred losses as
+Vars and then fixes them one key at a time with model.A[key].fix(...).
+Every element then pays for index validation, domain validation and a
+VarData object, although the values are plain data.
+
+array_param stores an array as an immutable indexed Param, initialized
+from one dict over an insertion-ordered Set of the keys (cheaper to
+validate against than a RangeSet) with a domain taken from the array
+dtype; an immutable Param keeps raw values, so there is no per-element
+component object. Where a Var really is needed (it will be unfixed
+later), fix_block sets a whole block's values with IndexedVar.set_values,
+skipping the per-value validation, and fixes the block in one call.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import tracemalloc
+import numpy as np
+from pyomo.environ import (ConcreteModel, RangeSet, Set, Param, Var, Reals,
+                           Integers, Boolean, Any)
+
+
+# Params ----------------------------------------------------------------------
+def _domain(values):
+    ''' Pyomo domain matching an array dtype. '''
+    if values.dtype.kind == 'b':
+        return Boolean
+    if values.dtype.kind in 'iu':
+        return Integers
+    if values.dtype.kind == 'f':
+        return Reals
+    return Any
+
+
+def array_param(model, name, values, keys=None, within=None):
+    ''' Add values as the immutable Param model.<name>.
+
+        values : 1-D array-like.
+        keys :   index of each value, stored as the ordered Set
+                 model.<name>_index; by default 0..n-1.
+        within : Param domain; by default Reals, Integers or Boolean
+                 following the array dtype.
+        Returns the Param, indexed like a dict built from zip(keys, values).
+    '''
+    values = np.asarray(values)
+    if values.ndim != 1:
+        raise ValueError('values must be one-dimensional')
+    keys = range(values.size) if keys is None else list(keys)
+    if len(keys) != values.size:
+        raise ValueError('keys and values differ in length')
+    index = Set(initialize=keys, ordered=Set.InsertionOrder)
+    model.add_component(name + '_index', index)
+    param = Param(index, initialize=dict(zip(keys, values.tolist())),
+                  within=within or _domain(values))
+    model.add_component(name, param)
+    return param
+
+
+# Fixed Vars ------------------------------------------------------------------
+def fix_block(var, values, keys=None):
+    ''' Fix every element of an indexed Var to the matching array value.
+
+        keys default to the Var's own index order. Values are stored
+        without domain or bound checks.
+    '''
+    values = np.asarray(values).tolist()
+    whole = keys is None
+    keys = list(var.index_set() if whole else keys)
+    if len(keys) != len(values):
+        raise ValueError('keys and values differ in length')
+    var.set_values(dict(zip(keys, values)), skip_validation=True)
+    if whole:
+        var.fix()
+    else:
+        for k in keys:
+            var[k].fix()
+    return var
+
+
+def fixed_var(model, name, values, keys=None):
+    ''' Add model.<name> as a dense Var fixed to values (see fix_block). '''
+    n = len(values)
+    index = RangeSet(0, n - 1) if keys is None else Set(
+        initialize=list(keys), ordered=Set.InsertionOrder)
+    model.add_component(name + '_index', index)
+    var = Var(index, dense=True)
+    model.add_component(name, var)
+    return fix_block(var, values)
+
+
+# Benchmark -------------------------------------------------------------------
+def _per_key_fix(values):
+    ''' The ch4.py pattern: dict via zip, Var, then fix key by key. '''
+    model = ConcreteModel()
+    index = [x for x in range(len(values))]
+    dict_var = {}
+    for x, y in zip(index, values):
+        dict_var[x] = y
+    model.A = Var(index, initialize=dict_var)
+    [model.A[key].fix(model.A[key].value) for key in dict_var]
+    return model
+
+
+def _param_initialize(values):
+    ''' An immutable Param built through the regular initialize path. '''
+    model = ConcreteModel()
+    model.I = RangeSet(0, len(values) - 1)
+    model.A = Param(model.I, initialize=dict(enumerate(values.tolist())))
+    return model
+
+
+def _array_param(values):
+    model = ConcreteModel()
+    array_param(model, 'A', values)
+    return model
+
+
+def _fixed_var(values):
+    model = ConcreteModel()
+    fixed_var(model, 'A', values)
+    return model
+
+
+def _measure(build, *args):
+    ''' Build time from a plain run, peak memory from a traced rerun. '''
+    start = time.perf_counter()
+    build(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    model = build(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model
+    return elapsed, current / 2**20, peak / 2**20
+
+
+def benchmark_bulk_data(sizes=(10**3, 10**5, 10**6), seed=0):
+    ''' Build time, retained and peak memory of each loading path. '''
+    rng = np.random.default_rng(seed)
+    cases = [('per-key fix', _per_key_fix),
+             ('Param initialize', _param_initialize),
+             ('array_param', _array_param),
+             ('fixed_var', _fixed_var)]
+    for n in sizes:
+        values = rng.uniform(1, 100, n)
+        for label, build in cases:
+            elapsed, retained, peak = _measure(build, values)
+            print('entries => {:>9,} | {:<16} | build => {:7.3f}s | '
+                  'model => {:8.1f} MiB | peak => {:8.1f} MiB'.format(
+                      n, label, elapsed, retained, peak))
+
+
+if __name__ == '__main__':
+    benchmark_bulk_data()
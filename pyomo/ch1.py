@@ -32,11 +32,9 @@ model decision variables, constraints, and objective are defined using Pyomo mod
 components.
 '''
 
-def concrete_model_v1():
+def build_concrete_model_v1():
     # Instantiate Model
     model = ConcreteModel()
-    # Import Solver
-    solver = SolverFactory('glpk')
     # Define Variables for the model (these are single values, not sets)
     model.x_1 = Var(within=NonNegativeReals)
     model.x_2 = Var(within=NonNegativeReals)
@@ -45,6 +43,13 @@ def concrete_model_v1():
     # Define Constraints - Determines what values x1 and x2 can take
     model.con1 = Constraint(expr= 3 * model.x_1 + 4 * model.x_2 >= 1)
     model.con2 = Constraint(expr= 2 * model.x_1 + 5 * model.x_2 >=2)
+    return model
+
+
+def concrete_model_v1():
+    model = build_concrete_model_v1()
+    # Import Solver
+    solver = SolverFactory('glpk')
     # Solve Function
     results = solver.solve(model)
     # Print Model Results
@@ -55,7 +60,6 @@ def concrete_model_v1():
     print('Objective Function Solution => {}'.format(model.obj()))
     print('Optimal solution x1 => {}'.format(model.x_1()))
     print('Optimal solution x_2 => {}'.format(model.x_2()))
-concrete_model_v1()
 
 
 # 1.2.2 Minimum Graph Coloring Example ----------------------------------------
@@ -65,5 +69,9 @@ concrete_model_v1()
     The objective in the minimum graph coloring problem is to find a valid
     coloring that uses the minimum number of distinct colors.
 '''
+# Implemented in graph_coloring.py: a Pyomo MIP with symmetry breaking, seeded
+# by DSATUR / greedy heuristics on CSR adjacency arrays
 
 
+if __name__ == '__main__':
+    concrete_model_v1()
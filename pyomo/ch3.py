@@ -199,6 +199,8 @@ def warehouse_concrete_model(display):
     def num_warehouses_rule(model):
         return sum(model.y[n] for n in N) <= P
     model.num_warehouses = Constraint(rule=num_warehouses_rule)
+    # For large N x M see warehouse_matrix_model.build_warehouse_model,
+    # which builds the same model from a NumPy or sparse distance matrix.
 
 
 
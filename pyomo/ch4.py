@@ -8,6 +8,7 @@ Created on Thu Sep  3 10:37:16 2020
 from pyomo.environ import *
 import numpy as np
 import sys
+from bulk_data import array_param, fix_block
 
 def ex_indexed_constraint():
     model = ConcreteModel()
@@ -58,40 +59,30 @@ def create_var_fixed_vals_v2():
     premiums = np.random.randint(1, 100, 10)
     incurred = np.random.randint(1, 7, 10)
     indx = [x for x in range(0, 10)]
-    # Build Dictionary
-    dict_prems = {}
-    for x,y in zip(indx, premiums):
-        dict_prems[x] = y
-    model.A = Var(indx, initialize=dict_prems)
+    model.A = Var(indx, dense=True)
     model.A.display()
-    # Fix Model.A Values
-    [model.A[key].fix(model.A[key].value) for key in dict_prems]
+    # Fix Model.A Values In One Call
+    fix_block(model.A, premiums)
     model.A.display()
-    # Create Sum of Premium Value From Model.A
-    sum_prem = sum([model.A[key].value for key in dict_prems])
+    # Premiums & Incurred Are Data, So An Immutable Param Is Enough
+    array_param(model, 'incur', incurred)
+    model.incur.display()
+    # Create Sum of Premium Value From The Array
+    sum_prem = int(premiums.sum())
     model.B = Var(initialize=sum_prem)
     model.B.fix(sum_prem)
     model.B.display()
 
 def create_var_dict(index, var):
-    # Create Dictioary Object
-    dict_var = {}
-    # Populate Dictiony with index as key and var as values
-    for x,y in zip(index, var):
-        dict_var[x] = y
-    # Return Pyomo Object
-    return dict_var
+    # Populate Dictionary with index as key and var as values
+    return dict(zip(index, np.asarray(var).tolist()))
 
 def funct_fix_var_vals_incur(index, model, var):
-    # Create Dictioary Object
-    dict_prems = {}
-    # Populate Dictiony with index as key and var as values
-    for x,y in zip(index, var):
-        dict_prems[x] = y
-    # Pass Index & Dictionary To Pyomo Object
-    model.incur = Var(index, initialize=dict_prems)
-    # Fix Model.A Values
-    [model.incur[key].fix(model.incur[key].value) for key in dict_prems]
+    # Pass Index To Pyomo Object
+    model.incur = Var(index, dense=True)
+    # Fix Model.incur Values In One Call (see bulk_data.array_param to
+    # store them as an immutable Param instead)
+    fix_block(model.incur, var)
     # Return Pyomo Object
     return model.incur
 
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+Minimum graph coloring: DSATUR / greedy heuristics and a Pyomo MIP.
+
+ch1.py (section 1.2.2) describes the problem without code. Graphs are
+given as CSR adjacency arrays (indptr, indices), the neighbours of vertex v
+being indices[indptr[v]:indptr[v + 1]], so graphs with 10^5 vertices and
+more are handled without Python adjacency dicts.
+
+    greedy_coloring    largest-first greedy, O(n + m)
+    dsatur             DSATUR with a lazy heap, O((n + m) log n)
+    coloring_model     the MIP below, seeded by a heuristic coloring
+
+MIP (K colors from the heuristic upper bound) :
+    min   sum_c y[c]
+    s.t.  sum_c x[v,c] == 1                  every vertex gets one color
+          x[u,c] + x[v,c] <= y[c]            for every edge (u, v)
+          y[c] >= y[c+1]                     colors are used in order
+          x[v,c] == 0 for c > position(v)    first-use order along a vertex
+                                             order that starts with a clique
+          x[clique[i], i] == 1               the clique is colored 0..q-1
+
+The symmetry-breaking rows are valid together because any coloring can be
+relabeled by first use along the vertex order. The clique size is also a
+lower bound on the number of colors.
+
+Ref : Pyomo - Optimization Modeling in Python, section 1.2.2
+"""
+
+# Import Libraries ------------------------------------------------------------
+import heapq
+import time
+import numpy as np
+from scipy import sparse
+from scipy.spatial import Delaunay
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Binary, Objective,
+                           Constraint, minimize, value)
+
+
+# Graph Input -----------------------------------------------------------------
+def to_csr_adjacency(edges, n=None):
+    ''' Symmetric CSR adjacency (indptr, indices) from an edge array.
+
+        edges : (m, 2) vertex pairs, or a scipy.sparse matrix whose stored
+                entries are edges. Self loops and duplicates are dropped.
+    '''
+    if sparse.issparse(edges):
+        coo = edges.tocoo()
+        u, v = coo.row, coo.col
+        n = n or edges.shape[0]
+    else:
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        u, v = edges[:, 0], edges[:, 1]
+        n = n or (int(edges.max()) + 1 if edges.size else 0)
+    keep = u != v
+    u, v = u[keep], v[keep]
+    A = sparse.csr_matrix((np.ones(2 * u.size, dtype=np.int8),
+                           (np.concatenate([u, v]), np.concatenate([v, u]))),
+                          shape=(n, n))
+    A.sum_duplicates()
+    A.sort_indices()
+    return A.indptr.astype(np.int64), A.indices.astype(np.int64)
+
+
+def edge_array(indptr, indices):
+    ''' Each undirected edge once, as (u, v) with u < v. '''
+    u = np.repeat(np.arange(indptr.size - 1), np.diff(indptr))
+    keep = u < indices
+    return np.column_stack([u[keep], indices[keep]])
+
+
+def is_valid_coloring(indptr, indices, colors):
+    u = np.repeat(np.arange(indptr.size - 1), np.diff(indptr))
+    return bool(np.all(colors >= 0) and np.all(colors[u] != colors[indices]))
+
+
+# Heuristics ------------------------------------------------------------------
+def greedy_coloring(indptr, indices, order=None):
+    ''' Greedy coloring in the given order (default: largest degree first).
+
+        Returns an int array of colors 0..k-1.
+    '''
+    n = indptr.size - 1
+    if order is None:
+        order = np.argsort(-np.diff(indptr), kind='stable')
+    colors = np.full(n, -1, dtype=np.int64)
+    ptr = indptr.tolist()
+    for v in order.tolist():
+        used = set(colors[indices[ptr[v]:ptr[v + 1]]].tolist())
+        c = 0
+        while c in used:
+            c += 1
+        colors[v] = c
+    return colors
+
+
+def dsatur(indptr, indices):
+    ''' DSATUR: color the vertex with the most distinct neighbour colors next.
+
+        Ties go to the larger degree. The heap holds (-saturation, -degree,
+        vertex) entries; stale ones are skipped when popped.
+    '''
+    n = indptr.size - 1
+    ptr = indptr.tolist()
+    nbrs = indices.tolist()
+    degree = np.diff(indptr).tolist()
+    colors = [-1] * n
+    seen = [set() for _ in range(n)]
+    heap = [(0, -degree[v], v) for v in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        sat, _, v = heapq.heappop(heap)
+        if colors[v] >= 0 or -sat != len(seen[v]):
+            continue
+        used = seen[v]
+        c = 0
+        while c in used:
+            c += 1
+        colors[v] = c
+        for u in nbrs[ptr[v]:ptr[v + 1]]:
+            if colors[u] < 0 and c not in seen[u]:
+                seen[u].add(c)
+                heapq.heappush(heap, (-len(seen[u]), -degree[u], u))
+    return np.array(colors, dtype=np.int64)
+
+
+def greedy_clique(indptr, indices, n_starts=16):
+    ''' Largest of the maximal cliques grown greedily from the n_starts
+        highest-degree vertices.
+    '''
+    degree = np.diff(indptr)
+    best = []
+    for v in np.argsort(-degree, kind='stable')[:n_starts].tolist():
+        clique = [v]
+        candidates = set(indices[indptr[v]:indptr[v + 1]].tolist())
+        while candidates:
+            u = max(candidates, key=lambda w: degree[w])
+            clique.append(u)
+            candidates &= set(indices[indptr[u]:indptr[u + 1]].tolist())
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+# MIP -------------------------------------------------------------------------
+def coloring_model(indptr, indices, colors=None, clique=None):
+    ''' Pyomo coloring MIP with K = colors.max() + 1 available colors.
+
+        colors : heuristic coloring, used for K and as the warm start
+                 (x, y values are set); DSATUR by default.
+        clique : vertices fixed to colors 0..q-1; greedy_clique by default.
+    '''
+    n = indptr.size - 1
+    if colors is None:
+        colors = dsatur(indptr, indices)
+    if clique is None:
+        clique = greedy_clique(indptr, indices)
+    K = int(colors.max()) + 1
+    q = len(clique)
+    # Relabel the warm start by first use along the vertex order
+    rest = np.setdiff1d(np.arange(n), clique)
+    order = np.concatenate([clique, rest[np.argsort(-np.diff(indptr)[rest],
+                                                    kind='stable')]])
+    colors = _first_use_relabel(colors, order)
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n)
+
+    model = ConcreteModel(name='Coloring')
+    model.V = RangeSet(0, n - 1)
+    model.C = RangeSet(0, K - 1)
+    model.x = Var(model.V, model.C, within=Binary)
+    model.y = Var(model.C, within=Binary)
+    xs = [[model.x[v, c] for c in range(K)] for v in range(n)]
+    ys = [model.y[c] for c in range(K)]
+    model.obj = Objective(expr=sum(ys), sense=minimize)
+
+    def assign_rule(model, v):
+        return sum(xs[v]) == 1
+    model.assign = Constraint(model.V, rule=assign_rule)
+
+    edges = edge_array(indptr, indices)
+    eu, ev = edges[:, 0].tolist(), edges[:, 1].tolist()
+    model.E = RangeSet(0, len(eu) - 1)
+
+    def conflict_rule(model, e, c):
+        return xs[eu[e]][c] + xs[ev[e]][c] <= ys[c]
+    model.conflict = Constraint(model.E, model.C, rule=conflict_rule)
+
+    # Isolated vertices have no conflict row to switch y[c] on
+    isolated = np.flatnonzero(np.diff(indptr) == 0).tolist()
+    model.I = RangeSet(0, len(isolated) - 1)
+
+    def isolated_rule(model, i, c):
+        return xs[isolated[i]][c] <= ys[c]
+    model.isolated = Constraint(model.I, model.C, rule=isolated_rule)
+
+    model.C_pairs = RangeSet(0, K - 2)
+
+    def order_rule(model, c):
+        return ys[c] >= ys[c + 1]
+    model.color_order = Constraint(model.C_pairs, rule=order_rule)
+
+    # Symmetry breaking by fixing, which the writer drops from the rows
+    for v, p in zip(range(n), position.tolist()):
+        for c in range(p + 1, K):
+            xs[v][c].fix(0)
+    for i, v in enumerate(clique):
+        xs[v][i].fix(1)
+    for c in range(q):
+        ys[c].fix(1)
+
+    # Warm start
+    for v, c in enumerate(colors.tolist()):
+        for k in range(K):
+            if not xs[v][k].fixed:
+                xs[v][k].set_value(1 if k == c else 0)
+    for c in range(q, K):
+        ys[c].set_value(1)
+    model.lower_bound = q
+    return model
+
+
+def _first_use_relabel(colors, order):
+    ''' Relabel colors in order of first use along order. '''
+    mapping = {}
+    for v in order.tolist():
+        c = int(colors[v])
+        if c not in mapping:
+            mapping[c] = len(mapping)
+    return np.array([mapping[int(c)] for c in colors], dtype=np.int64)
+
+
+def solve_coloring(model, time_limit=60):
+    ''' Solve with HiGHS (appsi), warm started from the model's values.
+
+        Returns (colors, n_colors, lower_bound, termination).
+    '''
+    from pyomo.contrib.appsi.solvers import Highs
+    opt = Highs()
+    opt.config.warmstart = True
+    opt.config.time_limit = time_limit
+    opt.config.load_solution = False
+    res = opt.solve(model)
+    if res.best_feasible_objective is not None:
+        res.solution_loader.load_vars()
+    n = len(model.V)
+    K = len(model.C)
+    x = np.array([[value(model.x[v, c]) for c in range(K)]
+                  for v in range(n)])
+    bound = res.best_objective_bound
+    lower = max(model.lower_bound, int(np.ceil(bound - 1e-6))) \
+        if bound is not None else model.lower_bound
+    return (np.argmax(x, axis=1), res.best_feasible_objective, lower,
+            str(res.termination_condition))
+
+
+# Benchmark -------------------------------------------------------------------
+def random_graph(n, avg_degree=6, seed=0):
+    ''' G(n, m) random graph with about n * avg_degree / 2 edges. '''
+    rng = np.random.default_rng(seed)
+    m = n * avg_degree // 2
+    return to_csr_adjacency(rng.integers(0, n, (m, 2)), n)
+
+
+def planar_graph(n, seed=0):
+    ''' Delaunay triangulation of n random points (planar, <= 4 colors). '''
+    rng = np.random.default_rng(seed)
+    tri = Delaunay(rng.random((n, 2))).simplices
+    edges = np.concatenate([tri[:, [0, 1]], tri[:, [1, 2]], tri[:, [0, 2]]])
+    return to_csr_adjacency(edges, n)
+
+
+def benchmark_coloring(sizes=(100, 1000, 10**4, 10**5), mip_max_vertices=1000,
+                       time_limit=60):
+    ''' Colors found against time for each method on both graph families. '''
+    for family, generate in (('random', random_graph),
+                             ('planar', planar_graph)):
+        for n in sizes:
+            indptr, indices = generate(n)
+            q = len(greedy_clique(indptr, indices))
+            line = '{:<6} | n => {:>7,} | m => {:>7,} | clique => {}'.format(
+                family, n, indices.size // 2, q)
+            best = None
+            for label, heuristic in (('greedy', greedy_coloring),
+                                     ('dsatur', dsatur)):
+                start = time.perf_counter()
+                colors = heuristic(indptr, indices)
+                elapsed = time.perf_counter() - start
+                assert is_valid_coloring(indptr, indices, colors)
+                line += ' | {} => {} in {:.3f}s'.format(
+                    label, colors.max() + 1, elapsed)
+                if best is None or colors.max() < best.max():
+                    best = colors
+            if n <= mip_max_vertices:
+                start = time.perf_counter()
+                model = coloring_model(indptr, indices, colors=best)
+                colors, k, lower, status = solve_coloring(model, time_limit)
+                elapsed = time.perf_counter() - start
+                line += ' | mip => {:.0f} (lb {}) in {:.2f}s'.format(
+                    k, lower, elapsed)
+            print(line)
+
+
+if __name__ == '__main__':
+    # A 5-cycle needs three colors
+    indptr, indices = to_csr_adjacency([(0, 1), (1, 2), (2, 3), (3, 4),
+                                        (4, 0)])
+    model = coloring_model(indptr, indices)
+    colors, k, lower, status = solve_coloring(model)
+    print('Colors => {} | used => {:.0f} | {}'.format(colors, k, status))
+    benchmark_coloring()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Presolve for models with many fixed Vars.
+
+In ch4.py (create_var_fixed_vals_v2, funct_fix_var_vals_incur) and the
+swyfft rating flow, premium and incurred arrays are declared as Vars and
+fixed, and the rows that use them are carried to the solver writer as
+they were written. presolve() walks the active rows once and:
+
+    1.) substitutes the fixed values, so prem[p] * x[r] becomes a plain
+        linear term and rows are stored as LinearExpressions
+    2.) drops rows left with no free variable (raising if one is violated)
+    3.) turns rows with a single free variable into variable bounds
+    4.) drops rows that the variable bounds already imply
+
+The model is changed in place, like a Pyomo transformation: rows are
+deactivated and the fixed values are baked into the remaining rows, so
+presolve a model.clone() if the variables will be unfixed later. Rows that
+are nonlinear after substitution are left untouched.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import os
+import time
+import numpy as np
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Objective, Constraint,
+                           NonNegativeReals, minimize, value)
+from pyomo.core.expr.numeric_expr import LinearExpression
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.repn.standard_repn import generate_standard_repn
+
+from bulk_data import fix_block
+
+
+# Presolve --------------------------------------------------------------------
+def _activity_range(coefs, variables):
+    ''' Smallest and largest value of sum a*v over the variable bounds. '''
+    low = high = 0.0
+    for a, v in zip(coefs, variables):
+        lb, ub = v.lb, v.ub
+        lo_v, hi_v = (lb, ub) if a > 0 else (ub, lb)
+        low = None if low is None or lo_v is None else low + a * lo_v
+        high = None if high is None or hi_v is None else high + a * hi_v
+    return low, high
+
+
+def _linear_terms(repn):
+    ''' Nonzero (coefficient, variable) pairs of a linear repn. '''
+    pairs = [(c, v) for c, v in zip(repn.linear_coefs, repn.linear_vars)
+             if c != 0]
+    return [c for c, _ in pairs], [v for _, v in pairs]
+
+
+def presolve(model, tol=1e-9, singleton_bounds=True):
+    ''' Substitute fixed Vars and remove empty, singleton and redundant rows.
+
+        tol :              feasibility tolerance for dropped rows.
+        singleton_bounds : move single-variable rows into variable bounds.
+        Returns a report dict: rows / columns before, after and removed,
+        bounds_tightened, substituted (rows rewritten) and deactivated (the
+        removed ConstraintData objects).
+    '''
+    cols_before = {}
+    cols_after = {}
+    rows_before = 0
+    deactivated = []
+    tightened = substituted = 0
+
+    for con in model.component_data_objects(Constraint, active=True):
+        rows_before += 1
+        body_vars = list(identify_variables(con.body, include_fixed=True))
+        for v in body_vars:
+            cols_before[id(v)] = v
+        repn = generate_standard_repn(con.body, compute_values=True,
+                                      quadratic=False)
+        if not repn.is_linear():
+            for v in body_vars:
+                if not v.fixed:
+                    cols_after[id(v)] = v
+            continue
+        coefs, variables = _linear_terms(repn)
+        const = value(repn.constant)
+        lo = None if con.lower is None else value(con.lower) - const
+        up = None if con.upper is None else value(con.upper) - const
+
+        if not variables:
+            # Every variable was fixed: the row is a constant check
+            if (lo is not None and lo > tol) or (up is not None and up < -tol):
+                raise ValueError('Constraint {} is infeasible with the fixed '
+                                 'values'.format(con.name))
+            con.deactivate()
+            deactivated.append(con)
+            continue
+
+        if singleton_bounds and len(variables) == 1:
+            a, v = coefs[0], variables[0]
+            lb, ub = (lo, up) if a > 0 else (up, lo)
+            if lb is not None:
+                lb = lb / a
+                if v.lb is None or lb > v.lb:
+                    v.setlb(lb)
+            if ub is not None:
+                ub = ub / a
+                if v.ub is None or ub < v.ub:
+                    v.setub(ub)
+            if v.lb is not None and v.ub is not None and v.lb > v.ub + tol:
+                raise ValueError('Constraint {} leaves {} with crossed '
+                                 'bounds'.format(con.name, v.name))
+            tightened += 1
+            con.deactivate()
+            deactivated.append(con)
+            continue
+
+        low, high = _activity_range(coefs, variables)
+        if ((lo is None or (low is not None and low >= lo - tol))
+                and (up is None or (high is not None and high <= up + tol))):
+            con.deactivate()
+            deactivated.append(con)
+            continue
+
+        for v in variables:
+            cols_after[id(v)] = v
+        if const != 0 or len(variables) < len(body_vars):
+            con.set_value((lo, LinearExpression(constant=0, linear_coefs=coefs,
+                                                linear_vars=variables), up))
+            substituted += 1
+
+    for obj in model.component_data_objects(Objective, active=True):
+        for v in identify_variables(obj.expr, include_fixed=True):
+            cols_before[id(v)] = v
+        repn = generate_standard_repn(obj.expr, compute_values=True,
+                                      quadratic=False)
+        if repn.is_linear():
+            coefs, variables = _linear_terms(repn)
+            obj.set_value(LinearExpression(constant=value(repn.constant),
+                                           linear_coefs=coefs,
+                                           linear_vars=variables))
+        else:
+            variables = identify_variables(obj.expr, include_fixed=False)
+        for v in variables:
+            cols_after[id(v)] = v
+
+    rows_after = rows_before - len(deactivated)
+    return {'rows_before': rows_before, 'rows_after': rows_after,
+            'rows_removed': len(deactivated),
+            'cols_before': len(cols_before), 'cols_after': len(cols_after),
+            'cols_removed': len(cols_before) - len(cols_after),
+            'bounds_tightened': tightened, 'substituted': substituted,
+            'deactivated': deactivated}
+
+
+def format_report(report):
+    return ('rows => {rows_before} -> {rows_after} (-{rows_removed}) | '
+            'cols => {cols_before} -> {cols_after} (-{cols_removed}) | '
+            'bounds tightened => {bounds_tightened}'.format(**report))
+
+
+# Benchmark -------------------------------------------------------------------
+def fixed_rating_model(n_policies, n_levels=20, seed=0):
+    ''' Rating model in the ch4.py style: premiums and losses as fixed Vars.
+
+        y[p] == prem[p] * x[f[p]] / rmf[f[p]]     re-rated premium
+        incur[p] <= 50 * prem[p]                  data check, all fixed
+        sum y[p] == sum prem[p]                   rate neutrality
+        x[r] <= 1.25 * rmf[r]                     RMF cap, a single variable
+        min sum incur[p] / prem[p] * y[p]
+    '''
+    rng = np.random.default_rng(seed)
+    rmf = rng.uniform(0.8, 1.2, n_levels)
+    factor = rng.integers(0, n_levels, n_policies).tolist()
+    model = ConcreteModel()
+    model.P = RangeSet(0, n_policies - 1)
+    model.R = RangeSet(0, n_levels - 1)
+    model.prem = Var(model.P, dense=True)
+    model.incur = Var(model.P, dense=True)
+    fix_block(model.prem, rng.lognormal(7, 0.5, n_policies))
+    fix_block(model.incur, rng.gamma(0.3, 2.0, n_policies)
+              * np.array([v.value for v in model.prem.values()]))
+    model.x = Var(model.R, within=NonNegativeReals)
+    model.y = Var(model.P, within=NonNegativeReals)
+
+    def rerate_rule(model, p):
+        r = factor[p]
+        return model.y[p] == model.prem[p] * model.x[r] / rmf[r]
+    model.rerate = Constraint(model.P, rule=rerate_rule)
+
+    def data_check_rule(model, p):
+        return model.incur[p] <= 50 * model.prem[p]
+    model.data_check = Constraint(model.P, rule=data_check_rule)
+
+    model.neutral = Constraint(expr=sum(model.y.values())
+                               == sum(model.prem.values()))
+
+    def cap_rule(model, r):
+        return model.x[r] <= 1.25 * rmf[r]
+    model.cap = Constraint(model.R, rule=cap_rule)
+    model.obj = Objective(expr=sum(model.incur[p] / model.prem[p] * model.y[p]
+                                   for p in model.P), sense=minimize)
+    return model
+
+
+def _write(model, path):
+    start = time.perf_counter()
+    model.write(path, io_options={'symbolic_solver_labels': False})
+    return time.perf_counter() - start, os.path.getsize(path) / 2**20
+
+
+def benchmark_presolve(sizes=(10**3, 10**4, 10**5), formats=('lp', 'nl'),
+                       folder='.'):
+    ''' LP / NL write time and file size with and without presolve. '''
+    for n in sizes:
+        for fmt in formats:
+            path = os.path.join(folder, 'presolve_bench.{}'.format(fmt))
+            raw = _write(fixed_rating_model(n), path)
+            model = fixed_rating_model(n)
+            start = time.perf_counter()
+            report = presolve(model)
+            elapsed = time.perf_counter() - start
+            pre = _write(model, path)
+            os.remove(path)
+            print('policies => {:>7,} | {} | write => {:6.2f}s {:7.2f} MiB | '
+                  'presolve => {:6.2f}s + write {:6.2f}s {:7.2f} MiB'.format(
+                      n, fmt, raw[0], raw[1], elapsed, pre[0], pre[1]))
+        print('    ' + format_report(report))
+
+
+if __name__ == '__main__':
+    benchmark_presolve()
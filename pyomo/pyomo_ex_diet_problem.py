@@ -57,7 +57,8 @@ model.cost = Objective(rule=cost_rule, sense=minimize)
 # Limit nutrient consumption for each nutrient
 def nutrient_rule(model, j):
     value = sum(model.a[i,j]*model.x[i] for i in model.F)
-    return model.Nmin[j] <= value <= model.Nmax[j]
+    # A chained a <= b <= c is not allowed on Pyomo expressions; use a tuple
+    return (model.Nmin[j], value, model.Nmax[j])
 model.nutrient_limit = Constraint(model.N, rule=nutrient_rule)
 
 
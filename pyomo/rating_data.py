@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming loader for swyfft rating data.
+
+swyfft.py changes into a hard-coded directory and reads all of
+test_data.xlsx with pd.read_excel, which goes through openpyxl cell by cell
+and keeps every column in memory. load_rating_data reads only the premium,
+incurred and rating-factor columns, batch by batch:
+
+    .parquet  pyarrow ParquetFile.iter_batches(columns=...)
+    .csv      pd.read_csv(usecols=..., chunksize=...)
+    .xlsx     converted once to a cached .parquet next to the workbook
+              (<stem>.<sheet>.parquet for a named sheet; re-converted when
+              the workbook is newer), then read as .parquet
+
+Each batch is appended to a RatingData accumulator, which grows the
+premium / incurred arrays and assigns integer codes to factor levels as
+they first appear, so the index sets and parameter arrays are ready for
+rating_optimization.build_rating_model without a second pass.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Xlsx Conversion -------------------------------------------------------------
+def xlsx_to_parquet(path, parquet_path=None, sheet_name=None,
+                    batch_rows=100000):
+    ''' Stream a worksheet into a Parquet file, batch_rows rows at a time.
+
+        The first row is the header. Column types are inferred per batch
+        and widened when a later batch needs it (see _widen_type). The
+        sheet name is kept in the schema metadata. Returns the Parquet path.
+    '''
+    from openpyxl import load_workbook
+    parquet_path = parquet_path or parquet_name(path, sheet_name)
+    wb = load_workbook(path, read_only=True, data_only=True)
+    tmp_path = parquet_path + '.tmp'
+    writer = _BatchWriter(tmp_path, {b'sheet_name': _sheet_key(sheet_name)})
+    try:
+        try:
+            ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+            rows = ws.iter_rows(values_only=True)
+            header = [str(h) for h in next(rows)]
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_rows:
+                    writer.write(_batch_table(header, batch))
+                    batch = []
+            if batch or writer.schema is None:
+                writer.write(_batch_table(header, batch))
+        finally:
+            writer.close()
+            wb.close()
+        os.replace(tmp_path, parquet_path)
+    except BaseException:
+        # Never leave a partial file behind
+        for p in (tmp_path, writer.old_path):
+            if os.path.exists(p):
+                os.remove(p)
+        raise
+    return parquet_path
+
+
+def _batch_table(header, batch):
+    ''' One batch as an Arrow table; mixed-type columns become strings. '''
+    columns = list(zip(*batch)) if batch else [()] * len(header)
+    arrays = []
+    for values in columns:
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if v is None else str(v)
+                                    for v in values], type=pa.string()))
+    return pa.Table.from_arrays(arrays, names=header)
+
+
+def _is_number(t):
+    return pa.types.is_integer(t) or pa.types.is_floating(t)
+
+
+def _widen_type(a, b):
+    ''' Narrowest type holding both: null gives way to anything, mixed
+        numbers become float64 and any other mix becomes string.
+    '''
+    if a == b or pa.types.is_null(b):
+        return a
+    if pa.types.is_null(a):
+        return b
+    if _is_number(a) and _is_number(b):
+        return pa.float64()
+    return pa.string()
+
+
+class _BatchWriter(object):
+    ''' ParquetWriter whose schema widens as batches arrive.
+
+        When a batch needs a wider schema, the rows written so far are
+        streamed into a new file with the wider types.
+    '''
+
+    def __init__(self, path, metadata):
+        self.path = path
+        self.old_path = path + '.old'
+        self.metadata = metadata
+        self.schema = None
+        self._writer = None
+
+    def write(self, table):
+        if self.schema is None:
+            schema = table.schema
+        else:
+            schema = pa.schema([
+                pa.field(f.name, _widen_type(f.type, g.type))
+                for f, g in zip(self.schema, table.schema)])
+        if (self.schema is None
+                or not schema.equals(self.schema, check_metadata=False)):
+            self._reopen(schema)
+        self._writer.write_table(table.cast(self.schema))
+
+    def _reopen(self, schema):
+        schema = schema.with_metadata(self.metadata)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, schema)
+        else:
+            self._writer.close()
+            os.replace(self.path, self.old_path)
+            self._writer = pq.ParquetWriter(self.path, schema)
+            for batch in pq.ParquetFile(self.old_path).iter_batches():
+                self._writer.write_table(
+                    pa.Table.from_batches([batch]).cast(schema))
+            os.remove(self.old_path)
+        self.schema = schema
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _sheet_key(sheet_name):
+    return (sheet_name or '').encode('utf-8')
+
+
+def parquet_name(path, sheet_name=None):
+    ''' Cache path of a workbook sheet: <stem>.parquet for the first sheet,
+        <stem>.<sheet>.parquet for a named one.
+    '''
+    stem = os.path.splitext(path)[0]
+    if sheet_name:
+        stem += '.' + re.sub(r'[^\w-]+', '_', str(sheet_name))
+    return stem + '.parquet'
+
+
+def cached_parquet(path, sheet_name=None):
+    ''' Parquet copy of an xlsx sheet, converted when missing, older than
+        the workbook or written from another sheet.
+    '''
+    parquet_path = parquet_name(path, sheet_name)
+    if (not os.path.exists(parquet_path)
+            or os.path.getmtime(parquet_path) < os.path.getmtime(path)
+            or _cached_sheet(parquet_path) != _sheet_key(sheet_name)):
+        xlsx_to_parquet(path, parquet_path, sheet_name=sheet_name)
+    return parquet_path
+
+
+def _cached_sheet(parquet_path):
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    return metadata.get(b'sheet_name')
+
+
+# Batch Readers ---------------------------------------------------------------
+def iter_batches(path, columns, batch_rows=100000, sheet_name=None):
+    ''' Yield DataFrames holding only columns, batch_rows rows at a time. '''
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        path, ext = cached_parquet(path, sheet_name=sheet_name), '.parquet'
+    if ext in ('.parquet', '.pq'):
+        for batch in pq.ParquetFile(path).iter_batches(
+                batch_size=batch_rows, columns=list(columns)):
+            yield batch.to_pandas()
+    elif ext in ('.csv', '.txt'):
+        for chunk in pd.read_csv(path, usecols=list(columns),
+                                 chunksize=batch_rows):
+            yield chunk
+    else:
+        raise ValueError('Unsupported file type: {}'.format(ext))
+
+
+# Accumulator -----------------------------------------------------------------
+class RatingData(object):
+    ''' Incrementally built premium / incurred arrays and factor codes.
+
+        levels[f] maps each level of factor f to its integer code in order
+        of first appearance; codes[f] holds the code of every policy.
+    '''
+
+    def __init__(self, premium='premium', incurred='incurred', factors=()):
+        self.premium = premium
+        self.incurred = incurred
+        self.factors = list(factors)
+        self.levels = {f: {} for f in self.factors}
+        self._prem = []
+        self._incurred = []
+        self._codes = {f: [] for f in self.factors}
+
+    def add(self, frame):
+        ''' Append one batch of policies. '''
+        self._prem.append(frame[self.premium].to_numpy(dtype=float))
+        self._incurred.append(frame[self.incurred].to_numpy(dtype=float))
+        for f in self.factors:
+            codes, uniques = pd.factorize(frame[f])
+            if (codes < 0).any():
+                raise ValueError('Missing level in factor {}'.format(f))
+            levels = self.levels[f]
+            # Map batch-local codes onto the global, first-seen order
+            lookup = np.array([levels.setdefault(u, len(levels))
+                               for u in uniques.tolist()], dtype=np.int64)
+            self._codes[f].append(lookup[codes])
+
+    def arrays(self):
+        ''' Concatenated arrays: premium, incurred, codes and level labels. '''
+        return {'premium': _concat(self._prem, float),
+                'incurred': _concat(self._incurred, float),
+                'codes': {f: _concat(self._codes[f], np.int64)
+                          for f in self.factors},
+                'levels': {f: list(self.levels[f]) for f in self.factors}}
+
+
+def _concat(parts, dtype):
+    return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+
+def load_rating_data(path, premium='premium', incurred='incurred', factors=(),
+                     batch_rows=100000, sheet_name=None):
+    ''' Stream the rating columns of path into arrays (see RatingData). '''
+    data = RatingData(premium, incurred, factors)
+    columns = [premium, incurred] + list(factors)
+    for frame in iter_batches(path, columns, batch_rows=batch_rows,
+                              sheet_name=sheet_name):
+        data.add(frame)
+    return data.arrays()
+
+
+# Benchmark -------------------------------------------------------------------
+FACTORS = ('territory', 'construction', 'protection')
+
+
+def random_extract(n_rows, n_extra=12, seed=0):
+    ''' Policy extract with the rating columns plus n_extra unused ones. '''
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'policy_id': np.arange(n_rows),
+        'premium': rng.lognormal(7, 0.5, n_rows).round(2),
+        'incurred': rng.gamma(0.3, 2000, n_rows).round(2),
+        'territory': rng.choice(['T{:02d}'.format(i) for i in range(40)],
+                                n_rows),
+        'construction': rng.choice(['frame', 'masonry', 'superior'], n_rows),
+        'protection': rng.integers(1, 11, n_rows)})
+    for j in range(n_extra):
+        frame['extra_{}'.format(j)] = rng.normal(size=n_rows)
+    return frame
+
+
+def _peak_rss():
+    ''' Peak resident set size of this process in MiB (None if unknown). '''
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _load_case(method, path):
+    ''' Run one loader in a fresh process; returns (seconds, peak MiB). '''
+    start = time.perf_counter()
+    if method == 'read_excel':
+        pd.read_excel(path)
+    elif method == 'read_csv':
+        pd.read_csv(path)
+    else:
+        load_rating_data(path, factors=FACTORS)
+    elapsed = time.perf_counter() - start
+    return elapsed, _peak_rss()
+
+
+def benchmark_rating_data(sizes=(10**4, 10**5, 10**6), xlsx_max=10**5,
+                          folder='rating_data_bench'):
+    ''' Load time and peak RSS of full reads vs the streaming loader.
+
+        Each load runs in its own process so peak RSS is not carried over.
+        Workbooks are only written up to xlsx_max rows.
+    '''
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    for n in sizes:
+        frame = random_extract(n)
+        stem = os.path.join(folder, 'extract_{}'.format(n))
+        frame.to_csv(stem + '.csv', index=False)
+        cases = [('read_csv', 'read_csv', stem + '.csv'),
+                 ('stream csv', 'stream', stem + '.csv')]
+        if n <= xlsx_max:
+            xlsx = stem + '.xlsx'
+            frame.to_excel(xlsx, index=False)
+            if os.path.exists(stem + '.parquet'):
+                os.remove(stem + '.parquet')
+            cases += [('read_excel', 'read_excel', xlsx),
+                      ('stream xlsx (convert)', 'stream', xlsx),
+                      ('stream xlsx (cached)', 'stream', xlsx)]
+        else:
+            frame.to_parquet(stem + '.parquet', index=False)
+            cases += [('stream parquet', 'stream', stem + '.parquet')]
+        del frame
+        for label, method, path in cases:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                baseline = pool.submit(_peak_rss).result()
+                elapsed, peak = pool.submit(_load_case, method, path).result()
+            rss = 'n/a' if peak is None else '{:8.1f} MiB'.format(
+                peak - baseline)
+            print('rows => {:>9,} | {:<21} | load => {:8.3f}s | '
+                  'peak RSS => {}'.format(n, label, elapsed, rss))
+
+
+if __name__ == '__main__':
+    benchmark_rating_data()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Rate-neutral rate-making-factor (RMF) optimization as one sparse LP.
+
+The test() draft in swyfft.py indexes the RMF cap over P x R and re-sums
+the whole (rmf, premium) zip inside every rule call, so construction is
+O(|P| |R| n). Here every policy p carries its premium prem[p] and the
+index f[p] of its factor level, and the model is assembled once from COO
+triplets in O(nnz) and solved with HiGHS through scipy linprog.
+
+Variables :
+    x[r]      new RMF of factor level r
+    y[p]      new premium of policy p
+    d+[r], d-[r] deviation of x[r] from its target
+
+Model :
+    min   sum_r w[r] (d+[r] + d-[r])
+    s.t.  y[p] - prem[p] / rmf[f[p]] x[f[p]] == 0     (re-rated premium)
+          sum_p y[p] == S = sum_p prem[p]             (rate neutrality)
+          x[r] - d+[r] + d-[r] == target[r]
+          x[r] <= cap rmf[r]                          (RMF cap, 1.25)
+          x, y, d >= 0
+
+w[r] is the premium written at level r. Without losses the target is the
+current RMF; with losses it is the loss-ratio indicated RMF
+rmf[r] * LR[r] / LR, so the LP moves the factors towards experience while
+keeping the book's total premium unchanged.
+
+With aggregate=True the per-policy rows are folded into the neutrality row
+(sum_r P[r] / rmf[r] x[r] == S, P[r] the level premium), which gives the
+same optimal x with |R| instead of |P| + |R| columns.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+
+# Model Assembly --------------------------------------------------------------
+def indicated_rmf(prem, factor, rmf, losses):
+    ''' Loss-ratio indicated RMF per level: rmf[r] * LR[r] / overall LR. '''
+    n_levels = len(rmf)
+    level_prem = np.bincount(factor, weights=prem, minlength=n_levels)
+    level_loss = np.bincount(factor, weights=losses, minlength=n_levels)
+    overall = level_loss.sum() / level_prem.sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lr = np.where(level_prem > 0, level_loss / level_prem, overall)
+    return np.asarray(rmf, dtype=float) * lr / overall
+
+
+def build_rating_model(prem, factor, rmf, cap=1.25, losses=None, target=None,
+                       aggregate=False):
+    ''' Assemble the linprog inputs of the rate-neutral RMF problem.
+
+        prem :   (n,) current premium per policy.
+        factor : (n,) integer factor level of each policy, 0 <= f < len(rmf).
+        rmf :    (R,) current rate-making factor per level.
+        cap :    upper limit on the new RMF as a multiple of the current one.
+        losses : (n,) incurred losses, used for the indicated target.
+        target : (R,) explicit target RMF; overrides losses.
+        Returns a dict of linprog keyword arguments plus the sizes needed
+        to split the solution.
+    '''
+    prem = np.asarray(prem, dtype=float)
+    factor = np.asarray(factor, dtype=np.int64)
+    rmf = np.asarray(rmf, dtype=float)
+    n, R = prem.size, rmf.size
+    if target is None:
+        target = rmf if losses is None else indicated_rmf(
+            prem, factor, rmf, np.asarray(losses, dtype=float))
+    level_prem = np.bincount(factor, weights=prem, minlength=R)
+    S = prem.sum()
+
+    # Column layout: x (R) | y (n, per-policy only) | d+ (R) | d- (R)
+    n_y = 0 if aggregate else n
+    x_col = np.arange(R)
+    dp_col = R + n_y + x_col
+    dm_col = dp_col + R
+    n_cols = R + n_y + 2 * R
+
+    lev = np.arange(R)
+    if aggregate:
+        # sum_r P[r] / rmf[r] x[r] == S
+        rows = [np.zeros(R, dtype=np.int64)]
+        cols = [x_col]
+        vals = [level_prem / rmf]
+        dev_row0 = 1
+    else:
+        pol = np.arange(n)
+        y_col = R + pol
+        # Policy rows 0..n-1, neutrality row n
+        rows = [pol, pol, np.full(n, n)]
+        cols = [y_col, factor, y_col]
+        vals = [np.ones(n), -prem / rmf[factor], np.ones(n)]
+        dev_row0 = n + 1
+    rows += [dev_row0 + lev, dev_row0 + lev, dev_row0 + lev]
+    cols += [x_col, dp_col, dm_col]
+    vals += [np.ones(R), -np.ones(R), np.ones(R)]
+    n_eq = dev_row0 + R
+    A_eq = sparse.csr_matrix((np.concatenate(vals),
+                              (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(n_eq, n_cols))
+    b_eq = np.zeros(n_eq)
+    b_eq[n_y] = S
+    b_eq[dev_row0:] = target
+
+    # RMF cap rows
+    A_ub = sparse.csr_matrix((np.ones(R), (lev, x_col)), shape=(R, n_cols))
+    b_ub = cap * rmf
+
+    c = np.zeros(n_cols)
+    c[dp_col] = level_prem
+    c[dm_col] = level_prem
+    return {'c': c, 'A_ub': A_ub, 'b_ub': b_ub, 'A_eq': A_eq, 'b_eq': b_eq,
+            'bounds': (0, None), 'n_levels': R, 'aggregate': aggregate,
+            'prem': prem, 'factor': factor, 'rmf': rmf, 'target': target}
+
+
+def solve_rating_model(model, method='highs', options=None):
+    ''' Solve a model from build_rating_model with HiGHS.
+
+        Returns the linprog result with extra fields new_rmf (R,) and
+        new_prem (n,); new_prem sums to the original premium.
+    '''
+    keys = ('c', 'A_ub', 'b_ub', 'A_eq', 'b_eq', 'bounds')
+    res = linprog(method=method, options=options,
+                  **{k: model[k] for k in keys})
+    if res.status == 0:
+        R = model['n_levels']
+        res.new_rmf = res.x[:R]
+        if model['aggregate']:
+            f = model['factor']
+            res.new_prem = model['prem'] * res.new_rmf[f] / model['rmf'][f]
+        else:
+            res.new_prem = res.x[R:R + model['prem'].size]
+    return res
+
+
+# Benchmark -------------------------------------------------------------------
+def random_book(n_policies, n_levels=20, seed=0):
+    ''' Random book: premiums, factor levels, current RMFs and losses. '''
+    rng = np.random.default_rng(seed)
+    rmf = rng.uniform(0.8, 1.2, n_levels)
+    factor = rng.integers(0, n_levels, n_policies)
+    prem = rng.lognormal(7, 0.5, n_policies) * rmf[factor]
+    # Some levels run hotter than others
+    level_lr = rng.uniform(0.4, 0.9, n_levels)
+    losses = prem * level_lr[factor] * rng.gamma(2.0, 0.5, n_policies)
+    return prem, factor, rmf, losses
+
+
+def benchmark_rating_model(sizes=(10**3, 10**5, 10**6), n_levels=20):
+    ''' Build and solve time of the per-policy and aggregated systems. '''
+    for n in sizes:
+        prem, factor, rmf, losses = random_book(n, n_levels)
+        for aggregate in (False, True):
+            start = time.perf_counter()
+            model = build_rating_model(prem, factor, rmf, losses=losses,
+                                       aggregate=aggregate)
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            res = solve_rating_model(model)
+            solve = time.perf_counter() - start
+            print('policies => {:>9,} | {:<10} | nnz => {:>9,} | build => '
+                  '{:7.3f}s | solve => {:7.3f}s | deviation => {:.4g} | '
+                  'premium change => {:.2e}'.format(
+                      n, 'aggregate' if aggregate else 'per-policy',
+                      model['A_eq'].nnz, build, solve, res.fun,
+                      res.new_prem.sum() - prem.sum()))
+
+
+if __name__ == '__main__':
+    # The create_rmf_var_v2 data: four policies, one per factor level
+    res = solve_rating_model(build_rating_model(
+        [1000, 1000, 1000, 1000], [0, 1, 2, 3], [0.9, 1.2, 1.0, 1.20],
+        losses=[500, 900, 700, 600]))
+    print('New RMF => {}'.format(np.round(res.new_rmf, 4)))
+    print('New premium => {}'.format(np.round(res.new_prem, 2)))
+    benchmark_rating_model()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental re-solve of the rate-making-factor (RMF) model across scenarios.
+
+create_rmf_var_v2 in swyfft.py builds a new ConcreteModel and starts a new
+GLPK process for every scenario, although only rmf / prem and the right
+hand sides of the limits change. RmfScenarioRunner builds the model once
+with mutable Params and keeps a persistent in-process HiGHS instance
+(pyomo.contrib.appsi). Between scenarios only the Param values are
+updated; the solver is told not to look for structural changes, pushes
+the new coefficients and bounds to HiGHS and re-solves from the previous
+optimal basis.
+
+Model (as in create_rmf_var_v2) :
+    max   sum (x[i] + 1) * prem[i]
+    s.t.  x[i] <= 1.25 - rmf[i]
+          x[i] in [-0.5, 0.5], NonNegativeReals
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+from pyomo.environ import (ConcreteModel, RangeSet, Param, Var, Objective,
+                           Constraint, NonNegativeReals, SolverFactory,
+                           maximize, value)
+from pyomo.contrib.appsi.solvers import Highs
+
+
+# Model -----------------------------------------------------------------------
+def build_rmf_model(rmf, prem, mutable=True):
+    ''' The create_rmf_var_v2 model with rmf and prem as indexed Params. '''
+    rmf = np.asarray(rmf, dtype=float)
+    prem = np.asarray(prem, dtype=float)
+    model = ConcreteModel()
+    model.I = RangeSet(0, rmf.size - 1)
+    model.rmf = Param(model.I, initialize=dict(enumerate(rmf.tolist())),
+                      mutable=mutable)
+    model.prem = Param(model.I, initialize=dict(enumerate(prem.tolist())),
+                       mutable=mutable)
+    model.x = Var(model.I, within=NonNegativeReals, bounds=(-0.5, 0.5))
+    model.Obj = Objective(expr=sum((model.x[i] + 1) * model.prem[i]
+                                   for i in model.I), sense=maximize)
+
+    # 1.25 - rmf[i] will give us the margin over which we can increase
+    def limits_rule(model, i):
+        return model.x[i] <= 1.25 - model.rmf[i]
+    model.limits = Constraint(model.I, rule=limits_rule)
+    return model
+
+
+# Scenario Runner -------------------------------------------------------------
+class RmfScenarioRunner(object):
+    ''' Build once, then update Params and re-solve per scenario. '''
+
+    def __init__(self, rmf, prem):
+        self.model = build_rmf_model(rmf, prem)
+        self.opt = Highs()
+        # Only Param values change between scenarios
+        cfg = self.opt.update_config
+        cfg.check_for_new_or_removed_constraints = False
+        cfg.check_for_new_or_removed_vars = False
+        cfg.check_for_new_or_removed_params = False
+        cfg.check_for_new_objective = False
+        cfg.update_constraints = False
+        cfg.update_vars = False
+        cfg.update_named_expressions = False
+        cfg.update_params = True
+
+    def solve(self, rmf, prem):
+        ''' Solve one scenario; returns (objective, x array, status). '''
+        model = self.model
+        for i, (r, p) in enumerate(zip(rmf, prem)):
+            model.rmf[i] = r
+            model.prem[i] = p
+        res = self.opt.solve(model)
+        x = np.array([model.x[i].value for i in model.I])
+        return res.best_feasible_objective, x, str(res.termination_condition)
+
+    def run(self, scenarios):
+        ''' Solve a sequence of (rmf, prem) pairs; returns a list of results. '''
+        return [self.solve(rmf, prem) for rmf, prem in scenarios]
+
+
+def rebuild_solve(rmf, prem, solver='glpk'):
+    ''' The current approach: a fresh model and solver call per scenario. '''
+    model = build_rmf_model(rmf, prem, mutable=False)
+    SolverFactory(solver).solve(model)
+    x = np.array([model.x[i].value for i in model.I])
+    return value(model.Obj), x
+
+
+# Benchmark -------------------------------------------------------------------
+def random_scenarios(n_factors, n_scenarios, seed=0):
+    rng = np.random.default_rng(seed)
+    return [(rng.uniform(0.8, 1.25, n_factors),
+             rng.uniform(500, 1500, n_factors)) for _ in range(n_scenarios)]
+
+
+def benchmark_rmf_scenarios(n_factors=(4, 1000), n_scenarios=200,
+                            rebuild_solvers=('glpk', 'appsi_highs')):
+    ''' Per-scenario latency of the persistent runner vs rebuild-and-solve.
+
+        Rebuild solvers that are not installed are skipped.
+    '''
+    for n in n_factors:
+        scenarios = random_scenarios(n, n_scenarios)
+        runner = RmfScenarioRunner(*scenarios[0])
+        runner.solve(*scenarios[0])
+        times = []
+        for rmf, prem in scenarios:
+            start = time.perf_counter()
+            runner.solve(rmf, prem)
+            times.append(time.perf_counter() - start)
+        _report(n, 'persistent highs', times)
+        for solver in rebuild_solvers:
+            if not SolverFactory(solver).available(exception_flag=False):
+                continue
+            times = []
+            for rmf, prem in scenarios:
+                start = time.perf_counter()
+                rebuild_solve(rmf, prem, solver=solver)
+                times.append(time.perf_counter() - start)
+            _report(n, 'rebuild ' + solver, times)
+
+
+def _report(n, label, times):
+    times = 1000 * np.asarray(times)
+    print('factors => {:>5} | {:<20} | mean => {:8.2f} ms | p50 => {:8.2f} ms'
+          ' | p95 => {:8.2f} ms'.format(n, label, times.mean(),
+                                        np.percentile(times, 50),
+                                        np.percentile(times, 95)))
+
+
+if __name__ == '__main__':
+    # The create_rmf_var_v2 instance
+    runner = RmfScenarioRunner([0.9, 1.2, 1.0, 1.20], [1000] * 4)
+    print(runner.solve([0.9, 1.2, 1.0, 1.20], [1000] * 4))
+    benchmark_rmf_scenarios()
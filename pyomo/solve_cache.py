@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Solver-result cache keyed on a canonical model hash.
+
+The examples (concrete_model_v1 in ch1.py, production() in
+pyomo_tutorial_production_plant.py, concrete_v1 in ch3.py) call
+SolverFactory('glpk').solve(model) from scratch on every run. cached_solve
+first reduces the model to a canonical form: variable domains and bounds,
+the objective sense and every active constraint as (lower, upper, linear
+coefficients, quadratic terms, nonlinear remainder), sorted by component
+name and with coefficients evaluated. The SHA-256 of that form, together
+with the solver name and options, keys an SQLite store of statuses and
+variable values. Identical re-solves load the stored values instead of
+calling the solver; the store is trimmed least-recently-used first once it
+grows past max_bytes. Only optimal results are stored. Without a cache
+argument, cached_solve uses one module-level SolveCache on
+solve_cache.sqlite, closed at exit.
+
+Steps :
+    1.) key = model_hash(model) + solver + options
+    2.) in-memory dict  -> hit returns without touching disk
+    3.) SQLite table    -> hit loads values into the model
+    4.) miss            -> solve, store if optimal, evict down to max_bytes
+"""
+
+# Import Libraries ------------------------------------------------------------
+import atexit
+import hashlib
+import json
+import sqlite3
+import time
+from pyomo.environ import (Var, Objective, Constraint, SolverFactory, value,
+                           TerminationCondition)
+from pyomo.repn.standard_repn import generate_standard_repn
+from pyomo.core.expr.visitor import (expression_to_string,
+                                     identify_mutable_parameters,
+                                     replace_expressions)
+
+
+# Canonical Hash --------------------------------------------------------------
+def _num(x):
+    ''' Exact, platform independent text for a number (None for no bound). '''
+    if x is None:
+        return None
+    return float(value(x)).hex()
+
+
+def _canonical_expr(expr, names):
+    ''' Canonical (constant, linear, quadratic, nonlinear) form of expr. '''
+    repn = generate_standard_repn(expr, compute_values=True, quadratic=True)
+    linear = sorted((names[id(v)], _num(c))
+                    for v, c in zip(repn.linear_vars, repn.linear_coefs))
+    quadratic = sorted((tuple(sorted((names[id(a)], names[id(b)]))), _num(c))
+                       for (a, b), c in zip(repn.quadratic_vars,
+                                            repn.quadratic_coefs))
+    nonlinear = None
+    if repn.nonlinear_expr is not None:
+        # The remainder still holds mutable Params; print their values, not
+        # their names, so a changed Param changes the hash
+        expr = repn.nonlinear_expr
+        values = {id(p): float(value(p))
+                  for p in identify_mutable_parameters(expr)}
+        if values:
+            expr = replace_expressions(expr, values,
+                                       descend_into_named_expressions=True,
+                                       remove_named_expressions=True)
+        nonlinear = expression_to_string(expr)
+    return [_num(repn.constant), linear, quadratic, nonlinear]
+
+
+def canonical_form(model):
+    ''' JSON-serializable canonical description of a model. '''
+    variables = []
+    names = {}
+    for v in model.component_data_objects(Var, sort=True):
+        names[id(v)] = v.name
+        variables.append([v.name, v.domain.name, _num(v.lb), _num(v.ub),
+                          _num(v.value) if v.fixed else None])
+    objectives = [[o.name, int(o.sense), _canonical_expr(o.expr, names)]
+                  for o in model.component_data_objects(
+                      Objective, active=True, sort=True)]
+    constraints = [[c.name, _num(c.lower), _num(c.upper),
+                    _canonical_expr(c.body, names)]
+                   for c in model.component_data_objects(
+                       Constraint, active=True, sort=True)]
+    return {'variables': variables, 'objectives': objectives,
+            'constraints': constraints}
+
+
+def model_hash(model):
+    ''' Stable SHA-256 of the canonical form of a model. '''
+    text = json.dumps(canonical_form(model), separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# SQLite Store ----------------------------------------------------------------
+class SolveCache(object):
+    ''' SQLite-backed store of solver results with size-based LRU eviction.
+
+        path :      database file (':memory:' for a throwaway cache).
+        max_bytes : total payload size kept on disk before evicting the
+                    least recently used entries.
+
+        Hits served from memory are recorded in _touched and written to
+        last_access before each eviction pass, so SQLite stays the single
+        LRU order without a disk write per hit.
+    '''
+
+    def __init__(self, path='solve_cache.sqlite', max_bytes=64 * 2**20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+        self._touched = {}
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            ' key TEXT PRIMARY KEY,'
+            ' payload TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_access REAL NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS results_lru '
+                           'ON results (last_access)')
+        self._conn.commit()
+
+    def get(self, key):
+        ''' Return the stored payload dict for key, or None. '''
+        if key in self._memory:
+            self.hits += 1
+            self._touched[key] = time.time()
+            return self._memory[key]
+        row = self._conn.execute('SELECT payload FROM results WHERE key = ?',
+                                 (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self._touched[key] = time.time()
+        self._flush()
+        self.hits += 1
+        payload = json.loads(row[0])
+        self._memory[key] = payload
+        return payload
+
+    def put(self, key, payload):
+        text = json.dumps(payload, separators=(',', ':'))
+        self._conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                           (key, text, len(text), time.time()))
+        self._memory[key] = payload
+        self._touched.pop(key, None)
+        self._evict()
+
+    def _flush(self):
+        ''' Write pending access times to last_access. '''
+        if self._touched:
+            self._conn.executemany(
+                'UPDATE results SET last_access = ? WHERE key = ?',
+                [(t, key) for key, t in self._touched.items()])
+            self._touched.clear()
+        self._conn.commit()
+
+    def _evict(self):
+        self._flush()
+        total = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        while total > self.max_bytes:
+            key, size = self._conn.execute(
+                'SELECT key, size FROM results ORDER BY last_access '
+                'LIMIT 1').fetchone()
+            self._conn.execute('DELETE FROM results WHERE key = ?', (key,))
+            self._memory.pop(key, None)
+            total -= size
+        self._conn.commit()
+
+    def stats(self):
+        ''' Hit / miss counters and the current number of stored entries. '''
+        n, size = self._conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': n,
+                'bytes': size}
+
+    def clear(self):
+        self._conn.execute('DELETE FROM results')
+        self._conn.commit()
+        self._memory.clear()
+        self._touched.clear()
+
+    def close(self):
+        self._flush()
+        self._conn.close()
+
+
+# Cached Solve ----------------------------------------------------------------
+_default_cache = None
+
+
+def default_cache():
+    ''' The shared SolveCache on solve_cache.sqlite, opened on first use. '''
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SolveCache()
+        atexit.register(_default_cache.close)
+    return _default_cache
+
+
+def cached_solve(model, solver='glpk', cache=None, options=None):
+    ''' Solve model, or load the stored solution of an identical model.
+
+        Returns a dict with status, termination_condition, objective,
+        from_cache and the cache key. On a hit the variable values are
+        loaded into the model, so model.obj() and model.x() work as after
+        a real solve. Results that are not optimal are returned but not
+        stored. cache defaults to default_cache().
+    '''
+    if cache is None:
+        cache = default_cache()
+    options = options or {}
+    key = hashlib.sha256('{}|{}|{}'.format(
+        model_hash(model), solver,
+        json.dumps(options, sort_keys=True)).encode('utf-8')).hexdigest()
+    payload = cache.get(key)
+    from_cache = payload is not None
+    if payload is None:
+        opt = SolverFactory(solver)
+        for name, val in options.items():
+            opt.options[name] = val
+        results = opt.solve(model)
+        condition = results.solver.termination_condition
+        payload = {'status': str(results.solver.status),
+                   'termination_condition': str(condition),
+                   'values': {v.name: v.value for v in
+                              model.component_data_objects(Var, sort=True)}}
+        if condition == TerminationCondition.optimal:
+            cache.put(key, payload)
+    else:
+        values = payload['values']
+        for v in model.component_data_objects(Var):
+            v.set_value(values.get(v.name), skip_validation=True)
+    objectives = list(model.component_data_objects(Objective, active=True))
+    objective = value(objectives[0], exception=False) if objectives else None
+    return {'status': payload['status'],
+            'termination_condition': payload['termination_condition'],
+            'objective': objective,
+            'from_cache': from_cache,
+            'key': key}
+
+
+if __name__ == '__main__':
+    # The ch1.py example model: min x1 + 2x2 s.t. 3x1 + 4x2 >= 1 ...
+    from ch1 import build_concrete_model_v1
+    cache = SolveCache(':memory:')
+    for i in range(3):
+        start = time.perf_counter()
+        res = cached_solve(build_concrete_model_v1(), solver='appsi_highs',
+                           cache=cache)
+        elapsed = time.perf_counter() - start
+        print('run {} | from_cache => {} | objective => {} | {:.1f} us'.format(
+            i, res['from_cache'], res['objective'], 1e6 * elapsed))
+    print(cache.stats())
@@ -19,6 +19,8 @@ os.chdir(dir_coreprof_eda)
 import functions_get_loss_ratio_deciles_indv_feature_sampling_w_replacement as m1
 
 # Import Data
+# For large extracts use rating_data.load_rating_data (streams only the
+# rating columns and caches the workbook as Parquet)
 os.chdir(dir_data)
 data = pd.read_excel('test_data.xlsx')
 
@@ -39,6 +41,7 @@ eq_con : A constraint that says that the new premiums that are generated
     cannot be greater than the original premium "rate neutrality"
 '''
 
+# Vectorized, O(nnz) version of this model: rating_optimization.py
 def test():
     P = [premiums]
     R = [rate_making_factors]
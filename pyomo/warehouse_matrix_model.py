@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Array-backed warehouse location (P-median) model builder.
+
+warehouse_concrete_model in ch3.py indexes x by (warehouse, customer) name
+tuples and builds every sum with a Python generator, so construction
+creates O(N*M) Python objects through the rule machinery. Here the
+distance data is a NumPy matrix or a scipy.sparse COO matrix whose stored
+entries are the allowed (warehouse, customer) arcs:
+
+    min   sum d[n,m] x[n,m]
+    s.t.  sum_n x[n,m] == 1          for every customer m
+          x[n,m] <= y[n]             for every arc (n, m)
+          sum_n y[n] <= P
+          0 <= x <= 1, y binary
+
+build_warehouse_model indexes x by integer arc id and assembles every row
+from precomputed variable lists: the objective is a single LinearExpression
+over the cost array, customer rows are quicksums over contiguous slices and
+the activation rows x[k] <= y[site[k]] are paired straight from the arc
+arrays. build_warehouse_highs skips Pyomo and passes the CSC matrix straight
+to HiGHS. A customer without any arc would leave an infeasible 0 == 1 row,
+so to_arcs rejects such data up front.
+
+Ref : Pyomo - Optimization Modeling in Python, section 3.3.5
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import tracemalloc
+import numpy as np
+from scipy import sparse
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Binary, Objective,
+                           Constraint, SolverFactory, minimize, quicksum)
+from pyomo.core.expr.numeric_expr import LinearExpression
+
+
+# Distance Data ---------------------------------------------------------------
+def to_arcs(d):
+    ''' Convert distance data to arc arrays (site, customer, cost).
+
+        d : dense (N, M) array, where every pair is an arc, or a scipy.sparse
+            matrix, where only the stored entries are arcs.
+        Returns (site, cust, cost, N, M) with arcs sorted by customer.
+        Raises ValueError when a customer has no arc.
+    '''
+    if sparse.issparse(d):
+        coo = d.tocoo()
+        site, cust, cost = coo.row, coo.col, coo.data
+    else:
+        d = np.asarray(d, dtype=float)
+        site, cust = np.divmod(np.arange(d.size), d.shape[1])
+        cost = d.ravel()
+    uncovered = np.flatnonzero(np.bincount(cust, minlength=d.shape[1]) == 0)
+    if uncovered.size:
+        raise ValueError('Customers without any warehouse arc => {}'.format(
+            uncovered.tolist()))
+    order = np.lexsort((site, cust))
+    return (site[order].astype(np.int64), cust[order].astype(np.int64),
+            np.asarray(cost, dtype=float)[order], d.shape[0], d.shape[1])
+
+
+def nearest_sites(d, k):
+    ''' Keep only the k cheapest sites per customer, as a sparse COO matrix.
+
+        Customers are almost never served from far-away sites, so this
+        shrinks an (N, M) problem to k * M arcs.
+    '''
+    d = np.asarray(d, dtype=float)
+    k = min(k, d.shape[0])
+    rows = np.argpartition(d, k - 1, axis=0)[:k]
+    cols = np.broadcast_to(np.arange(d.shape[1]), rows.shape)
+    return sparse.coo_matrix((d[rows, cols].ravel(),
+                              (rows.ravel(), cols.ravel())), shape=d.shape)
+
+
+# Pyomo Builder ---------------------------------------------------------------
+def build_warehouse_model(d, P):
+    ''' Build the P-median model from a dense or sparse distance matrix.
+
+        Variables are indexed by integers: model.x[k] for arc k and
+        model.y[n] for site n; model.arc_site / model.arc_cust map arcs back
+        to (site, customer).
+    '''
+    site, cust, cost, N, M = to_arcs(d)
+    n_arcs = site.size
+    model = ConcreteModel(name='WL')
+    model.N = RangeSet(0, N - 1)
+    model.M = RangeSet(0, M - 1)
+    model.A = RangeSet(0, n_arcs - 1)
+    model.x = Var(model.A, bounds=(0, 1))
+    model.y = Var(model.N, within=Binary)
+    model.arc_site = site
+    model.arc_cust = cust
+
+    xs = list(model.x.values())
+    ys = list(model.y.values())
+    model.obj = Objective(expr=LinearExpression(
+        constant=0, linear_coefs=cost.tolist(), linear_vars=xs),
+        sense=minimize)
+
+    # Arcs are sorted by customer, so each customer owns a contiguous slice
+    bounds = np.searchsorted(cust, np.arange(M + 1)).tolist()
+
+    def one_per_cust_rule(model, m):
+        return quicksum(xs[bounds[m]:bounds[m + 1]]) == 1
+    model.one_per_cust = Constraint(model.M, rule=one_per_cust_rule)
+
+    # One row per arc, x[k] <= y[site[k]], in arc order
+    model.warehouse_active = Constraint(model.A, rule=[
+        x <= ys[n] for x, n in zip(xs, site.tolist())])
+
+    model.num_warehouses = Constraint(expr=quicksum(ys) <= P)
+    return model
+
+
+def build_warehouse_model_rules(d, P):
+    ''' The ch3.py rule-based construction, generalized to an (N, M) array.
+
+        Kept as the baseline for benchmark_warehouse_build.
+    '''
+    d = np.asarray(d, dtype=float)
+    N = ['W{}'.format(i) for i in range(d.shape[0])]
+    M = ['C{}'.format(j) for j in range(d.shape[1])]
+    dist = {(n, m): d[i, j] for i, n in enumerate(N) for j, m in enumerate(M)}
+    model = ConcreteModel(name='WL')
+    model.x = Var(N, M, bounds=(0, 1))
+    model.y = Var(N, within=Binary)
+
+    def obj_rule(model):
+        return sum(dist[n, m] * model.x[n, m] for n in N for m in M)
+    model.obj = Objective(rule=obj_rule)
+
+    def one_per_cust_rule(model, m):
+        return sum(model.x[n, m] for n in N) == 1
+    model.one_per_cust = Constraint(M, rule=one_per_cust_rule)
+
+    def warehouse_active_rule(model, n, m):
+        return model.x[n, m] <= model.y[n]
+    model.warehouse_active = Constraint(N, M, rule=warehouse_active_rule)
+
+    def num_warehouses_rule(model):
+        return sum(model.y[n] for n in N) <= P
+    model.num_warehouses = Constraint(rule=num_warehouses_rule)
+    return model
+
+
+# Direct HiGHS Builder --------------------------------------------------------
+def build_warehouse_highs(d, P):
+    ''' Build the same model as a highspy.Highs instance from CSC arrays.
+
+        Columns are the arcs followed by the sites; rows are the customer
+        rows, the arc activation rows and the P-limit row.
+    '''
+    import highspy
+    site, cust, cost, N, M = to_arcs(d)
+    n_arcs = site.size
+    arc = np.arange(n_arcs)
+    # Each arc column has entries in its customer row and its own row
+    rows = np.concatenate([cust, M + arc,
+                           M + arc, np.full(N, M + n_arcs)])
+    cols = np.concatenate([arc, arc, n_arcs + site, n_arcs + np.arange(N)])
+    vals = np.concatenate([np.ones(n_arcs), np.ones(n_arcs),
+                           -np.ones(n_arcs), np.ones(N)])
+    n_rows = M + n_arcs + 1
+    A = sparse.csc_matrix((vals, (rows, cols)), shape=(n_rows, n_arcs + N))
+    inf = highspy.kHighsInf
+    lp = highspy.HighsLp()
+    lp.num_col_ = n_arcs + N
+    lp.num_row_ = n_rows
+    lp.col_cost_ = np.concatenate([cost, np.zeros(N)])
+    lp.col_lower_ = np.zeros(n_arcs + N)
+    lp.col_upper_ = np.ones(n_arcs + N)
+    lp.row_lower_ = np.concatenate([np.ones(M), np.full(n_arcs + 1, -inf)])
+    lp.row_upper_ = np.concatenate([np.ones(M), np.zeros(n_arcs), [P]])
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = A.indptr
+    lp.a_matrix_.index_ = A.indices
+    lp.a_matrix_.value_ = A.data
+    lp.integrality_ = ([highspy.HighsVarType.kContinuous] * n_arcs
+                       + [highspy.HighsVarType.kInteger] * N)
+    h = highspy.Highs()
+    h.setOptionValue('output_flag', False)
+    h.passModel(lp)
+    return h
+
+
+# Benchmark -------------------------------------------------------------------
+def _measure(build, *args):
+    ''' Build time from a plain run, peak memory from a traced rerun. '''
+    start = time.perf_counter()
+    build(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    build(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def benchmark_warehouse_build(sizes=((3, 4), (50, 500), (200, 2000),
+                                     (2000, 50000)),
+                              k_nearest=10, rules_max_arcs=10**6, seed=0):
+    ''' Build time and peak traced memory of each construction path.
+
+        Up to rules_max_arcs arcs the distance matrix is dense and all four
+        paths run. Above it a dense matrix would not fit in memory, so only
+        the sparse paths run, on k_nearest random arcs per customer.
+    '''
+    rng = np.random.default_rng(seed)
+    for N, M in sizes:
+        P = max(1, N // 10)
+        if N * M <= rules_max_arcs:
+            d = rng.uniform(100, 2500, (N, M))
+            arcs = nearest_sites(d, k_nearest)
+            cases = [('rules', build_warehouse_model_rules, d),
+                     ('arrays', build_warehouse_model, d)]
+        else:
+            k = min(k_nearest, N)
+            # Distinct sites per customer: evenly spaced from a random start
+            rows = (rng.integers(0, N, M)[None, :]
+                    + np.arange(k)[:, None] * (N // k)) % N
+            cols = np.broadcast_to(np.arange(M), rows.shape)
+            arcs = sparse.coo_matrix((rng.uniform(100, 2500, rows.size),
+                                      (rows.ravel(), cols.ravel())),
+                                     shape=(N, M))
+            cases = []
+        cases += [('sparse k={}'.format(k_nearest), build_warehouse_model,
+                   arcs),
+                  ('highs sparse', build_warehouse_highs, arcs)]
+        for label, build, data in cases:
+            elapsed, peak = _measure(build, data, P)
+            print('N x M => {:>5} x {:<6} | {:<13} | build => {:8.3f}s | '
+                  'peak => {:9.1f} MiB'.format(N, M, label, elapsed, peak))
+
+
+if __name__ == '__main__':
+    # The ch3.py example: 3 warehouses, 4 customers, P = 2
+    d = np.array([[1956, 1606, 1410, 330],
+                  [1096, 1792, 531, 567],
+                  [485, 2322, 324, 1236]])
+    model = build_warehouse_model(d, 2)
+    SolverFactory('appsi_highs').solve(model)
+    print('Objective => {}'.format(model.obj()))
+    print('Open warehouses => {}'.format(
+        [n for n in model.N if model.y[n].value > 0.5]))
+    benchmark_warehouse_build()
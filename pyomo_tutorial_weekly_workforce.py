@@ -48,9 +48,10 @@ def obj_rule(m):
 model.obj = Objective(rule=obj_rule, sense=minimize)
 
 
-
-
-
-
-
-
+# Constraints & Solve ---------------------------------------------------------
+# The coverage, hours, rest, needed and preference constraints, the solve and
+# a version that scales to thousands of workers (integer-coded works[] and
+# constraint blocks built as one sparse matrix) are in
+# pyomo_workforce_scheduling.py. A column-generation version for 5,000+
+# workers over several weeks, priced in a process pool, is in
+# scipy_workforce_decomposition.py
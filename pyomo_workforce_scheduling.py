@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Weekly workforce scheduling with integer-encoded (worker, day, shift) arrays.
+
+Finishes pyomo_tutorial_weekly_workforce.py, which stops after the
+objective, and scales it from 10 workers to thousands over multi-week
+horizons. Instead of a Var indexed by (worker, day, shift) name tuples,
+works[k] uses the dense code
+
+    k = (w * n_days + d) * n_shifts + s
+
+and every constraint family is generated as one block of COO triplets with
+NumPy, so the whole model is a CSR matrix built in O(nnz). The matrix is
+then passed to HiGHS directly or turned into Pyomo rows.
+
+Constraints (as in the tutorial's reference article) :
+    coverage        sum_w works[w,d,s] == demand[d,s]
+    hours           at most 5 shifts (40 hours) per worker per week
+    one shift       sum_s works[w,d,s] <= 1
+    rest            12 hours between shifts: evening / night then next
+                    morning, night then next morning / evening
+    needed          sum works[w] <= 5 * n_weeks * needed[w]
+    preference      no_pref[w,wk] >= works on Sunday - works on Saturday
+    symmetry        needed[w] >= needed[w+1]
+    staff           sum needed >= busiest week's demand / 5
+
+Objective :
+    min  sum no_pref + c * sum needed,  c = number of no_pref vars + 1
+
+Ref : https://towardsdatascience.com (Modeling and optimization of a
+      weekly workforce with Python and Pyomo)
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from pyomo.environ import (ConcreteModel, RangeSet, Var, Binary, Objective,
+                           Constraint, SolverFactory, minimize)
+from pyomo.core.expr.numeric_expr import LinearExpression
+
+# Calendar --------------------------------------------------------------------
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+SHIFTS = ['Morning', 'Evening', 'Night']  # 3 shifts of 8 hours
+MORNING, EVENING, NIGHT = 0, 1, 2
+MAX_SHIFTS_PER_WEEK = 5
+
+
+def default_demand(n_workers, n_weeks=1):
+    ''' Workers needed per (day, shift), scaled from the 10-worker tutorial.
+
+        Mon - Sat day shifts need two workers per 10 staff, nights and
+        Sundays one.
+    '''
+    base = np.ones((7, 3))
+    base[:6, [MORNING, EVENING]] = 2
+    scale = max(1, n_workers // 10)
+    return np.tile(base * scale, (n_weeks, 1))
+
+
+# Array Model -----------------------------------------------------------------
+def schedule_arrays(n_workers, n_weeks=1, demand=None, availability=None):
+    ''' Build the scheduling MIP as arrays.
+
+        availability : optional (n_workers, n_days, n_shifts) booleans; a
+                       worker can only take the shifts marked True.
+        Returns a dict with the cost vector c, the CSR matrix A, row_lower /
+        row_upper, col_upper, the works code array (n_workers, n_days,
+        n_shifts) and per-family row ranges in 'blocks'.
+    '''
+    W, D, S = n_workers, 7 * n_weeks, len(SHIFTS)
+    demand = default_demand(W, n_weeks) if demand is None else \
+        np.asarray(demand, dtype=float)
+    works = np.arange(W * D * S).reshape(W, D, S)
+    needed = W * D * S + np.arange(W)
+    no_pref = W * D * S + W + np.arange(W * n_weeks).reshape(W, n_weeks)
+    n_cols = W * D * S + W + W * n_weeks
+    nxt = (np.arange(D) + 1) % D  # the roster repeats after the horizon
+
+    rows, cols, vals, lower, upper, blocks = [], [], [], [], [], {}
+    n_rows = [0]
+
+    def add_block(name, block_cols, block_vals, lo, up):
+        ''' Rows of equal length: block_cols is (n_block_rows, row_len). '''
+        block_cols = np.asarray(block_cols)
+        k, length = block_cols.shape
+        rows.append(np.repeat(n_rows[0] + np.arange(k), length))
+        cols.append(block_cols.ravel())
+        vals.append(np.broadcast_to(block_vals, block_cols.shape).ravel())
+        lower.append(np.broadcast_to(lo, (k,)).astype(float))
+        upper.append(np.broadcast_to(up, (k,)).astype(float))
+        blocks[name] = (n_rows[0], n_rows[0] + k)
+        n_rows[0] += k
+
+    inf = np.inf
+    # coverage: one row per (day, shift) over all workers
+    add_block('coverage', works.transpose(1, 2, 0).reshape(D * S, W), 1.0,
+              demand.ravel(), demand.ravel())
+    # hours: one row per (worker, week)
+    add_block('hours', works.reshape(W, n_weeks, 7 * S).reshape(
+        W * n_weeks, 7 * S), 1.0, -inf, MAX_SHIFTS_PER_WEEK)
+    # one shift per day
+    add_block('one_shift', works.reshape(W * D, S), 1.0, -inf, 1)
+    # evening or night, then the next morning
+    add_block('rest_evening', np.stack(
+        [works[:, :, EVENING], works[:, :, NIGHT],
+         works[:, nxt, MORNING]], axis=-1).reshape(W * D, 3), 1.0, -inf, 1)
+    # night, then the next morning or evening
+    add_block('rest_night', np.stack(
+        [works[:, :, NIGHT], works[:, nxt, MORNING],
+         works[:, nxt, EVENING]], axis=-1).reshape(W * D, 3), 1.0, -inf, 1)
+    # needed: any shift switches needed[w] on
+    add_block('needed', np.hstack([works.reshape(W, D * S), needed[:, None]]),
+              np.append(np.ones(D * S), -MAX_SHIFTS_PER_WEEK * n_weeks),
+              -inf, 0)
+    # preference: Sunday worked without the Saturday before it
+    week_days = works.reshape(W, n_weeks, 7, S)
+    add_block('preference', np.concatenate(
+        [week_days[:, :, 6, :], week_days[:, :, 5, :],
+         no_pref[:, :, None]], axis=-1).reshape(W * n_weeks, 2 * S + 1),
+        np.concatenate([np.ones(S), -np.ones(S), [-1.0]]), -inf, 0)
+    # Valid cuts: with identical workers fill needed[] in worker order, and
+    # always staff at least enough workers for the busiest week
+    if availability is None:
+        add_block('symmetry', np.stack([needed[:-1], needed[1:]], axis=-1),
+                  np.array([1.0, -1.0]), 0, inf)
+    weekly = demand.reshape(n_weeks, 7 * S).sum(axis=1).max()
+    add_block('staff', needed[None, :], 1.0,
+              np.ceil(weekly / MAX_SHIFTS_PER_WEEK), inf)
+
+    A = sparse.csr_matrix((np.concatenate(vals),
+                           (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(n_rows[0], n_cols))
+    c = np.zeros(n_cols)
+    c[no_pref.ravel()] = 1
+    c[needed] = no_pref.size + 1
+    col_upper = np.ones(n_cols)
+    if availability is not None:
+        col_upper[works[~np.asarray(availability, dtype=bool)]] = 0
+    return {'c': c, 'A': A, 'row_lower': np.concatenate(lower),
+            'row_upper': np.concatenate(upper), 'col_upper': col_upper,
+            'n_workers': W, 'n_weeks': n_weeks, 'demand': demand,
+            'works': works, 'needed': needed, 'no_pref': no_pref,
+            'blocks': blocks}
+
+
+# Pyomo Builder ---------------------------------------------------------------
+def build_schedule_model(data):
+    ''' Pyomo model over the integer codes: model.x[k] for every column.
+
+        Every row of data['A'] becomes one LinearExpression constraint.
+    '''
+    A, c = data['A'], data['c']
+    n_rows, n_cols = A.shape
+    model = ConcreteModel(name='Workforce')
+    model.K = RangeSet(0, n_cols - 1)
+    model.R = RangeSet(0, n_rows - 1)
+    model.x = Var(model.K, within=Binary)
+    xs = list(model.x.values())
+    for k in np.flatnonzero(data['col_upper'] == 0).tolist():
+        xs[k].fix(0)
+    nz = np.flatnonzero(c)
+    model.obj = Objective(expr=LinearExpression(
+        constant=0, linear_coefs=c[nz].tolist(),
+        linear_vars=[xs[k] for k in nz.tolist()]), sense=minimize)
+
+    indptr = A.indptr.tolist()
+    indices = A.indices.tolist()
+    data_ = A.data.tolist()
+    lower = [None if np.isinf(v) else v for v in data['row_lower'].tolist()]
+    upper = [None if np.isinf(v) else v for v in data['row_upper'].tolist()]
+
+    def row_rule(model, i):
+        start, stop = indptr[i], indptr[i + 1]
+        body = LinearExpression(constant=0, linear_coefs=data_[start:stop],
+                                linear_vars=[xs[k]
+                                             for k in indices[start:stop]])
+        return (lower[i], body, upper[i])
+    model.rows = Constraint(model.R, rule=row_rule)
+    return model
+
+
+# Direct HiGHS Builder --------------------------------------------------------
+def build_schedule_highs(data, time_limit=None, mip_rel_gap=None):
+    ''' Pass the CSR model straight to a highspy.Highs instance. '''
+    import highspy
+    A = data['A'].tocsc()
+    n_rows, n_cols = A.shape
+    inf = highspy.kHighsInf
+    lp = highspy.HighsLp()
+    lp.num_col_ = n_cols
+    lp.num_row_ = n_rows
+    lp.col_cost_ = data['c']
+    lp.col_lower_ = np.zeros(n_cols)
+    lp.col_upper_ = data['col_upper']
+    lp.row_lower_ = np.where(np.isinf(data['row_lower']), -inf,
+                             data['row_lower'])
+    lp.row_upper_ = np.where(np.isinf(data['row_upper']), inf,
+                             data['row_upper'])
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = A.indptr
+    lp.a_matrix_.index_ = A.indices
+    lp.a_matrix_.value_ = A.data
+    lp.integrality_ = [highspy.HighsVarType.kInteger] * n_cols
+    h = highspy.Highs()
+    h.setOptionValue('output_flag', False)
+    if time_limit is not None:
+        h.setOptionValue('time_limit', float(time_limit))
+    if mip_rel_gap is not None:
+        h.setOptionValue('mip_rel_gap', float(mip_rel_gap))
+    h.passModel(lp)
+    return h
+
+
+def solve_schedule(data, time_limit=None, mip_rel_gap=None):
+    ''' Solve with HiGHS; returns (x, objective, bound, status). '''
+    h = build_schedule_highs(data, time_limit, mip_rel_gap)
+    h.run()
+    info = h.getInfo()
+    x = np.round(np.asarray(h.getSolution().col_value)) \
+        if info.primal_solution_status else None
+    return (x, info.objective_function_value, info.mip_dual_bound,
+            h.modelStatusToString(h.getModelStatus()))
+
+
+def roster(data, x):
+    ''' Long-format roster (worker, week, day, shift) from a solution. '''
+    w, d, s = np.nonzero(x[data['works']] > 0.5)
+    return pd.DataFrame({'worker': ['W{}'.format(i + 1) for i in w],
+                         'week': d // 7 + 1,
+                         'day': np.array(DAYS)[d % 7],
+                         'shift': np.array(SHIFTS)[s]})
+
+
+# Benchmark -------------------------------------------------------------------
+def benchmark_schedule(cases=((10, 1), (500, 4), (5000, 4)), time_limit=300,
+                       pyomo_max_workers=500):
+    ''' Build and solve time at each (workers, weeks) size.
+
+        The Pyomo build is only timed up to pyomo_max_workers; every solve
+        uses HiGHS directly, stopping at time_limit seconds.
+    '''
+    for W, weeks in cases:
+        start = time.perf_counter()
+        data = schedule_arrays(W, weeks)
+        arrays = time.perf_counter() - start
+        line = 'workers => {:>5} | weeks => {} | rows => {:>8,} | cols => ' \
+            '{:>8,} | arrays => {:6.3f}s'.format(W, weeks, data['A'].shape[0],
+                                                  data['A'].shape[1], arrays)
+        if W <= pyomo_max_workers:
+            start = time.perf_counter()
+            build_schedule_model(data)
+            line += ' | pyomo => {:6.2f}s'.format(time.perf_counter() - start)
+        start = time.perf_counter()
+        x, obj, bound, status = solve_schedule(data, time_limit=time_limit)
+        solve = time.perf_counter() - start
+        gap = abs(obj - bound) / max(abs(obj), 1e-9) if x is not None \
+            else float('nan')
+        print(line + ' | solve => {:7.2f}s | {} | obj => {:.0f} | gap => '
+              '{:.2%}'.format(solve, status, obj, gap))
+
+
+if __name__ == '__main__':
+    # The tutorial instance: 10 workers, one week
+    data = schedule_arrays(10)
+    model = build_schedule_model(data)
+    SolverFactory('appsi_highs').solve(model)
+    print('Objective => {}'.format(model.obj()))
+    x = np.array([model.x[k].value for k in model.K])
+    print(roster(data, x).pivot_table(index='worker', columns='day',
+                                      values='shift', aggfunc='first'))
+    benchmark_schedule()
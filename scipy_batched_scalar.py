@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Batched bounded scalar minimization.
+
+Scipy Tutorial.ipynb minimizes one univariate function at a time with
+minimize_scalar(method='bounded'). minimize_scalar_batched runs the same
+bounded Brent algorithm (golden section with parabolic interpolation, as in
+scipy's fminbound) on many independent problems at once: every lane is a
+separate problem, all lanes advance in lockstep on NumPy arrays and lanes
+that have converged are masked out of further function evaluations.
+
+Ref : https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.minimize_scalar.html
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+from scipy.optimize import minimize_scalar, OptimizeResult
+
+
+# Vectorized Objectives -------------------------------------------------------
+def polyval_batched(x, coeffs):
+    ''' Evaluate one polynomial per lane with Horner's rule.
+
+        x :      (m,) points.
+        coeffs : (m, deg + 1) coefficients, highest power first.
+    '''
+    out = np.zeros_like(x)
+    for j in range(coeffs.shape[1]):
+        out = out * x + coeffs[:, j]
+    return out
+
+
+# Batched Bounded Brent -------------------------------------------------------
+_SQRT_EPS = np.sqrt(2.2e-16)
+_GOLDEN_MEAN = 0.5 * (3.0 - np.sqrt(5.0))
+
+
+def minimize_scalar_batched(func, bounds, args=(), xatol=1e-5, maxiter=500,
+                            parabolic=True):
+    ''' Minimize m scalar functions on their own bounds in lockstep.
+
+        func :      f(x, *args) evaluated element-wise: x has shape (k,) and
+                    every array in args has been sliced to the same k lanes.
+        bounds :    (m, 2) array, or a single (low, high) for every lane.
+        args :      per-lane arrays whose first axis has length m.
+        parabolic : False gives pure golden-section search.
+        Returns an OptimizeResult with arrays x, fun, nit, nfev and success.
+    '''
+    args = tuple(np.asarray(a) for a in args)
+    m = args[0].shape[0] if args else np.atleast_2d(bounds).shape[0]
+    bounds = np.broadcast_to(np.asarray(bounds, dtype=float), (m, 2))
+    if np.any(bounds[:, 0] > bounds[:, 1]):
+        raise ValueError('The lower bound exceeds the upper bound.')
+
+    a = bounds[:, 0].copy()
+    b = bounds[:, 1].copy()
+    xf = a + _GOLDEN_MEAN * (b - a)
+    nfc = xf.copy()
+    fulc = xf.copy()
+    rat = np.zeros(m)
+    e = np.zeros(m)
+    fx = np.asarray(func(xf, *args), dtype=float)
+    ffulc = fx.copy()
+    fnfc = fx.copy()
+    num = np.ones(m, dtype=np.int64)
+
+    def tolerances(xf):
+        tol1 = _SQRT_EPS * np.abs(xf) + xatol / 3.0
+        return tol1, 2.0 * tol1
+
+    tol1, tol2 = tolerances(xf)
+    active = np.abs(xf - 0.5 * (a + b)) > (tol2 - 0.5 * (b - a))
+    idx = np.flatnonzero(active)
+    while idx.size:
+        # Work on the compacted set of unconverged lanes
+        A, B, XF, FX = a[idx], b[idx], xf[idx], fx[idx]
+        NFC, FNFC, FULC, FFULC = nfc[idx], fnfc[idx], fulc[idx], ffulc[idx]
+        E, RAT = e[idx], rat[idx]
+        XM = 0.5 * (A + B)
+        T1, T2 = tolerances(XF)
+
+        # Parabolic fit where the last step was large enough
+        golden = np.ones(idx.size, dtype=bool)
+        if parabolic:
+            fit = np.abs(E) > T1
+            r = (XF - NFC) * (FX - FFULC)
+            q = (XF - FULC) * (FX - FNFC)
+            p = (XF - FULC) * q - (XF - NFC) * r
+            q = 2.0 * (q - r)
+            p = np.where(q > 0.0, -p, p)
+            q = np.abs(q)
+            r = np.where(fit, E, r)
+            E = np.where(fit, RAT, E)
+            ok = (fit & (np.abs(p) < np.abs(0.5 * q * r))
+                  & (p > q * (A - XF)) & (p < q * (B - XF)))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                prat = p / q
+            x = XF + prat
+            near = ((x - A) < T2) | ((B - x) < T2)
+            si = np.sign(XM - XF) + ((XM - XF) == 0)
+            RAT = np.where(ok, np.where(near, T1 * si, prat), RAT)
+            golden = ~ok
+
+        # Golden-section step everywhere else
+        E = np.where(golden, np.where(XF >= XM, A - XF, B - XF), E)
+        RAT = np.where(golden, _GOLDEN_MEAN * E, RAT)
+
+        si = np.sign(RAT) + (RAT == 0)
+        X = XF + si * np.maximum(np.abs(RAT), T1)
+        FU = np.asarray(func(X, *(arg[idx] for arg in args)), dtype=float)
+        num[idx] += 1
+
+        better = FU <= FX
+        # Accepted point: shrink towards it and shift the history
+        A = np.where(better & (X >= XF), XF, A)
+        B = np.where(better & (X < XF), XF, B)
+        # Rejected point: it becomes the new bracket end
+        A = np.where(~better & (X < XF), X, A)
+        B = np.where(~better & (X >= XF), X, B)
+        second = ~better & ((FU <= FNFC) | (NFC == XF))
+        third = (~better & ~second
+                 & ((FU <= FFULC) | (FULC == XF) | (FULC == NFC)))
+        shift = better | second
+        FULC, FFULC = (np.where(shift, NFC, np.where(third, X, FULC)),
+                       np.where(shift, FNFC, np.where(third, FU, FFULC)))
+        NFC, FNFC = (np.where(better, XF, np.where(second, X, NFC)),
+                     np.where(better, FX, np.where(second, FU, FNFC)))
+        XF = np.where(better, X, XF)
+        FX = np.where(better, FU, FX)
+
+        a[idx], b[idx], xf[idx], fx[idx] = A, B, XF, FX
+        nfc[idx], fnfc[idx], fulc[idx], ffulc[idx] = NFC, FNFC, FULC, FFULC
+        e[idx], rat[idx] = E, RAT
+
+        T1, T2 = tolerances(XF)
+        still = ((np.abs(XF - 0.5 * (A + B)) > (T2 - 0.5 * (B - A)))
+                 & (num[idx] < maxiter))
+        idx = idx[still]
+
+    tol1, tol2 = tolerances(xf)
+    success = np.abs(xf - 0.5 * (a + b)) <= (tol2 - 0.5 * (b - a))
+    return OptimizeResult(x=xf, fun=fx, nit=num, nfev=num, success=success)
+
+
+# Benchmark -------------------------------------------------------------------
+def random_polynomials(m, seed=0):
+    ''' m quartics 3x^4 + c2 x^2 + c1 x + c0 with random lower terms. '''
+    rng = np.random.default_rng(seed)
+    coeffs = np.zeros((m, 5))
+    coeffs[:, 0] = rng.uniform(1, 5, m)
+    coeffs[:, 2:] = rng.uniform(-3, 3, (m, 3))
+    return coeffs
+
+
+def benchmark_batched_scalar(sizes=(10**3, 10**4, 10**5, 10**6),
+                             loop_max=10**4):
+    ''' Compare the batched solver with a Python loop over minimize_scalar.
+
+        The loop is only timed up to loop_max problems.
+    '''
+    for m in sizes:
+        coeffs = random_polynomials(m)
+        start = time.perf_counter()
+        res = minimize_scalar_batched(polyval_batched, (-1, 1),
+                                      args=(coeffs,))
+        batched = time.perf_counter() - start
+        line = 'problems => {:>9,} | batched => {:8.3f}s | mean nit => {:5.1f}' \
+            .format(m, batched, res.nit.mean())
+        if m <= loop_max:
+            start = time.perf_counter()
+            xs = np.array([minimize_scalar(np.poly1d(c), bounds=(-1, 1),
+                                           method='bounded').x
+                           for c in coeffs])
+            loop = time.perf_counter() - start
+            line += ' | loop => {:8.3f}s | speedup => {:6.1f}x | max |dx| => ' \
+                '{:.1e}'.format(loop, loop / batched,
+                                np.max(np.abs(xs - res.x)))
+        print(line)
+
+
+if __name__ == '__main__':
+    benchmark_batched_scalar()
@@ -17,6 +17,8 @@ x0 = (1,5,5,1)
 
 import numpy as np
 from scipy.optimize import minimize
+from scipy_constraints import make_constraint, make_gradient, as_variables
+from scipy_multistart import multistart_slsqp
 
 def objective(x):
     'X is a vector'
@@ -30,33 +32,39 @@ def objective(x):
 def constraint1(x):
     return x[0]*x[2]*x[3]-25.0
 
-# Constraint2: 
+# Constraint2: sum of squares == 40
 def constraint2(x):
-    sum_sq = 40
-    for i in range(4):
-        sum_sq = sum_sq - x[i]**2
-    return sum_sq
-
-
-# Guess Values
-x0 = [1,5,5,1]
-
-# Print Example of Objective Function Output Using Guess
-print(objective(x0))
+    x = as_variables(x)
+    return 40 - (x**2).sum()
 
 
 # Create Bounds For Values
 b = (1.0, 5.0)
 bnds = (b,b,b,b)
-con1 = {'type':'ineq', 'fun':constraint1}
-con2 = {'type':'eq', 'fun':constraint2}
+# make_constraint adds an exact 'jac' so SLSQP skips finite differences
+con1 = make_constraint(constraint1, 'ineq')
+con2 = make_constraint(constraint2, 'eq')
 cons= [con1, con2]
+objective_grad = make_gradient(objective)
+
 
-# Generate Solution
-sol = minimize(objective, x0, method='SLSQP',
-               bounds=bnds, constraints=cons)
+# Guarded so worker processes of the multi-start driver can import this file
+if __name__ == '__main__':
+    # Guess Values
+    x0 = [1,5,5,1]
 
-print(objective(sol.x))
+    # Print Example of Objective Function Output Using Guess
+    print(objective(x0))
 
+    # Generate Solution
+    sol = minimize(objective, np.asarray(x0, dtype=float), method='SLSQP',
+                   jac=objective_grad, bounds=bnds, constraints=cons)
 
+    print(objective(sol.x))
 
+    # Multi-start: solve from 64 Sobol starts inside bnds in a process pool
+    ms = multistart_slsqp(objective, bnds, cons, n_starts=64,
+                          sampler='sobol', seed=0)
+    print(ms.message)
+    print('Best x => {} | objective => {}'.format(ms.x, ms.fun))
+    print(ms.stats[['start', 'fun', 'success', 'feasible', 'nit', 'nfev']])
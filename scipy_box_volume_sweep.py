@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Parametric sweep of the box volume problem over surface-area budgets.
+
+scipy_constrained_optimization_BoxVolumeEx.py solves a single instance with
+a budget of 10. sweep_box_volume solves one instance per budget: budgets are
+sorted, split into contiguous chunks, each chunk is solved in a worker
+process and every solve is warm-started from its neighbour's solution.
+The result is columnar (one array per field) and is written to .npz,
+Parquet or CSV rather than printed. Parquet needs pyarrow or fastparquet;
+without either, save_sweep writes CSV next to the requested path.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+from scipy_constraints import make_constraint, make_gradient
+from scipy_constrained_optimization_BoxVolumeEx import (calcSurface,
+                                                        objective)
+
+
+# Budget Constraint -----------------------------------------------------------
+def budget_constraint(x, budget):
+    ''' Surface area may not exceed the budget. '''
+    return budget - calcSurface(x)
+
+
+BUDGET_CON = make_constraint(budget_constraint, 'ineq')
+OBJECTIVE_GRAD = make_gradient(objective)
+
+
+# Chunk Solver ----------------------------------------------------------------
+def _solve_chunk(args):
+    ''' Solve consecutive budgets, warm-starting each from the previous. '''
+    budgets, x0 = args
+    n = budgets.size
+    x_opt = np.empty((n, 3))
+    nit = np.empty(n, dtype=np.int64)
+    success = np.empty(n, dtype=bool)
+    x = np.asarray(x0, dtype=float)
+    prev = None
+    for i, budget in enumerate(budgets):
+        if prev is not None:
+            # Optimal dimensions scale with sqrt(budget)
+            x = x * np.sqrt(budget / prev)
+        con = dict(BUDGET_CON, args=(budget,))
+        sol = minimize(objective, x, method='SLSQP', jac=OBJECTIVE_GRAD,
+                       constraints=(con,))
+        x = sol.x
+        prev = budget
+        x_opt[i] = sol.x
+        nit[i] = sol.nit
+        success[i] = sol.success
+    return x_opt, nit, success
+
+
+# Sweep API -------------------------------------------------------------------
+def sweep_box_volume(budgets, x0=(1.0, 1.0, 1.0), chunk_size=256,
+                     n_workers=None):
+    ''' Solve the box volume problem for every surface-area budget.
+
+        Returns a dict of columns, in the order of the input budgets:
+        budget, xOpt (n x 3), volume, iterations and success. An empty
+        budgets array gives empty columns.
+    '''
+    budgets = np.asarray(budgets, dtype=float).ravel()
+    order = np.argsort(budgets, kind='stable')
+    sorted_budgets = budgets[order]
+    chunks = [sorted_budgets[i:i + chunk_size]
+              for i in range(0, sorted_budgets.size, chunk_size)]
+    tasks = [(chunk, x0) for chunk in chunks]
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1 or len(tasks) == 1:
+        results = [_solve_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_solve_chunk, tasks))
+    x_opt = np.empty((budgets.size, 3))
+    nit = np.empty(budgets.size, dtype=np.int64)
+    success = np.empty(budgets.size, dtype=bool)
+    if results:
+        x_opt[order] = np.concatenate([r[0] for r in results])
+        nit[order] = np.concatenate([r[1] for r in results])
+        success[order] = np.concatenate([r[2] for r in results])
+    return {'budget': budgets,
+            'xOpt': x_opt,
+            'volume': np.prod(x_opt, axis=1),
+            'iterations': nit,
+            'success': success}
+
+
+def sweep_frame(result):
+    ''' One row per budget, with xOpt split into length / width / height. '''
+    return pd.DataFrame({'budget': result['budget'],
+                         'length': result['xOpt'][:, 0],
+                         'width': result['xOpt'][:, 1],
+                         'height': result['xOpt'][:, 2],
+                         'volume': result['volume'],
+                         'iterations': result['iterations'],
+                         'success': result['success']})
+
+
+def save_sweep(result, path):
+    ''' Write a sweep result by extension: .parquet, .csv, otherwise .npz
+        (appended to the path when missing, as np.savez does).
+
+        Parquet needs pyarrow or fastparquet; without them a warning is
+        issued and the frame is written as CSV with the extension swapped.
+        Returns the path written.
+    '''
+    if path.endswith('.parquet'):
+        try:
+            sweep_frame(result).to_parquet(path, index=False)
+        except ImportError:
+            path = os.path.splitext(path)[0] + '.csv'
+            warnings.warn('No Parquet engine installed, writing {}'.format(
+                path))
+            sweep_frame(result).to_csv(path, index=False)
+    elif path.endswith('.csv'):
+        sweep_frame(result).to_csv(path, index=False)
+    else:
+        if not path.endswith('.npz'):
+            path += '.npz'
+        np.savez(path, **result)
+    return path
+
+
+# Benchmark -------------------------------------------------------------------
+def benchmark_sweep(n_budgets=5000, worker_counts=(1, 2, 4)):
+    ''' Time the sweep and check it against the closed form sqrt(S/6)^3. '''
+    budgets = np.linspace(1, 1000, n_budgets)
+    exact = (budgets / 6) ** 1.5
+    for n_workers in worker_counts:
+        start = time.perf_counter()
+        res = sweep_box_volume(budgets, n_workers=n_workers)
+        elapsed = time.perf_counter() - start
+        err = np.max(np.abs(res['volume'] - exact) / exact)
+        print('workers => {:>2} | budgets => {:,} | seconds => {:.3f} | '
+              'mean iterations => {:.2f} | max rel error => {:.2e}'.format(
+                  n_workers, n_budgets, elapsed, res['iterations'].mean(),
+                  err))
+
+
+if __name__ == '__main__':
+    benchmark_sweep()
+    save_sweep(sweep_box_volume(np.linspace(1, 100, 1000)),
+               'box_volume_sweep.npz')
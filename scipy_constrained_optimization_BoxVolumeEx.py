@@ -10,6 +10,7 @@ Ref: https://www.youtube.com/watch?v=iSnTtV6b0Gw
 # Load Python Libraries ------------------------------------------
 import numpy as np
 from scipy.optimize import minimize
+from scipy_constraints import make_constraint, make_gradient
 
 
 # Define Function to calculate volume of box
@@ -45,7 +46,10 @@ def constraint(x):
 
 
 # Scipy requires that constraints be loaded into a dictionary
-cons = ({'type':'ineq', 'fun':constraint})
+# make_constraint builds that dictionary and adds an exact 'jac' entry,
+# so SLSQP does not have to finite-difference the surface area.
+cons = (make_constraint(constraint, 'ineq'),)
+objective_grad = make_gradient(objective)
 
 # Set Initial guess value for box dimensions
 lengthGuess = 1
@@ -56,36 +60,27 @@ HeightGuess = 1
 x0 = np.array([lengthGuess, widthGuess, HeightGuess])
 
 
-# Call Scipy minimize to solve the objective function with constraints
-'''SLSQP Solver.  This is one of the only solvers that can do constrained
-   non-linear optimization.
-   options: display results as finishes.
-'''
-sol = minimize(objective, x0, method='SLSQP', constraints=cons,
-               options={'disp':True})
-
-
-# Retrieve Box sizing and volume
-xOpt = sol.x
-volumeOpt = -sol.fun
-
-# Calculate Surface Area with Optimized (just to double check)
-surfaceAreaOpt = calcSurface(xOpt)
-
-# Print Results
-print('Sol.x result => {}'.format(sol.x))
-print('Length => {}'.format(xOpt[0]))
-print('Width => {}'.format(xOpt[1]))
-print('Height => {}'.format(xOpt[2]))
-print('Volume => {}'.format(volumeOpt))
-print('Surface Area => {}'.format(surfaceAreaOpt))
-
-
-
-
-
-
-
-
-
-
+# Guarded so the sweep and benchmark modules can import the functions above
+if __name__ == '__main__':
+    # Call Scipy minimize to solve the objective function with constraints
+    '''SLSQP Solver.  This is one of the only solvers that can do constrained
+       non-linear optimization.
+       options: display results as finishes.
+    '''
+    sol = minimize(objective, x0, method='SLSQP', jac=objective_grad,
+                   constraints=cons, options={'disp':True})
+
+    # Retrieve Box sizing and volume
+    xOpt = sol.x
+    volumeOpt = -sol.fun
+
+    # Calculate Surface Area with Optimized (just to double check)
+    surfaceAreaOpt = calcSurface(xOpt)
+
+    # Print Results
+    print('Sol.x result => {}'.format(sol.x))
+    print('Length => {}'.format(xOpt[0]))
+    print('Width => {}'.format(xOpt[1]))
+    print('Height => {}'.format(xOpt[2]))
+    print('Volume => {}'.format(volumeOpt))
+    print('Surface Area => {}'.format(surfaceAreaOpt))
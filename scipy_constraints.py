@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Constraint objects with analytic Jacobians for SLSQP.
+
+Without a 'jac' entry SLSQP approximates every constraint gradient with
+finite differences, paying n extra calls per constraint per iteration.
+This module derives exact Jacobians with forward-mode automatic
+differentiation on NumPy: the constraint function is called once with Dual
+numbers that carry the value together with its gradient.
+
+Constraint functions only need to stick to +, -, *, /, ** and .sum(), so
+the same function works on plain arrays and on Dual inputs. Functions that
+may also be called with lists should convert x with as_variables rather
+than np.asarray, which would turn a Dual into an object array.
+
+Ref : https://en.wikipedia.org/wiki/Automatic_differentiation#Forward_accumulation
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+from scipy.optimize import minimize
+
+
+# Forward-mode Dual Numbers ---------------------------------------------------
+class Dual(object):
+    ''' A value together with its gradient w.r.t. the n input variables.
+
+        val :  array of any shape S.
+        grad : array of shape S + (n,).
+    '''
+    __array_priority__ = 100
+
+    def __init__(self, val, grad):
+        self.val = np.asarray(val, dtype=float)
+        self.grad = np.asarray(grad, dtype=float)
+
+    def _lift(self, other):
+        if isinstance(other, Dual):
+            return other
+        other = np.asarray(other, dtype=float)
+        return Dual(other, np.zeros(other.shape + self.grad.shape[-1:]))
+
+    def __getitem__(self, key):
+        return Dual(self.val[key], self.grad[key])
+
+    def __len__(self):
+        return len(self.val)
+
+    def __neg__(self):
+        return Dual(-self.val, -self.grad)
+
+    def __add__(self, other):
+        other = self._lift(other)
+        return Dual(self.val + other.val, self.grad + other.grad)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + (-self._lift(other))
+
+    def __rsub__(self, other):
+        return self._lift(other) + (-self)
+
+    def __mul__(self, other):
+        other = self._lift(other)
+        return Dual(self.val * other.val,
+                    self.grad * other.val[..., None]
+                    + other.grad * self.val[..., None])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = self._lift(other)
+        return Dual(self.val / other.val,
+                    (self.grad * other.val[..., None]
+                     - other.grad * self.val[..., None])
+                    / (other.val ** 2)[..., None])
+
+    def __rtruediv__(self, other):
+        return self._lift(other) / self
+
+    def __pow__(self, p):
+        if isinstance(p, Dual):
+            raise TypeError('Only constant exponents are supported')
+        return Dual(self.val ** p,
+                    self.grad * (p * self.val ** (p - 1))[..., None])
+
+    def sum(self):
+        return Dual(self.val.sum(), self.grad.reshape(-1, self.grad.shape[-1])
+                    .sum(axis=0))
+
+
+def as_variables(x):
+    ''' x as a float array, leaving Dual inputs untouched.
+
+        Duals are recognised by their grad attribute rather than by class,
+        so inputs from a second copy of this module (run as __main__) pass
+        through as well.
+    '''
+    if hasattr(x, 'grad'):
+        return x
+    return np.asarray(x, dtype=float)
+
+
+def seed_variables(x):
+    ''' Wrap a point as Dual inputs whose gradient is the identity. '''
+    x = np.asarray(x, dtype=float)
+    return Dual(x, np.eye(x.size))
+
+
+class Jacobian(object):
+    ''' Callable returning the exact Jacobian of fun at x.
+
+        A class rather than a closure so constraint dicts stay picklable
+        for the process-pool drivers.
+    '''
+
+    def __init__(self, fun):
+        self.fun = fun
+
+    def __call__(self, x, *args):
+        out = self.fun(seed_variables(x), *args)
+        if not isinstance(out, Dual):
+            # fun did not depend on x
+            return np.zeros(np.shape(out) + (np.size(x),))
+        return out.grad
+
+
+# Constraint Builder ----------------------------------------------------------
+def make_constraint(fun, type='ineq', args=()):
+    ''' Build an SLSQP constraint dict with an automatic 'jac' entry.
+
+        type : 'ineq' for fun(x) >= 0, 'eq' for fun(x) == 0.
+    '''
+    if type not in ('ineq', 'eq'):
+        raise ValueError('Constraint type must be ineq or eq => {}'.format(
+            type))
+    return {'type': type, 'fun': fun, 'jac': Jacobian(fun), 'args': args}
+
+
+def make_gradient(fun):
+    ''' Gradient of a scalar objective, to pass as minimize(jac=...). '''
+    return Jacobian(fun)
+
+
+# Benchmark -------------------------------------------------------------------
+class _Counted(object):
+    ''' Wrap a function and count how often it is called. '''
+
+    def __init__(self, fun):
+        self.fun = fun
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.fun(*args)
+
+
+def benchmark_jacobians(objective, x0, constraints, bounds=None, repeat=20):
+    ''' Compare SLSQP with finite-difference and analytic derivatives.
+
+        constraints : list of (fun, type) pairs.
+        Prints function calls of the objective and constraints, plus the
+        average wall time per solve, for both variants.
+    '''
+    for label, analytic in (('finite diff', False), ('analytic', True)):
+        obj = _Counted(objective)
+        funs = [_Counted(f) for f, _ in constraints]
+        if analytic:
+            cons = [make_constraint(f, t) for f, (_, t) in zip(funs,
+                                                                constraints)]
+            jac = make_gradient(obj)
+        else:
+            cons = [{'type': t, 'fun': f} for f, (_, t) in zip(funs,
+                                                                constraints)]
+            jac = None
+        start = time.perf_counter()
+        for _ in range(repeat):
+            sol = minimize(obj, x0, method='SLSQP', jac=jac, bounds=bounds,
+                           constraints=cons)
+        elapsed = (time.perf_counter() - start) / repeat
+        print('{:<11} | objective calls => {:>5} | constraint calls => {:>5}'
+              ' | nit => {:>3} | fun => {:.6f} | ms/solve => {:.2f}'.format(
+                  label, obj.calls // repeat,
+                  sum(f.calls for f in funs) // repeat, sol.nit, sol.fun,
+                  1000 * elapsed))
+
+
+if __name__ == '__main__':
+    # Run the benchmark from the importable module, so the constraint
+    # functions and the Duals they receive share one Dual class
+    from scipy_constraints import benchmark_jacobians
+    import scipy_beginnners_guide_optimization as hs
+    import scipy_constrained_optimization_BoxVolumeEx as box
+    print('HS071-style problem')
+    benchmark_jacobians(hs.objective, [1, 5, 5, 1],
+                        [(hs.constraint1, 'ineq'), (hs.constraint2, 'eq')],
+                        bounds=hs.bnds)
+    print('Box volume problem')
+    benchmark_jacobians(box.objective, box.x0, [(box.constraint, 'ineq')])
@@ -10,38 +10,60 @@ Ref : https://docs.scipy.org/doc/scipy/reference/tutorial/optimize.html#optimiza
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import minimize
-
-
-def rosen(x):
-    """The Rosenbrock function"""
-    return sum(100.0*(x[1:]-x[:-1]**2.0)**2.0 + (1-x[:-1])**2.0)
+from scipy_rosen import rosen, rosen_grad, rosen_hessp, minimize_auto
+from scipy_random_search import (random_search_topk,
+                                 parallel_random_search_topk)
 
 x0 = np.array([2, 3, 4, 5])
 
-solution = minimize(rosen, x0, method='nelder-mead', options={'xatol':1e-8,
-                                                              'disp':True})
+# Analytic derivatives let minimize_auto pick trust-ncg over nelder-mead
+solution = minimize_auto(rosen, x0, jac=rosen_grad, hessp=rosen_hessp,
+                         options={'disp':True})
 
 
-def bruteforce(rosen):
-    rosen_vals = []
-    labels = []
-    for x in range(0, 100000):
-        x = np.random.randint(-10, 10, size=4)
-        y = rosen(x)
-        labels.append(sum(x))
-        rosen_vals.append(y)
+def bruteforce(rosen, n_samples=100000, seed=None):
+    ''' Random search over integer points in [-10, 10)^4.
+        Returns every sample's y and label (row sum), sorted by y
+        descending. The samples are drawn and scored as one array.
+    '''
+    X = np.random.default_rng(seed).integers(-10, 10, size=(n_samples, 4))
     df = pd.DataFrame({})
-    df['y'] = rosen_vals
-    df['label'] = labels
+    df['y'] = rosen(X)
+    df['label'] = X.sum(axis=1)
     df.sort_values(by='y', ascending=False, inplace=True)
     return df
 
 
+def bruteforce_topk(rosen, n_samples=100000, k=100, chunk_size=65536,
+                    seed=None, n_workers=None):
+    ''' Random search over integer points in [-10, 10)^4, keeping only
+        the k best samples.
+        Returns the same frame as bruteforce restricted to those samples:
+        y and label, indexed by draw order and sorted by y descending, so
+        the best sample is the last row.
+        Samples are generated and scored in (chunk_size, 4) blocks, so
+        memory stays flat for very large n_samples.
+        Pass n_workers to shard the budget across a process pool.
+    '''
+    if n_workers:
+        y, label, order = parallel_random_search_topk(
+            rosen, n_samples, 4, low=-10, high=10, k=k,
+            chunk_size=chunk_size, n_workers=n_workers, seed=seed)
+    else:
+        y, label, order = random_search_topk(
+            rosen, n_samples, 4, low=-10, high=10, k=k,
+            chunk_size=chunk_size, rng=seed)
+    df = pd.DataFrame({'y': y[::-1], 'label': label[::-1]},
+                      index=order[::-1])
+    return df
+
+
 test = bruteforce(rosen)
 
 print(test)
 
+print(bruteforce_topk(rosen, k=10))
+
     
     
     
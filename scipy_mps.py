@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+"""
+MPS reader into CSR arrays, solved in-process with scipy.optimize.milp.
+
+other/scripts/discrete_optomization_pulp.py loads an MPS file through the
+cbcpy binding, which is not installable. read_mps parses MPS (fixed or
+free format, whitespace separated names) without a per-coefficient Python
+loop: the file is split into its sections with one regular expression, and
+each section block (ROWS, COLUMNS, RHS, RANGES, BOUNDS) is tokenized by the
+pandas C parser. Names become integer codes with pd.factorize /
+Index.get_indexer, and the coefficients go straight into a CSR matrix.
+
+The result is a dict with
+    c, obj_constant, sense      objective (sense -1 for OBJSENSE MAX)
+    A, row_lower, row_upper     CSR constraint matrix and row bounds
+    col_lower, col_upper        variable bounds
+    integrality                 1 for integer columns (MARKER / BV / LI / UI)
+    row_names, col_names        labels
+
+Ref : IBM ILOG CPLEX documentation, 'Records in MPS format'
+"""
+
+# Import Libraries ------------------------------------------------------------
+import io
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import milp, LinearConstraint, Bounds
+
+_SECTION = re.compile(r'^([A-Z][A-Z0-9_]*)([^\n]*)$', re.M)
+
+
+# Tokenizing ------------------------------------------------------------------
+def _sections(text):
+    ''' Map section name -> (header tokens, body text). '''
+    sections = {}
+    heads = list(_SECTION.finditer(text))
+    for head, nxt in zip(heads, heads[1:] + [None]):
+        body = text[head.end():nxt.start() if nxt else len(text)]
+        sections[head.group(1)] = (head.group(2).split(), body)
+    return sections
+
+
+def _table(body, n_fields):
+    ''' Whitespace-separated fields of a section body as a str DataFrame. '''
+    if not body.strip():
+        return pd.DataFrame(columns=range(n_fields), dtype=str)
+    return pd.read_csv(io.StringIO(body), sep=r'\s+', header=None,
+                       names=range(n_fields), dtype=str, comment='*',
+                       engine='c')
+
+
+def _pairs(df, first):
+    ''' Stack (name, value) pairs from columns first.. of a data table. '''
+    names = pd.concat([df[first], df[first + 2]], ignore_index=True)
+    values = pd.concat([df[first + 1], df[first + 3]], ignore_index=True)
+    keep = names.notna().to_numpy()
+    return names[keep], pd.to_numeric(values[keep]).to_numpy(dtype=float), \
+        keep
+
+
+def _drop_set_name(df, n_fields):
+    ''' RHS / RANGES lines may omit the set name; align them to the rest. '''
+    n_tok = df.notna().sum(axis=1).to_numpy()
+    short = n_tok % 2 == 0
+    if short.any():
+        df.loc[short, list(range(1, n_fields))] = \
+            df.loc[short, list(range(n_fields - 1))].to_numpy()
+        df.loc[short, 0] = ''
+    return df
+
+
+# Reader ----------------------------------------------------------------------
+def read_mps(path):
+    ''' Parse an MPS file into CSR arrays (see the module docstring). '''
+    with open(path) as f:
+        text = f.read()
+    sections = _sections(text)
+    name = sections.get('NAME', ([''], ''))[0]
+    sense = 1
+    if 'OBJSENSE' in sections:
+        header, body = sections['OBJSENSE']
+        word = (header or body.split() or ['MIN'])[0].upper()
+        sense = -1 if word.startswith('MAX') else 1
+
+    # ROWS: the first N row is the objective, other N rows are dropped
+    rows = _table(sections['ROWS'][1], 2)
+    kinds = rows[0].str.upper().to_numpy()
+    n_rows = np.flatnonzero(kinds == 'N')
+    obj_row = rows[1].iloc[n_rows[0]] if n_rows.size else None
+    con = kinds != 'N'
+    row_names = pd.Index(rows[1][con].to_numpy())
+    kinds = kinds[con]
+    m = len(row_names)
+
+    # COLUMNS, with integer blocks between MARKER lines
+    cols = _table(sections['COLUMNS'][1], 5)
+    marker = (cols[1].str.strip("'").str.upper() == 'MARKER').to_numpy()
+    flag = cols[2].str.strip("'").str.upper().to_numpy()
+    step = np.where(marker & (flag == 'INTORG'), 1,
+                    np.where(marker & (flag == 'INTEND'), -1, 0))
+    in_int = np.cumsum(step)[~marker] > 0
+    cols = cols[~marker].reset_index(drop=True)
+    col_codes, col_names = pd.factorize(cols[0])
+    n = len(col_names)
+    integrality = np.zeros(n)
+    integrality[col_codes[in_int]] = 1
+
+    entry_rows, values, keep = _pairs(cols, 1)
+    entry_cols = np.concatenate([col_codes, col_codes])[keep]
+    is_obj = (entry_rows == obj_row).to_numpy()
+    c = np.zeros(n)
+    np.add.at(c, entry_cols[is_obj], values[is_obj])
+    row_codes = row_names.get_indexer(entry_rows[~is_obj])
+    known = row_codes >= 0  # entries in dropped N rows
+    A = sparse.csr_matrix((values[~is_obj][known],
+                           (row_codes[known], entry_cols[~is_obj][known])),
+                          shape=(m, n))
+
+    # RHS and RANGES
+    rhs = np.zeros(m)
+    obj_constant = 0.0
+    if 'RHS' in sections:
+        df = _drop_set_name(_table(sections['RHS'][1], 5), 5)
+        names, vals, _ = _pairs(df, 1)
+        on_obj = (names == obj_row).to_numpy()
+        obj_constant = -vals[on_obj].sum()
+        idx = row_names.get_indexer(names[~on_obj])
+        rhs[idx[idx >= 0]] = vals[~on_obj][idx >= 0]
+    row_lower = np.where(kinds == 'L', -np.inf, rhs)
+    row_upper = np.where(kinds == 'G', np.inf, rhs)
+    if 'RANGES' in sections:
+        df = _drop_set_name(_table(sections['RANGES'][1], 5), 5)
+        names, vals, _ = _pairs(df, 1)
+        idx = row_names.get_indexer(names)
+        if (idx < 0).any():
+            # Unknown rows and N rows have no bounds to widen
+            raise ValueError('RANGES refers to unknown or N rows: {}'.format(
+                list(names[idx < 0][:5])))
+        k, r = kinds[idx], vals
+        row_lower[idx] = np.where(k == 'L', rhs[idx] - np.abs(r),
+                                  np.where((k == 'E') & (r < 0),
+                                           rhs[idx] + r, rhs[idx]))
+        row_upper[idx] = np.where(k == 'G', rhs[idx] + np.abs(r),
+                                  np.where((k == 'E') & (r > 0),
+                                           rhs[idx] + r, rhs[idx]))
+
+    col_lower = np.zeros(n)
+    col_upper = np.full(n, np.inf)
+    if 'BOUNDS' in sections:
+        _apply_bounds(_table(sections['BOUNDS'][1], 4), col_names, col_lower,
+                      col_upper, integrality)
+
+    return {'name': name[0] if name else '', 'c': c,
+            'obj_constant': obj_constant, 'sense': sense, 'A': A,
+            'row_lower': row_lower, 'row_upper': row_upper,
+            'col_lower': col_lower, 'col_upper': col_upper,
+            'integrality': integrality, 'row_names': row_names,
+            'col_names': pd.Index(col_names)}
+
+
+def _apply_bounds(df, col_names, lower, upper, integrality):
+    ''' BOUNDS records, vectorized per bound type. '''
+    kind = df[0].str.upper().to_numpy()
+    n_tok = df.notna().sum(axis=1).to_numpy()
+    no_value = np.isin(kind, ['FR', 'MI', 'PL', 'BV'])
+    # Lines without a bound set name are one token short
+    short = np.where(no_value, n_tok == 2, n_tok == 3)
+    col = np.where(short, df[1], df[2])
+    val = pd.to_numeric(pd.Series(np.where(short, df[2], df[3])),
+                        errors='coerce').to_numpy()
+    idx = pd.Index(col_names).get_indexer(col)
+    if (idx < 0).any():
+        raise ValueError('BOUNDS refers to unknown columns: {}'.format(
+            list(col[idx < 0][:5])))
+    for k in np.unique(kind):
+        sel = kind == k
+        i, v = idx[sel], val[sel]
+        if k in ('LO', 'LI'):
+            lower[i] = v
+        elif k in ('UP', 'UI'):
+            upper[i] = v
+        elif k == 'FX':
+            lower[i] = v
+            upper[i] = v
+        elif k == 'FR':
+            lower[i] = -np.inf
+            upper[i] = np.inf
+        elif k == 'MI':
+            lower[i] = -np.inf
+        elif k == 'PL':
+            upper[i] = np.inf
+        elif k == 'BV':
+            lower[i] = 0
+            upper[i] = 1
+        else:
+            raise ValueError('Unsupported bound type {}'.format(k))
+        if k in ('LI', 'UI', 'BV'):
+            integrality[i] = 1
+    # A negative UP bound without a LO bound makes the lower bound -inf
+    has_lo = np.zeros(len(col_names), dtype=bool)
+    has_lo[idx[np.isin(kind, ['LO', 'LI', 'FX', 'FR', 'MI', 'BV'])]] = True
+    neg_up = idx[np.isin(kind, ['UP', 'UI']) & (val < 0)]
+    lower[neg_up[~has_lo[neg_up]]] = -np.inf
+
+
+# Solve -----------------------------------------------------------------------
+def solve_mps(model, time_limit=None, **options):
+    ''' Solve a read_mps model with scipy.optimize.milp (HiGHS).
+
+        The returned result's fun includes the objective constant and is in
+        the file's own sense.
+    '''
+    if time_limit is not None:
+        options['time_limit'] = time_limit
+    sense = model['sense']
+    res = milp(sense * model['c'],
+               constraints=LinearConstraint(model['A'], model['row_lower'],
+                                            model['row_upper']),
+               integrality=model['integrality'],
+               bounds=Bounds(model['col_lower'], model['col_upper']),
+               options=options)
+    if res.fun is not None:
+        res.fun = sense * res.fun + model['obj_constant']
+    return res
+
+
+# Binary Cache ----------------------------------------------------------------
+# A parsed model is stored as a directory of .npy files plus manifest.json,
+# so it reopens with np.load(mmap_mode='r') without copying the arrays.
+# Names are fixed-width unicode arrays ('U' dtype), which memory-map as well
+# and keep non-ASCII names intact.
+_ARRAYS = ('c', 'row_lower', 'row_upper', 'col_lower', 'col_upper',
+           'integrality', 'A_data', 'A_indices', 'A_indptr', 'row_names',
+           'col_names')
+_CACHE_VERSION = 2
+
+
+def file_digest(path, chunk=2**20):
+    ''' sha256 of a file, read in chunks. '''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_manifest(folder, manifest):
+    ''' Replace folder/manifest.json atomically, so readers never load a
+        truncated manifest.
+    '''
+    path = os.path.join(folder, 'manifest.json')
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def save_model(model, folder, source=None):
+    ''' Write a read_mps model to folder (.npy per array + manifest.json).
+
+        source : file the model was parsed from; its mtime, size and sha256
+                 go into the manifest for cached_read_mps.
+    '''
+    A = sparse.csr_matrix(model['A'])
+    arrays = {'c': model['c'], 'row_lower': model['row_lower'],
+              'row_upper': model['row_upper'],
+              'col_lower': model['col_lower'],
+              'col_upper': model['col_upper'],
+              'integrality': model['integrality'], 'A_data': A.data,
+              'A_indices': A.indices, 'A_indptr': A.indptr,
+              'row_names': np.asarray(model['row_names'], dtype=str),
+              'col_names': np.asarray(model['col_names'], dtype=str)}
+    manifest = {'version': _CACHE_VERSION, 'name': model['name'],
+                'sense': model['sense'],
+                'obj_constant': float(model['obj_constant']),
+                'shape': list(A.shape), 'arrays': list(_ARRAYS)}
+    if source is not None:
+        stat = os.stat(source)
+        manifest['source'] = {'mtime': stat.st_mtime, 'size': stat.st_size,
+                              'sha256': file_digest(source)}
+    # Write to a temporary folder and swap it in, so readers never see a
+    # half-written cache: the old folder is renamed aside before the new
+    # one is renamed into place, and only then deleted
+    tmp, old = folder + '.tmp', folder + '.old'
+    shutil.rmtree(tmp, ignore_errors=True)
+    shutil.rmtree(old, ignore_errors=True)
+    os.makedirs(tmp)
+    for key in _ARRAYS:
+        np.save(os.path.join(tmp, key + '.npy'),
+                np.ascontiguousarray(arrays[key]))
+    _write_manifest(tmp, manifest)
+    if os.path.exists(folder):
+        os.rename(folder, old)
+    os.rename(tmp, folder)
+    shutil.rmtree(old, ignore_errors=True)
+    return folder
+
+
+def load_model(folder, mmap_mode='r'):
+    ''' Open a saved model; arrays are memory-mapped (read-only) by default.
+
+        Same keys as read_mps, except row_names / col_names are str arrays.
+    '''
+    with open(os.path.join(folder, 'manifest.json')) as f:
+        manifest = json.load(f)
+    arrays = {key: np.load(os.path.join(folder, key + '.npy'),
+                           mmap_mode=mmap_mode)
+              for key in manifest['arrays']}
+    A = sparse.csr_matrix((arrays.pop('A_data'), arrays.pop('A_indices'),
+                           arrays.pop('A_indptr')),
+                          shape=tuple(manifest['shape']), copy=False)
+    arrays.update({'name': manifest['name'], 'sense': manifest['sense'],
+                   'obj_constant': manifest['obj_constant'], 'A': A})
+    return arrays
+
+
+def _cache_state(path, folder):
+    ''' 'fresh', 'touched' (mtime changed, same content) or 'stale'. '''
+    try:
+        with open(os.path.join(folder, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return 'stale', None
+    source = manifest.get('source')
+    if manifest.get('version') != _CACHE_VERSION or source is None:
+        return 'stale', manifest
+    stat = os.stat(path)
+    if stat.st_size != source['size']:
+        return 'stale', manifest
+    if stat.st_mtime == source['mtime']:
+        return 'fresh', manifest
+    # Only hash when the mtime moved (copies, checkouts, touch)
+    if file_digest(path) == source['sha256']:
+        return 'touched', manifest
+    return 'stale', manifest
+
+
+def cached_read_mps(path, folder=None, mmap_mode='r'):
+    ''' read_mps through a binary cache kept next to the file.
+
+        The cache (folder, default path + '.npycache') is rebuilt when the
+        source size or sha256 changes; an mtime change alone only triggers
+        a hash check.
+    '''
+    folder = folder or path + '.npycache'
+    state, manifest = _cache_state(path, folder)
+    if state == 'stale':
+        save_model(read_mps(path), folder, source=path)
+    elif state == 'touched':
+        manifest['source']['mtime'] = os.stat(path).st_mtime
+        _write_manifest(folder, manifest)
+    return load_model(folder, mmap_mode=mmap_mode)
+
+
+# Benchmark -------------------------------------------------------------------
+def write_mps(path, c, A, row_lower, row_upper, integrality):
+    ''' Write a model with L / G / E rows and [0, inf) or binary columns.
+
+        Integer columns are written first, inside one MARKER block, with
+        an UP 1 bound. Used to generate benchmark files.
+    '''
+    A = sparse.csc_matrix(A)
+    m, n = A.shape
+    order = np.argsort(-np.asarray(integrality), kind='stable')
+    n_int = int(np.sum(integrality))
+    kinds = np.where(np.isinf(row_lower), 'L',
+                     np.where(np.isinf(row_upper), 'G', 'E'))
+    rhs = np.where(kinds == 'L', row_upper, row_lower)
+    A = A[:, order]
+    c = np.asarray(c)[order]
+    with open(path, 'w') as f:
+        f.write('NAME          BENCH\nROWS\n N  OBJ\n')
+        f.write(''.join(' {}  R{}\n'.format(k, i)
+                        for i, k in enumerate(kinds.tolist())))
+        f.write('COLUMNS\n')
+        col = np.repeat(np.arange(n), np.diff(A.indptr))
+        labels = 'C' + pd.Series(np.arange(n)).astype(str)
+        frame = pd.DataFrame({'pad': '', 'col': labels[col].to_numpy(),
+                              'row': 'R' + pd.Series(A.indices).astype(str),
+                              'val': A.data})
+        obj = pd.DataFrame({'pad': '', 'col': labels, 'row': 'OBJ', 'val': c})
+        frame = pd.concat([obj[c != 0], frame]).sort_values('col',
+                                                            kind='stable')
+        cut = frame['col'].isin(['C{}'.format(j) for j in range(n_int)])
+        f.write("    MARKER                 'MARKER'                 "
+                "'INTORG'\n")
+        frame[cut].to_csv(f, sep=' ', header=False, index=False)
+        f.write("    MARKER                 'MARKER'                 "
+                "'INTEND'\n")
+        frame[~cut].to_csv(f, sep=' ', header=False, index=False)
+        f.write('RHS\n')
+        nz = np.flatnonzero(rhs)
+        f.write(''.join('    RHS       R{}  {!r}\n'.format(i, float(rhs[i]))
+                        for i in nz.tolist()))
+        f.write('BOUNDS\n')
+        f.write(''.join(' UP BND       C{}  1\n'.format(j)
+                        for j in range(n_int)))
+        f.write('ENDATA\n')
+
+
+def random_mip(n_rows, n_cols, nnz_per_col=5, int_share=0.5, seed=0):
+    ''' Random covering-style model: G rows, nonnegative coefficients. '''
+    rng = np.random.default_rng(seed)
+    cols = np.repeat(np.arange(n_cols), nnz_per_col)
+    rows = rng.integers(0, n_rows, cols.size)
+    A = sparse.csr_matrix((rng.integers(1, 10, cols.size).astype(float),
+                           (rows, cols)), shape=(n_rows, n_cols))
+    return (rng.integers(1, 100, n_cols).astype(float), A,
+            np.full(n_rows, 1.0), np.full(n_rows, np.inf),
+            (rng.random(n_cols) < int_share).astype(float))
+
+
+def benchmark_cache(sizes=((10**3, 10**4), (10**4, 10**5), (10**5, 10**6)),
+                    path='mps_bench.mps'):
+    ''' Text parse against building and opening the binary cache. '''
+    for n_rows, n_cols in sizes:
+        write_mps(path, *random_mip(n_rows, n_cols))
+        folder = path + '.npycache'
+        start = time.perf_counter()
+        model = read_mps(path)
+        parse = time.perf_counter() - start
+        start = time.perf_counter()
+        save_model(model, folder, source=path)
+        save = time.perf_counter() - start
+        start = time.perf_counter()
+        cached = cached_read_mps(path)
+        open_time = time.perf_counter() - start
+        os.utime(path)
+        start = time.perf_counter()
+        cached_read_mps(path)
+        touched = time.perf_counter() - start
+        assert np.array_equal(cached['A'].indices, model['A'].indices)
+        print('rows x cols => {:>7,} x {:<9,} | parse => {:6.2f}s | '
+              'save => {:6.2f}s | mmap open => {:8.4f}s | open after touch '
+              '(hash) => {:6.3f}s'.format(n_rows, n_cols, parse, save,
+                                         open_time, touched))
+        shutil.rmtree(folder)
+    os.remove(path)
+
+
+def benchmark_read_mps(sizes=((10**3, 10**4), (10**4, 10**5),
+                              (10**5, 10**6)), pulp_max_nnz=10**6,
+                       path='mps_bench.mps'):
+    ''' Parse time of read_mps against PuLP's LpProblem.fromMPS. '''
+    import pulp
+    for n_rows, n_cols in sizes:
+        write_mps(path, *random_mip(n_rows, n_cols))
+        size = os.path.getsize(path) / 2**20
+        start = time.perf_counter()
+        model = read_mps(path)
+        elapsed = time.perf_counter() - start
+        line = 'rows x cols => {:>7,} x {:<9,} | nnz => {:>9,} | {:7.1f} MiB' \
+            ' | read_mps => {:6.2f}s'.format(n_rows, n_cols, model['A'].nnz,
+                                             size, elapsed)
+        if model['A'].nnz <= pulp_max_nnz:
+            start = time.perf_counter()
+            pulp.LpProblem.fromMPS(path)
+            line += ' | pulp => {:6.2f}s'.format(time.perf_counter() - start)
+        print(line)
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    # Regression check: p0033 has a known optimum of 3089
+    model = read_mps('data/p0033.mps.txt')
+    res = solve_mps(model)
+    print('p0033 => rows {} | cols {} | nnz {} | objective {:.0f}'.format(
+        model['A'].shape[0], model['A'].shape[1], model['A'].nnz, res.fun))
+    assert abs(res.fun - 3089) < 1e-6
+    benchmark_read_mps()
+    benchmark_cache()
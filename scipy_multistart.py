@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-start SLSQP driver.
+
+A single SLSQP run only finds the local optimum nearest its starting point.
+multistart_slsqp samples starting points inside the bounds with a Sobol or
+Latin hypercube design, solves from each start in a process pool, merges
+optima that converged to the same point and returns the best feasible one.
+Optima are ranked by feasibility and then objective; whether SLSQP itself
+reported success is kept as a separate flag, since it can stop on an
+iteration limit at a perfectly good feasible point.
+
+Ref : https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.qmc.html
+"""
+
+# Import Libraries ------------------------------------------------------------
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize, OptimizeResult
+from scipy.stats import qmc
+
+
+# Starting Points -------------------------------------------------------------
+def sample_starts(bounds, n_starts, sampler='sobol', seed=None):
+    ''' Draw n_starts points inside bounds with a space-filling design.
+
+        bounds :  sequence of (low, high) tuples, one per variable.
+        sampler : 'sobol' or 'lhs'.
+    '''
+    bounds = np.asarray(bounds, dtype=float)
+    d = bounds.shape[0]
+    if sampler == 'sobol':
+        engine = qmc.Sobol(d, scramble=True, seed=seed)
+    elif sampler == 'lhs':
+        engine = qmc.LatinHypercube(d, seed=seed)
+    else:
+        raise ValueError('Unknown sampler => {}'.format(sampler))
+    unit = engine.random(n_starts)
+    return qmc.scale(unit, bounds[:, 0], bounds[:, 1])
+
+
+# Feasibility -----------------------------------------------------------------
+def max_violation(x, bounds, constraints):
+    ''' Largest bound or constraint violation at x (0 when feasible). '''
+    bounds = np.asarray(bounds, dtype=float)
+    viol = [0.0,
+            np.max(bounds[:, 0] - x, initial=0.0),
+            np.max(x - bounds[:, 1], initial=0.0)]
+    for con in constraints:
+        val = np.atleast_1d(con['fun'](x, *con.get('args', ())))
+        if con['type'] == 'eq':
+            viol.append(np.max(np.abs(val)))
+        else:
+            viol.append(np.max(-val, initial=0.0))
+    return float(max(viol))
+
+
+STAT_COLUMNS = ('start', 'x0', 'x', 'fun', 'success', 'status', 'nit', 'nfev',
+                'max_violation', 'seconds')
+
+
+# Worker ----------------------------------------------------------------------
+def _solve_start(args):
+    ''' Run SLSQP from one start and return its per-start statistics. '''
+    i, x0, objective, bounds, constraints, options = args
+    start = time.perf_counter()
+    sol = minimize(objective, x0, method='SLSQP', bounds=bounds,
+                   constraints=constraints, options=options)
+    return {'start': i,
+            'x0': x0,
+            'x': sol.x,
+            'fun': float(sol.fun),
+            'success': bool(sol.success),
+            'status': sol.status,
+            'nit': sol.nit,
+            'nfev': sol.nfev,
+            'max_violation': max_violation(sol.x, bounds, constraints),
+            'seconds': time.perf_counter() - start}
+
+
+# Deduplicate Optima ----------------------------------------------------------
+def deduplicate_optima(stats, tol=1e-4):
+    ''' Group starts whose x agree within tol.
+
+        Returns a list of dicts (x, fun, feasible, success, max_violation,
+        count, starts), feasible optima first and each part sorted by fun.
+        success is True when SLSQP reported success for any start in the
+        group.
+    '''
+    optima = []
+    ranked = stats[np.isfinite(stats['fun'])].assign(
+        infeasible=~stats['feasible']).sort_values(['infeasible', 'fun'])
+    for row in ranked.itertuples():
+        for opt in optima:
+            if np.max(np.abs(opt['x'] - row.x)) <= tol:
+                opt['count'] += 1
+                opt['starts'].append(row.start)
+                opt['success'] = opt['success'] or row.success
+                break
+        else:
+            optima.append({'x': row.x, 'fun': row.fun,
+                           'feasible': row.feasible, 'success': row.success,
+                           'max_violation': row.max_violation, 'count': 1,
+                           'starts': [row.start]})
+    return optima
+
+
+# Multi-start Driver ----------------------------------------------------------
+def multistart_slsqp(objective, bounds, constraints=(), n_starts=32,
+                     sampler='sobol', seed=None, n_workers=None, target=None,
+                     dedup_tol=1e-4, feas_tol=1e-6, options=None):
+    ''' Solve from many starting points and return the best feasible optimum.
+
+        objective and the constraint functions must be picklable (module
+        level) so they can be sent to the worker processes.
+        target : stop submitting starts and cancel queued ones as soon as a
+                 feasible objective <= target has been found.
+        Returns an OptimizeResult with x, fun, success (a feasible optimum
+        was found), converged (SLSQP reported success for it), the
+        deduplicated optima, a per-start stats DataFrame and the number of
+        cancelled starts.
+    '''
+    if n_starts < 1:
+        raise ValueError('n_starts must be at least 1')
+    constraints = list(constraints) if not isinstance(constraints, dict) \
+        else [constraints]
+    starts = sample_starts(bounds, n_starts, sampler=sampler, seed=seed)
+    tasks = [(i, x0, objective, bounds, constraints, options)
+             for i, x0 in enumerate(starts)]
+    n_workers = n_workers or os.cpu_count() or 1
+    records = []
+    reached = False
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        # Keep only a small window in flight so early stopping saves work
+        pending = set()
+        queue = iter(tasks)
+        while True:
+            while not reached and len(pending) < 2 * n_workers:
+                task = next(queue, None)
+                if task is None:
+                    break
+                pending.add(pool.submit(_solve_start, task))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                rec = fut.result()
+                records.append(rec)
+                if (target is not None and rec['max_violation'] <= feas_tol
+                        and rec['fun'] <= target):
+                    reached = True
+            if reached:
+                for fut in pending:
+                    fut.cancel()
+                records.extend(f.result() for f in pending
+                               if not f.cancelled())
+                break
+    stats = pd.DataFrame(records, columns=list(STAT_COLUMNS))
+    stats = stats.sort_values('start').reset_index(drop=True)
+    stats['feasible'] = stats['max_violation'] <= feas_tol
+    optima = deduplicate_optima(stats, tol=dedup_tol)
+    res = OptimizeResult(optima=optima, stats=stats,
+                         n_cancelled=n_starts - len(stats),
+                         target_reached=reached)
+    n_feasible = sum(opt['feasible'] for opt in optima)
+    if n_feasible:
+        best = optima[0]
+        res.update(x=best['x'], fun=best['fun'], success=True,
+                   converged=best['success'],
+                   message='Best of {} distinct feasible optima'.format(
+                       n_feasible))
+    else:
+        res.update(x=None, fun=np.inf, success=False, converged=False,
+                   message='No start reached a feasible point')
+    return res
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized objective evaluation for plotting.
+
+The tutorial notebooks evaluate objectives with list comprehensions over
+Python floats, e.g. qfunct(vector) for 3x^4 - 2x - 1. evaluate() runs the
+objective on NumPy arrays instead, accepting a scalar or an array, in
+chunks for very large grids. An objective may also be a string expression
+in x, which is evaluated with numexpr when it is installed. Without numexpr
+the expression is checked to hold only x, numbers, arithmetic and
+comparison operators, NumPy ufuncs (np.sin, np.exp, ...), np constants and
+np.where / np.clip, then evaluated with no builtins and only np and x in
+scope.
+
+evaluate_grid() caches results keyed by (function, grid spec), so
+re-running a plotting cell in a notebook does not recompute the grid.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import ast
+from collections import OrderedDict
+import numpy as np
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+# Example Objective -----------------------------------------------------------
+def qfunct(x):
+    ''' 3x^4 - 2x - 1, element-wise on a scalar or an array. '''
+    x = np.asarray(x, dtype=float)
+    return 3 * x ** 4 - (2 * x + 1)
+
+
+# Evaluation ------------------------------------------------------------------
+_EXPR_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare,
+               ast.Call, ast.Name, ast.Attribute, ast.Constant, ast.Load,
+               ast.operator, ast.unaryop, ast.cmpop)
+_EXPR_NP_FUNCS = ('where', 'clip')
+
+
+def _allowed_np_name(name):
+    if name.startswith('_') or not hasattr(np, name):
+        return False
+    attr = getattr(np, name)
+    return isinstance(attr, (np.ufunc, float)) or name in _EXPR_NP_FUNCS
+
+
+def compile_expression(expr):
+    ''' Compile a string objective in x for the NumPy fallback.
+
+        Raises ValueError for anything but x, numbers, operators, NumPy
+        ufuncs, np constants and np.where / np.clip.
+    '''
+    tree = ast.parse(expr, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _EXPR_NODES):
+            raise ValueError('Unsupported syntax in {!r}: {}'.format(
+                expr, type(node).__name__))
+        if isinstance(node, ast.Name) and node.id not in ('x', 'np'):
+            raise ValueError('Unknown name in {!r}: {}'.format(expr, node.id))
+        if isinstance(node, ast.Attribute) and (
+                not isinstance(node.value, ast.Name) or node.value.id != 'np'
+                or not _allowed_np_name(node.attr)):
+            raise ValueError('Unsupported attribute in {!r}: {}'.format(
+                expr, node.attr))
+        if isinstance(node, ast.Call) and not isinstance(node.func,
+                                                         ast.Attribute):
+            raise ValueError('Only np.<name> calls are allowed in '
+                             '{!r}'.format(expr))
+        if isinstance(node, ast.Constant) and not isinstance(
+                node.value, (int, float, complex)):
+            raise ValueError('Only numeric constants are allowed in '
+                             '{!r}'.format(expr))
+    return compile(tree, '<objective>', 'eval')
+
+
+def _evaluate_block(func, x):
+    if isinstance(func, str):
+        if numexpr is not None:
+            return numexpr.evaluate(func, local_dict={'x': x})
+        return eval(compile_expression(func),
+                    {'__builtins__': {}, 'np': np}, {'x': x})
+    return func(x)
+
+
+def evaluate(func, x, chunk_size=None):
+    ''' Evaluate func on a scalar or array of points.
+
+        func :       vectorized callable f(x), or a string expression in x.
+        chunk_size : evaluate at most this many points at a time, to bound
+                     temporary memory on very large grids.
+        Returns a float for scalar input, otherwise an array shaped like x.
+    '''
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 0:
+        return float(_evaluate_block(func, x))
+    if chunk_size is None or x.size <= chunk_size:
+        return np.broadcast_to(_evaluate_block(func, x), x.shape).copy()
+    flat = x.ravel()
+    out = np.empty(flat.size)
+    for start in range(0, flat.size, chunk_size):
+        stop = start + chunk_size
+        out[start:stop] = _evaluate_block(func, flat[start:stop])
+    return out.reshape(x.shape)
+
+
+# Grid Cache ------------------------------------------------------------------
+_GRID_CACHE = OrderedDict()
+_GRID_CACHE_STATS = {'hits': 0, 'misses': 0}
+GRID_CACHE_MAXSIZE = 64
+
+
+def evaluate_grid(func, start, stop, step, chunk_size=None, cache=True):
+    ''' Evaluate func on np.arange(start, stop, step), with caching.
+
+        Returns (grid, values). Cached arrays are read-only so a plot cell
+        cannot silently corrupt them; copy before modifying.
+        The cache is keyed on the function object (or expression string)
+        and the grid spec, and keeps the GRID_CACHE_MAXSIZE most recently
+        used entries.
+    '''
+    key = (func, float(start), float(stop), float(step))
+    if cache and key in _GRID_CACHE:
+        _GRID_CACHE.move_to_end(key)
+        _GRID_CACHE_STATS['hits'] += 1
+        return _GRID_CACHE[key]
+    grid = np.arange(start, stop, step, dtype=float)
+    values = evaluate(func, grid, chunk_size=chunk_size)
+    if cache:
+        _GRID_CACHE_STATS['misses'] += 1
+        grid.flags.writeable = False
+        values.flags.writeable = False
+        _GRID_CACHE[key] = (grid, values)
+        while len(_GRID_CACHE) > GRID_CACHE_MAXSIZE:
+            _GRID_CACHE.popitem(last=False)
+    return grid, values
+
+
+def grid_cache_info():
+    ''' Hits, misses and current size of the grid cache. '''
+    return dict(_GRID_CACHE_STATS, size=len(_GRID_CACHE))
+
+
+def clear_grid_cache():
+    _GRID_CACHE.clear()
+    _GRID_CACHE_STATS['hits'] = 0
+    _GRID_CACHE_STATS['misses'] = 0
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Batched random search.
+
+Backs scipy_documenetation.bruteforce_topk, the bounded-memory variant of
+the one-point-at-a-time bruteforce loop.
+Samples are drawn as (chunk, d) blocks, the objective is evaluated over
+whole rows and only a running top-k of the smallest values is kept, so
+memory is bounded by the chunk size no matter how many samples are drawn.
+
+parallel_random_search shards the sample budget across a process pool.
+Every shard gets its own SeedSequence child stream, so for a given seed and
+worker count the merged top-k is bit-identical from run to run.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+
+# Top-k Helpers ---------------------------------------------------------------
+def _check_k(k):
+    if k < 1:
+        raise ValueError('k must be at least 1 => {}'.format(k))
+
+
+def _select_topk(y, order, k):
+    ''' Return the positions of the k smallest values of y.
+        Ties are broken by draw order so the result never depends on how
+        argpartition happens to arrange equal values.
+    '''
+    if y.size > k:
+        # Widen the cut to every value equal to the k-th so ties survive
+        kth = np.partition(y, k - 1)[k - 1]
+        keep = np.flatnonzero(y <= kth)
+    else:
+        keep = np.arange(y.size)
+    keep = keep[np.lexsort((order[keep], y[keep]))]
+    return keep[:k]
+
+
+def _merge_topk(best, chunk, k):
+    ''' Merge two (y, label, order) candidate sets and keep the k best. '''
+    y = np.concatenate([best[0], chunk[0]])
+    label = np.concatenate([best[1], chunk[1]])
+    order = np.concatenate([best[2], chunk[2]])
+    keep = _select_topk(y, order, k)
+    return y[keep], label[keep], order[keep]
+
+
+def _chunk_topk(func, X, offset, k):
+    ''' Evaluate a block of samples and reduce it to its own top-k. '''
+    y = np.asarray(func(X), dtype=float)
+    if y.size > k:
+        # argpartition is O(chunk); only the k survivors get sorted later
+        cand = np.argpartition(y, k - 1)[:k]
+        kth = y[cand].max()
+        cand = np.flatnonzero(y <= kth)
+    else:
+        cand = np.arange(y.size)
+    return (y[cand], X[cand].sum(axis=1),
+            offset + cand.astype(np.int64))
+
+
+# Random Search ---------------------------------------------------------------
+def random_search_topk(func, n_samples, d, low=-10, high=10, k=100,
+                       chunk_size=65536, rng=None):
+    ''' Draw n_samples integer points in [low, high) and keep the k best.
+
+        func : vectorized objective mapping an (n, d) array to n values.
+        rng :  numpy Generator or seed, the whole search is reproducible
+               from it.
+        Returns the (y, label, order) arrays of the k best samples sorted
+        by y, where label is the row sum and order the draw index.
+    '''
+    _check_k(k)
+    rng = np.random.default_rng(rng)
+    empty = (np.empty(0), np.empty(0, dtype=np.int64),
+             np.empty(0, dtype=np.int64))
+    best = empty
+    drawn = 0
+    while drawn < n_samples:
+        n = min(chunk_size, n_samples - drawn)
+        X = rng.integers(low, high, size=(n, d))
+        best = _merge_topk(best, _chunk_topk(func, X, drawn, k), k)
+        drawn += n
+    return best
+
+
+def topk_frame(best):
+    ''' Build the y / label DataFrame returned by bruteforce_topk. '''
+    df = pd.DataFrame({})
+    df['y'] = best[0]
+    df['label'] = best[1]
+    return df
+
+
+def random_search(func, n_samples=100000, d=4, low=-10, high=10, k=100,
+                  chunk_size=65536, seed=None):
+    ''' Vectorized random search returning a DataFrame of the k best samples.
+
+        The frame has the same y / label columns as the bruteforce output,
+        sorted so the best (smallest) value comes first.
+    '''
+    best = random_search_topk(func, n_samples, d, low=low, high=high, k=k,
+                              chunk_size=chunk_size, rng=seed)
+    return topk_frame(best)
+
+
+# Parallel Random Search ------------------------------------------------------
+def _shard_sizes(n_samples, n_workers):
+    ''' Split n_samples into n_workers contiguous shards. '''
+    base, extra = divmod(n_samples, n_workers)
+    return [base + (1 if i < extra else 0) for i in range(n_workers)]
+
+
+def _search_shard(args):
+    ''' Worker entry point: run one shard and offset its draw indices. '''
+    func, n, d, low, high, k, chunk_size, seed_seq, offset = args
+    rng = np.random.default_rng(seed_seq)
+    y, label, order = random_search_topk(func, n, d, low=low, high=high, k=k,
+                                         chunk_size=chunk_size, rng=rng)
+    return y, label, order + offset
+
+
+def parallel_random_search_topk(func, n_samples, d, low=-10, high=10, k=100,
+                                chunk_size=65536, n_workers=None, seed=None):
+    ''' Shard the search over a ProcessPoolExecutor and merge the top-k.
+
+        func must be picklable (defined at module level).
+        Returns the same (y, label, order) arrays as random_search_topk.
+    '''
+    _check_k(k)
+    n_workers = n_workers or os.cpu_count() or 1
+    children = np.random.SeedSequence(seed).spawn(n_workers)
+    sizes = _shard_sizes(n_samples, n_workers)
+    offsets = np.cumsum([0] + sizes[:-1])
+    tasks = [(func, n, d, low, high, k, chunk_size, child, int(offset))
+             for n, child, offset in zip(sizes, children, offsets)]
+    if n_workers == 1:
+        results = [_search_shard(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_search_shard, tasks))
+    # Merge in shard order; ties are resolved by the global draw index
+    best = results[0]
+    for res in results[1:]:
+        best = _merge_topk(best, res, k)
+    return best
+
+
+def parallel_random_search(func, n_samples=100000, d=4, low=-10, high=10,
+                           k=100, chunk_size=65536, n_workers=None,
+                           seed=None):
+    ''' Process-pool random search returning the bruteforce_topk frame. '''
+    best = parallel_random_search_topk(func, n_samples, d, low=low, high=high,
+                                       k=k, chunk_size=chunk_size,
+                                       n_workers=n_workers, seed=seed)
+    return topk_frame(best)
+
+
+# Benchmark -------------------------------------------------------------------
+def benchmark_random_search(func, sizes=(10**5, 10**6, 10**7), d=4,
+                            chunk_size=65536):
+    ''' Print samples/sec of the batched search for each sample budget. '''
+    for n in sizes:
+        start = time.perf_counter()
+        random_search(func, n_samples=n, d=d, chunk_size=chunk_size, seed=0)
+        elapsed = time.perf_counter() - start
+        print('n_samples => {:>12,} | seconds => {:8.3f} | samples/sec => {:,.0f}'
+              .format(n, elapsed, n / elapsed))
+
+
+def benchmark_parallel_scaling(func, n_samples=10**7, d=4, worker_counts=None,
+                               chunk_size=65536):
+    ''' Print samples/sec and speedup against the number of workers. '''
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, 4, 8, 16, 32, 64, cpus} & set(
+            range(1, cpus + 1)))
+    base = None
+    for n_workers in worker_counts:
+        start = time.perf_counter()
+        parallel_random_search(func, n_samples=n_samples, d=d,
+                               chunk_size=chunk_size, n_workers=n_workers,
+                               seed=0)
+        elapsed = time.perf_counter() - start
+        rate = n_samples / elapsed
+        base = base or rate
+        print('workers => {:>3} | seconds => {:8.3f} | samples/sec => {:>14,.0f}'
+              ' | speedup => {:5.2f}x'.format(n_workers, elapsed, rate,
+                                              rate / base))
+
+
+if __name__ == '__main__':
+    from scipy_rosen import rosen
+    benchmark_random_search(rosen)
+    benchmark_parallel_scaling(rosen)
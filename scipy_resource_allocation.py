@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Sparse resource-allocation model builder for scipy linprog.
+
+Scipy Tutorial 2.ipynb writes the constraint matrix as nested Python lists
+and calls linprog with method='revised simplex', which scipy has deprecated
+and removed. Here A_ub / A_eq are assembled as scipy.sparse CSR matrices
+straight from columnar input (dense arrays, sparse matrices, COO triplets or
+a long-format DataFrame) and solved with HiGHS.
+
+Problem :
+    max   profit . x
+    s.t.  usage x <= capacity
+          x >= 0
+
+Ref : https://realpython.com/linear-programming-python/#using-scipy
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+
+
+# Matrix Assembly -------------------------------------------------------------
+def to_csr(usage, shape=None):
+    ''' Convert constraint coefficients to a CSR matrix.
+
+        usage : dense array, scipy.sparse matrix, or a (rows, cols, vals)
+                triplet of equal-length arrays (shape is then required).
+    '''
+    if usage is None:
+        return None
+    if sparse.issparse(usage):
+        return usage.tocsr()
+    if isinstance(usage, tuple) and len(usage) == 3:
+        rows, cols, vals = (np.asarray(a) for a in usage)
+        return sparse.csr_matrix((vals, (rows, cols)), shape=shape)
+    return sparse.csr_matrix(np.asarray(usage, dtype=float))
+
+
+def frame_to_csr(df, row_col, var_col, value_col, rows=None, variables=None):
+    ''' Build a CSR matrix from a long-format DataFrame.
+
+        Each record is one coefficient: resource (row_col), product
+        (var_col) and the amount used (value_col). rows and variables fix
+        the label order; by default they are taken in order of appearance.
+        Returns (matrix, row_labels, variable_labels).
+    '''
+    row_codes, row_labels = pd.factorize(df[row_col]) if rows is None else (
+        pd.Index(rows).get_indexer(df[row_col]), pd.Index(rows))
+    var_codes, var_labels = pd.factorize(df[var_col]) if variables is None \
+        else (pd.Index(variables).get_indexer(df[var_col]),
+              pd.Index(variables))
+    if (row_codes < 0).any() or (var_codes < 0).any():
+        raise ValueError('DataFrame contains labels missing from rows or '
+                         'variables')
+    A = sparse.csr_matrix((df[value_col].to_numpy(dtype=float),
+                           (row_codes, var_codes)),
+                          shape=(len(row_labels), len(var_labels)))
+    return A, row_labels, var_labels
+
+
+def build_resource_model(profit, usage, capacity, eq_usage=None, eq_rhs=None,
+                         bounds=(0, None), maximize=True):
+    ''' Assemble the linprog inputs of a resource-allocation problem.
+
+        profit :   (n,) objective coefficients.
+        usage :    (m, n) resource use per unit, see to_csr for formats.
+        capacity : (m,) resource availability.
+        Returns a dict of linprog keyword arguments plus 'sense'.
+    '''
+    c = np.asarray(profit, dtype=float)
+    n = c.size
+    A_ub = to_csr(usage, shape=(len(capacity), n))
+    model = {'c': -c if maximize else c,
+             'A_ub': A_ub,
+             'b_ub': np.asarray(capacity, dtype=float),
+             'bounds': bounds,
+             'sense': -1 if maximize else 1}
+    if eq_usage is not None:
+        model['A_eq'] = to_csr(eq_usage, shape=(len(eq_rhs), n))
+        model['b_eq'] = np.asarray(eq_rhs, dtype=float)
+    return model
+
+
+def solve_resource_model(model, method='highs-ds', options=None):
+    ''' Solve a model from build_resource_model with HiGHS.
+
+        method : 'highs-ds' (dual simplex), 'highs-ipm' (interior point)
+                 or 'highs' (let HiGHS choose).
+        The returned result's fun is in the model's own sense (profit when
+        maximizing), also for the last iterate of a run that stopped early.
+    '''
+    kwargs = {k: v for k, v in model.items() if k != 'sense'}
+    res = linprog(method=method, options=options, **kwargs)
+    if res.fun is not None:
+        res.fun = model['sense'] * res.fun
+    return res
+
+
+# Benchmark -------------------------------------------------------------------
+def random_resource_model(n_vars, n_rows=None, nnz_per_col=3, seed=0):
+    ''' Random feasible instance with nnz_per_col coefficients per column.
+
+        By default there are sqrt(n_vars) resources, so the rows get denser
+        as the problem grows, like a fixed plant making more products.
+    '''
+    rng = np.random.default_rng(seed)
+    n_rows = n_rows or max(3, int(np.sqrt(n_vars)))
+    cols = np.repeat(np.arange(n_vars), nnz_per_col)
+    rows = rng.integers(0, n_rows, cols.size)
+    vals = rng.uniform(0.5, 3.0, cols.size)
+    profit = rng.uniform(10, 40, n_vars)
+    capacity = rng.uniform(50, 100, n_rows) * nnz_per_col * n_vars / n_rows
+    return build_resource_model(profit, (rows, cols, vals), capacity)
+
+
+def benchmark_resource_model(sizes=(4, 10**3, 10**4, 10**5, 10**6),
+                             methods=('highs-ds', 'highs-ipm')):
+    ''' Print build and solve time from the tutorial size up to 10^6. '''
+    for n in sizes:
+        start = time.perf_counter()
+        if n == 4:
+            model = build_resource_model([20, 12, 40, 25],
+                                         [[1, 1, 1, 1],
+                                          [3, 2, 1, 0],
+                                          [0, 1, 2, 3]],
+                                         [50, 100, 90])
+        else:
+            model = random_resource_model(n)
+        build = time.perf_counter() - start
+        for method in methods:
+            start = time.perf_counter()
+            res = solve_resource_model(model, method=method)
+            solve = time.perf_counter() - start
+            print('n_vars => {:>9,} | nnz => {:>9,} | {:<9} | build => '
+                  '{:7.3f}s | solve => {:8.3f}s | profit => {:.4g}'.format(
+                      n, model['A_ub'].nnz, method, build, solve, res.fun))
+
+
+if __name__ == '__main__':
+    benchmark_resource_model()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Rosenbrock function shared by the scipy examples.
+
+rosen_grad, rosen_hess and rosen_hessp give the analytic derivatives so the
+examples can use BFGS, L-BFGS-B or trust-ncg instead of nelder-mead.
+minimize_auto picks the method from whichever derivatives are supplied.
+
+Ref : https://docs.scipy.org/doc/scipy/reference/tutorial/optimize.html#optimization-scipy-optimize
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+from scipy import sparse
+from scipy.optimize import minimize
+
+
+def rosen(x):
+    '''The Rosenbrock function.
+
+    Evaluated over the last axis, so a single point of shape (d,) returns a
+    scalar and a block of points of shape (n, d) returns n values in one pass.
+    '''
+    x = np.asarray(x, dtype=float)
+    return np.sum(100.0*(x[..., 1:]-x[..., :-1]**2.0)**2.0
+                  + (1-x[..., :-1])**2.0, axis=-1)
+
+
+def rosen_grad(x):
+    '''Gradient of the Rosenbrock function.'''
+    x = np.asarray(x, dtype=float)
+    xm = x[1:-1]
+    xm_m1 = x[:-2]
+    xm_p1 = x[2:]
+    grad = np.zeros_like(x)
+    grad[1:-1] = 200*(xm-xm_m1**2) - 400*(xm_p1 - xm**2)*xm - 2*(1-xm)
+    grad[0] = -400*x[0]*(x[1]-x[0]**2) - 2*(1-x[0])
+    grad[-1] = 200*(x[-1]-x[-2]**2)
+    return grad
+
+
+def _rosen_hess_diagonals(x):
+    '''Main and off diagonals of the tridiagonal Rosenbrock Hessian.'''
+    off = -400*x[:-1]
+    main = np.zeros_like(x)
+    main[0] = 1200*x[0]**2 - 400*x[1] + 2
+    main[-1] = 200
+    main[1:-1] = 202 + 1200*x[1:-1]**2 - 400*x[2:]
+    return main, off
+
+
+def rosen_hess(x):
+    '''Hessian of the Rosenbrock function.
+
+    The Hessian is tridiagonal, so it is returned as a sparse CSR matrix to
+    keep n = 10,000 problems at O(n) memory.
+    '''
+    x = np.asarray(x, dtype=float)
+    main, off = _rosen_hess_diagonals(x)
+    return sparse.diags([off, main, off], [-1, 0, 1], format='csr')
+
+
+def rosen_hessp(x, p):
+    '''Product of the Rosenbrock Hessian with a vector p.'''
+    x = np.asarray(x, dtype=float)
+    p = np.asarray(p, dtype=float)
+    main, off = _rosen_hess_diagonals(x)
+    hp = main*p
+    hp[:-1] += off*p[1:]
+    hp[1:] += off*p[:-1]
+    return hp
+
+
+# Solver Entry Point ----------------------------------------------------------
+# BFGS keeps a dense n x n inverse Hessian, so above this size L-BFGS-B is used
+BFGS_MAX_DIM = 1000
+
+
+def select_method(n, jac=None, hess=None, hessp=None, bounds=None):
+    ''' Pick a scipy method from the derivatives that are available. '''
+    if jac is None:
+        return 'nelder-mead'
+    if bounds is not None:
+        return 'L-BFGS-B'
+    if hess is not None or hessp is not None:
+        return 'trust-ncg'
+    if n > BFGS_MAX_DIM:
+        return 'L-BFGS-B'
+    return 'BFGS'
+
+
+def minimize_auto(fun, x0, jac=None, hess=None, hessp=None, bounds=None,
+                  method=None, options=None):
+    ''' minimize() wrapper that uses derivatives whenever they are given.
+
+        For trust-ncg a Hessian-vector product is preferred over the full
+        Hessian, and one of hess or hessp is required. Pass method to
+        override the automatic choice.
+    '''
+    x0 = np.asarray(x0, dtype=float)
+    method = method or select_method(x0.size, jac=jac, hess=hess,
+                                     hessp=hessp, bounds=bounds)
+    if method.lower() == 'trust-ncg' and hess is None and hessp is None:
+        raise ValueError('trust-ncg needs hess or hessp')
+    kwargs = {'method': method, 'options': options}
+    if method.lower() != 'nelder-mead':
+        kwargs['jac'] = jac
+    if method.lower() == 'trust-ncg':
+        if hessp is None:
+            # Works for dense and sparse Hessians alike
+            def hessp(x, p):
+                return hess(x).dot(p)
+        kwargs['hessp'] = hessp
+    if bounds is not None:
+        kwargs['bounds'] = bounds
+    return minimize(fun, x0, **kwargs)
+
+
+# Benchmark -------------------------------------------------------------------
+def benchmark_rosen(dims=(5, 100, 10000), seed=0):
+    ''' Compare evaluations and wall time of each method per dimension.
+
+        nelder-mead is capped at 200 * n evaluations. nelder-mead and BFGS
+        both keep O(n^2) state, so they are skipped above BFGS_MAX_DIM.
+    '''
+    rng = np.random.default_rng(seed)
+    cases = [('nelder-mead', {}),
+             ('BFGS', {'jac': rosen_grad}),
+             ('L-BFGS-B', {'jac': rosen_grad}),
+             ('trust-ncg', {'jac': rosen_grad, 'hessp': rosen_hessp})]
+    for n in dims:
+        x0 = rng.uniform(0.5, 1.5, n)
+        for method, derivs in cases:
+            if method in ('nelder-mead', 'BFGS') and n > BFGS_MAX_DIM:
+                continue
+            options = {'maxfev': 200*n} if method == 'nelder-mead' else None
+            start = time.perf_counter()
+            res = minimize_auto(rosen, x0, method=method, options=options,
+                                **derivs)
+            elapsed = time.perf_counter() - start
+            print('n => {:>6} | {:<11} | nfev => {:>7} | njev => {:>6} | '
+                  'nhev => {:>6} | fun => {:10.3e} | seconds => {:8.3f}'
+                  .format(n, method, res.nfev, res.get('njev', 0),
+                          res.get('nhev', 0), res.fun, elapsed))
+
+
+if __name__ == '__main__':
+    benchmark_rosen()
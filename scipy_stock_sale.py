@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Maximize revenue from stock sales.
+
+Scipy Tutorial.ipynb solves this with general nonlinear minimize(), even
+though it is a linear program:
+
+    max   prices . x
+    s.t.  sum(x) == n_shares
+          0 <= x <= money_available / prices
+
+minimize_linear checks whether an objective is linear and, when every
+constraint is a LinearConstraint, routes the problem to linprog / HiGHS.
+The problem is also a fractional knapsack, so greedy_stock_sale solves it
+in closed form by filling the highest-paying buyers first.
+
+Ref : https://realpython.com/python-scipy-cluster-optimize/
+"""
+
+# Import Libraries ------------------------------------------------------------
+import time
+import numpy as np
+from scipy import sparse
+from scipy.optimize import (minimize, linprog, LinearConstraint,
+                            OptimizeResult)
+
+
+# Problem Data ----------------------------------------------------------------
+def stock_sale_problem(n_buyers=10, n_shares=15, seed=10):
+    ''' Random prices and budgets, generated as in the tutorial notebook.
+
+        Returns (prices, n_shares, n_shares_per_buyer).
+    '''
+    rng = np.random.RandomState(seed)
+    prices = rng.random_sample(n_buyers)
+    money_available = rng.randint(1, 4, n_buyers)
+    return prices, n_shares, money_available / prices
+
+
+def objective_function(x, prices):
+    return -x.dot(prices)
+
+
+def objective_gradient(x, prices):
+    return -prices
+
+
+# Linear Structure Detection --------------------------------------------------
+def linear_coefficients(fun, n, args=(), jac=None, n_checks=3, rtol=1e-9,
+                        seed=0):
+    ''' Return (c, c0) if fun(x) == c . x + c0, otherwise None.
+
+        With jac the coefficients are its value at 0 (O(n) work); without
+        it they are read off by probing fun at the n unit vectors, which
+        costs O(n^2) for a dense objective. Either way the result is
+        confirmed at a few random points.
+    '''
+    x = np.zeros(n)
+    c0 = float(fun(x, *args))
+    if jac is not None:
+        c = np.array(jac(x, *args), dtype=float)
+    else:
+        c = np.empty(n)
+        for i in range(n):
+            x[i] = 1.0
+            c[i] = fun(x, *args) - c0
+            x[i] = 0.0
+    rng = np.random.default_rng(seed)
+    for _ in range(n_checks):
+        x = rng.uniform(-10, 10, n)
+        expected = c.dot(x) + c0
+        if not np.isclose(fun(x, *args), expected, rtol=rtol,
+                          atol=rtol * np.abs(c).sum() * 10):
+            return None
+        if jac is not None and not np.allclose(jac(x, *args), c):
+            return None
+    return c, c0
+
+
+def minimize_linear(fun, x0, args=(), jac=None, constraints=(), bounds=None,
+                    method='highs', options=None):
+    ''' minimize() that switches to linprog when the problem is an LP.
+
+        The objective is tested for linearity with linear_coefficients; if
+        it is linear and every constraint is a LinearConstraint, HiGHS
+        solves the LP directly. Anything else falls back to minimize().
+    '''
+    x0 = np.asarray(x0, dtype=float)
+    if isinstance(constraints, LinearConstraint):
+        constraints = [constraints]
+    lin = None
+    if all(isinstance(con, LinearConstraint) for con in constraints):
+        lin = linear_coefficients(fun, x0.size, args=args, jac=jac)
+    if lin is None:
+        return minimize(fun, x0, args=args, jac=jac, constraints=constraints,
+                        bounds=bounds)
+    c, c0 = lin
+    A_ub, b_ub, A_eq, b_eq = [], [], [], []
+    for con in constraints:
+        A = sparse.csr_matrix(np.atleast_2d(con.A))
+        lb = np.broadcast_to(con.lb, A.shape[0]).astype(float)
+        ub = np.broadcast_to(con.ub, A.shape[0]).astype(float)
+        eq = lb == ub
+        if eq.any():
+            A_eq.append(A[eq])
+            b_eq.append(ub[eq])
+        up = ~eq & np.isfinite(ub)
+        if up.any():
+            A_ub.append(A[up])
+            b_ub.append(ub[up])
+        low = ~eq & np.isfinite(lb)
+        if low.any():
+            A_ub.append(-A[low])
+            b_ub.append(-lb[low])
+    res = linprog(c,
+                  A_ub=sparse.vstack(A_ub).tocsr() if A_ub else None,
+                  b_ub=np.concatenate(b_ub) if b_ub else None,
+                  A_eq=sparse.vstack(A_eq).tocsr() if A_eq else None,
+                  b_eq=np.concatenate(b_eq) if b_eq else None,
+                  bounds=bounds, method=method, options=options)
+    if res.status == 0:
+        res.fun = res.fun + c0
+    return res
+
+
+# Closed-form Greedy ----------------------------------------------------------
+def greedy_stock_sale(prices, n_shares, n_shares_per_buyer):
+    ''' Fractional knapsack: sell to the highest price buyers first.
+
+        O(n log n) for the sort, everything else is vectorized.
+    '''
+    prices = np.asarray(prices, dtype=float)
+    cap = np.asarray(n_shares_per_buyer, dtype=float)
+    if cap.sum() < n_shares:
+        return OptimizeResult(x=None, fun=np.nan, success=False, status=2,
+                              message='Buyers cannot absorb all shares')
+    order = np.argsort(-prices, kind='stable')
+    sold_before = np.cumsum(cap[order]) - cap[order]
+    x = np.empty_like(cap)
+    x[order] = np.clip(n_shares - sold_before, 0, cap[order])
+    return OptimizeResult(x=x, fun=-x.dot(prices), success=True, status=0,
+                          message='Greedy fractional knapsack')
+
+
+def maximize_stock_revenue(prices, n_shares, n_shares_per_buyer,
+                           method='greedy'):
+    ''' Solve the stock sale problem with one of three paths.
+
+        method : 'greedy' (closed form), 'linprog' (HiGHS through
+                 minimize_linear) or 'minimize' (the notebook's approach).
+        fun is the negative revenue, as in the notebook.
+    '''
+    prices = np.asarray(prices, dtype=float)
+    n_buyers = prices.size
+    if method == 'greedy':
+        return greedy_stock_sale(prices, n_shares, n_shares_per_buyer)
+    constraint = LinearConstraint(np.ones((1, n_buyers)), lb=n_shares,
+                                  ub=n_shares)
+    bounds = [(0, n) for n in n_shares_per_buyer]
+    x0 = np.zeros(n_buyers)
+    if method == 'linprog':
+        # HiGHS presolve is quadratic on the single dense row; skip it
+        return minimize_linear(objective_function, x0, args=(prices,),
+                               jac=objective_gradient,
+                               constraints=constraint, bounds=bounds,
+                               options={'presolve': False})
+    if method == 'minimize':
+        return minimize(objective_function, x0, args=(prices,),
+                        constraints=constraint, bounds=bounds)
+    raise ValueError('Unknown method => {}'.format(method))
+
+
+# Benchmark -------------------------------------------------------------------
+def benchmark_stock_sale(sizes=(10, 100, 1000, 10**4, 10**5),
+                         minimize_max=100):
+    ''' Compare the three paths as the number of buyers grows.
+
+        minimize() is skipped above minimize_max buyers; SLSQP's dense
+        linear algebra already takes minutes at 1,000 buyers.
+    '''
+    for n_buyers in sizes:
+        prices, _, cap = stock_sale_problem(n_buyers, seed=10)
+        n_shares = 0.5 * cap.sum()
+        for method in ('greedy', 'linprog', 'minimize'):
+            if method == 'minimize' and n_buyers > minimize_max:
+                continue
+            start = time.perf_counter()
+            res = maximize_stock_revenue(prices, n_shares, cap,
+                                         method=method)
+            elapsed = time.perf_counter() - start
+            print('buyers => {:>7,} | {:<8} | seconds => {:8.4f} | '
+                  'revenue => {:.6f}'.format(n_buyers, method, elapsed,
+                                             -res.fun))
+
+
+if __name__ == '__main__':
+    benchmark_stock_sale()
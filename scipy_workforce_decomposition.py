@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+Column generation / Lagrangian decomposition of the workforce schedule.
+
+The monolithic model in pyomo_workforce_scheduling.py grows as workers x
+days x shifts, and HiGHS finds no incumbent for 5,000 workers over four
+weeks. Here the only constraints that link workers, the coverage rows, are
+priced out:
+
+    master      choose how many workers of each group take each weekly
+                pattern, so that coverage == demand and no group is over
+                its head count (LP, HiGHS)
+    pricing     for coverage duals pi, every worker group solves its own
+                single-worker problem: the cheapest roster under the hours,
+                one-shift, rest and availability rules, with cost
+                needed + no_pref - pi . roster. This is an exact dynamic
+                program over (last shift, shifts this week, Saturday
+                worked), run per group in a process pool (one process
+                per CPU by default).
+
+Workers with the same availability form one group and share a pricing
+problem. Every pricing round gives the Lagrangian lower bound
+
+    LB(pi) = pi . demand + sum_g n_g min(0, best reduced cost of g)
+
+and after the last round the master is solved as an integer program over
+the generated patterns (price-and-branch), which gives the roster and the
+upper bound. The gap is (UB - LB) / UB.
+"""
+
+# Import Libraries ------------------------------------------------------------
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy import sparse
+from scipy.optimize import linprog, milp, LinearConstraint, Bounds
+
+from pyomo_workforce_scheduling import (SHIFTS, MAX_SHIFTS_PER_WEEK,
+                                        default_demand, schedule_arrays,
+                                        solve_schedule)
+
+# ALLOWED[last, today]: 12 hours rest after an evening or a night shift
+ALLOWED = np.array([[1, 1, 1, 1],   # after a morning
+                    [0, 1, 1, 1],   # after an evening: no morning
+                    [0, 0, 1, 1],   # after a night: only the night again
+                    [1, 1, 1, 1]],  # after a day off
+                   dtype=bool)
+
+
+# Pricing ---------------------------------------------------------------------
+def price_pattern(reduced, allowed, pref_cost=1.0,
+                  max_per_week=MAX_SHIFTS_PER_WEEK):
+    ''' Cheapest single-worker roster for the given shift costs.
+
+        reduced : (n_days, n_shifts) cost of working each shift.
+        allowed : (n_days, n_shifts) availability.
+        The roster repeats after the horizon, so the rest rule also links
+        the last day to the first. Returns (cost, roster) with roster an
+        (n_days, n_shifts) 0/1 array; cost excludes the needed cost.
+    '''
+    D, S = reduced.shape
+    reduced = reduced.tolist()
+    allowed = np.asarray(allowed, dtype=bool).tolist()
+    rest = ALLOWED.tolist()
+    best_cost, best_end = np.inf, None
+    # Fix the first day's action, then close the cycle on it
+    for first in range(S + 1):
+        if first < S and not allowed[0][first]:
+            continue
+        # State (last action, shifts this week, Saturday worked) ->
+        # (cost, previous state); one dict per day for the backtrack
+        start = (first, int(first < S), 0)
+        layers = [{start: (reduced[0][first] if first < S else 0.0, None)}]
+        for d in range(1, D):
+            dow = d % 7
+            layer = {}
+            for state, (base, _) in layers[-1].items():
+                last, used, sat = state
+                if dow == 0:
+                    used, sat = 0, 0
+                for a in range(S + 1):
+                    if not rest[last][a]:
+                        continue
+                    if a < S:
+                        if not allowed[d][a] or used == max_per_week:
+                            continue
+                        c = base + reduced[d][a]
+                        if dow == 6 and not sat:
+                            c += pref_cost
+                        key = (a, used + 1, 1 if dow == 5 else sat)
+                    else:
+                        c, key = base, (a, used, sat)
+                    if key not in layer or c < layer[key][0]:
+                        layer[key] = (c, state)
+            layers.append(layer)
+        for state, (c, _) in layers[-1].items():
+            if rest[state[0]][first] and c < best_cost:
+                best_cost, best_end = c, (layers, state)
+    roster = np.zeros((D, S))
+    layers, state = best_end
+    for d in range(D - 1, -1, -1):
+        if state[0] < S:
+            roster[d, state[0]] = 1
+        state = layers[d][state][1]
+    return best_cost, roster
+
+
+def _price_groups(args):
+    ''' Price a chunk of groups; runs in a worker process. '''
+    reduced, availabilities, pref_cost = args
+    return [price_pattern(reduced, allowed, pref_cost)
+            for allowed in availabilities]
+
+
+# Master ----------------------------------------------------------------------
+def _master_matrix(columns, n_groups, n_cover):
+    ''' Coverage rows then one head-count row per group. '''
+    rows, cols, vals = [], [], []
+    for j, (g, pattern, _) in enumerate(columns):
+        nz = np.flatnonzero(pattern)
+        rows.append(nz)
+        rows.append([n_cover + g])
+        cols.append(np.full(nz.size + 1, j))
+        vals.append(np.ones(nz.size + 1))
+    return sparse.csr_matrix((np.concatenate(vals),
+                              (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(n_cover + n_groups, len(columns)))
+
+
+def decompose_schedule(n_workers, n_weeks=1, demand=None, availability=None,
+                       max_rounds=200, n_workers_pool=None, time_limit=600,
+                       mip_time_limit=60, tol=1e-6, verbose=False):
+    ''' Roster by column generation with a Lagrangian bound.
+
+        availability :   (n_workers, n_days, n_shifts) booleans, or None.
+        n_workers_pool : processes for the pricing problems (default
+                         os.cpu_count(); 1 prices serially in-process).
+        Returns a dict with the roster x in the schedule_arrays column
+        layout, the objective (UB), the lower bound, the gap, the number of
+        rounds and columns and the elapsed time.
+    '''
+    start = time.perf_counter()
+    W, D, S = n_workers, 7 * n_weeks, len(SHIFTS)
+    demand = default_demand(W, n_weeks) if demand is None else \
+        np.asarray(demand, dtype=float)
+    if availability is None:
+        availability = np.ones((W, D, S), dtype=bool)
+    availability = np.asarray(availability, dtype=bool)
+
+    # Workers with the same availability share one pricing problem
+    flat = availability.reshape(W, -1)
+    profiles, group_of, counts = np.unique(flat, axis=0, return_inverse=True,
+                                           return_counts=True)
+    group_of = group_of.ravel()
+    profiles = profiles.reshape(-1, D, S)
+    n_groups = len(profiles)
+    need_cost = float(W * n_weeks + 1)
+    n_cover = D * S
+    big_m = 10 * need_cost
+
+    n_workers_pool = n_workers_pool or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(n_workers_pool) if n_workers_pool > 1 \
+        else None
+    n_chunks = min(n_groups, 4 * n_workers_pool)
+    chunks = np.array_split(np.arange(n_groups), n_chunks)
+
+    def price(reduced):
+        tasks = [(reduced, profiles[c], 1.0) for c in chunks]
+        results = pool.map(_price_groups, tasks) if pool else \
+            map(_price_groups, tasks)
+        return [r for chunk in results for r in chunk]
+
+    columns = []
+    lower_bound = -np.inf
+    # Duals of the all-artificial master: every shift is worth big_m
+    pi = np.full(n_cover, big_m)
+    mu = np.zeros(n_groups)
+    rounds = 0
+    try:
+        while rounds < max_rounds and time.perf_counter() - start < time_limit:
+            rounds += 1
+            priced = price(-pi.reshape(D, S))
+            # Lagrangian bound for these duals
+            best = np.array([cost + need_cost for cost, _ in priced])
+            lower_bound = max(lower_bound, pi.dot(demand.ravel())
+                              + counts.dot(np.minimum(best, 0.0)))
+            new = 0
+            for g, (cost, pattern) in enumerate(priced):
+                if best[g] < mu[g] - tol:
+                    pattern_cost = need_cost + _pref_count(pattern, n_weeks)
+                    columns.append((g, pattern.ravel(), pattern_cost))
+                    new += 1
+            if new == 0:
+                break
+            # Restricted master LP, coverage >= demand with artificials;
+            # as A_ub rows: -coverage <= -demand, head count <= counts
+            A = _master_matrix(columns, n_groups, n_cover)
+            A[:n_cover] *= -1
+            art = sparse.vstack([-sparse.identity(n_cover, format='csr'),
+                                 sparse.csr_matrix((n_groups, n_cover))])
+            c = np.concatenate([[col[2] for col in columns],
+                                np.full(n_cover, big_m)])
+            res = linprog(c, A_ub=sparse.hstack([A, art]).tocsr(),
+                          b_ub=np.concatenate([-demand.ravel(), counts]),
+                          bounds=(0, None), method='highs')
+            pi = -res.ineqlin.marginals[:n_cover]
+            mu = res.ineqlin.marginals[n_cover:]
+            if verbose:
+                print('round {:>3} | columns => {:>6} | LP => {:.1f} | '
+                      'LB => {:.1f}'.format(rounds, len(columns), res.fun,
+                                            lower_bound))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Price-and-branch: integer master over the generated patterns, then
+    # trim over-coverage back to coverage == demand
+    A = _master_matrix(columns, n_groups, n_cover)
+    c = np.array([col[2] for col in columns])
+    lo = np.concatenate([demand.ravel(), np.zeros(n_groups)])
+    hi = np.concatenate([np.full(n_cover, np.inf), counts])
+    res = milp(c, constraints=LinearConstraint(A, lo, hi),
+               integrality=np.ones(len(columns)), bounds=Bounds(0, np.inf),
+               options={'time_limit': mip_time_limit})
+    x, upper_bound = None, np.inf
+    if res.x is not None:
+        rosters = _assign_workers(columns, np.round(res.x).astype(np.int64),
+                                  group_of, W, n_weeks)
+        x = _rosters_to_x(_drop_excess(rosters, demand), n_weeks)
+        upper_bound = float(schedule_cost(x, W, n_weeks))
+    # Every objective value is an integer, so the bound can be rounded up
+    lower_bound = np.ceil(lower_bound - tol)
+    gap = (upper_bound - lower_bound) / upper_bound \
+        if np.isfinite(upper_bound) else np.inf
+    return {'x': x, 'objective': upper_bound, 'lower_bound': lower_bound,
+            'gap': gap, 'rounds': rounds, 'columns': len(columns),
+            'groups': n_groups, 'elapsed': time.perf_counter() - start}
+
+
+def schedule_cost(x, n_workers, n_weeks):
+    ''' The model objective: no_pref count + (no_pref vars + 1) * needed. '''
+    n_works = n_workers * 7 * n_weeks * len(SHIFTS)
+    needed = x[n_works:n_works + n_workers].sum()
+    return x[n_works + n_workers:].sum() + (n_workers * n_weeks + 1) * needed
+
+
+def _pref_count(pattern, n_weeks):
+    ''' Weeks where Sunday is worked without the Saturday before it. '''
+    weeks = pattern.reshape(n_weeks, 7, -1).sum(axis=2)
+    return float(np.sum((weeks[:, 6] > 0) & (weeks[:, 5] == 0)))
+
+
+def _assign_workers(columns, counts, group_of, n_workers, n_weeks):
+    ''' Hand each chosen pattern to workers of its group, in worker order.
+
+        Returns the (n_workers, n_days, n_shifts) rosters.
+    '''
+    rosters = np.zeros((n_workers, 7 * n_weeks, len(SHIFTS)), dtype=bool)
+    free = {g: iter(np.flatnonzero(group_of == g).tolist())
+            for g in set(group_of.tolist())}
+    for (g, pattern, _), k in zip(columns, counts):
+        for _ in range(k):
+            rosters[next(free[g])] = pattern.reshape(rosters.shape[1:])
+    return rosters
+
+
+def _drop_excess(rosters, demand):
+    ''' Remove shifts where coverage exceeds demand.
+
+        Dropping a shift never breaks the hours, one-shift or rest rules.
+        Prefer shifts whose removal does not leave a Sunday without its
+        Saturday, then workers with the fewest shifts, who may drop out.
+    '''
+    W, D, S = rosters.shape
+    excess = rosters.sum(axis=0) - demand
+    for d, s in zip(*np.nonzero(excess > 0)):
+        on = np.flatnonzero(rosters[:, d, s])
+        penalty = np.zeros(on.size)
+        if d % 7 == 5 and d + 1 < D:
+            penalty = rosters[on, d + 1].any(axis=1).astype(float)
+        load = rosters[on].sum(axis=(1, 2))
+        drop = on[np.lexsort((load, penalty))[:int(excess[d, s])]]
+        rosters[drop, d, s] = False
+    return rosters
+
+
+def _rosters_to_x(rosters, n_weeks):
+    ''' Columns in the schedule_arrays layout: works, needed, no_pref. '''
+    W = rosters.shape[0]
+    weeks = rosters.reshape(W, n_weeks, 7, -1).any(axis=3)
+    no_pref = weeks[:, :, 6] & ~weeks[:, :, 5]
+    return np.concatenate([rosters.ravel(), rosters.any(axis=(1, 2)),
+                           no_pref.ravel()]).astype(float)
+
+
+def is_feasible(data, x, tol=1e-6):
+    ''' Check a roster against every row and column bound of the model. '''
+    activity = data['A'].dot(x)
+    return bool(np.all(activity >= data['row_lower'] - tol)
+                and np.all(activity <= data['row_upper'] + tol)
+                and np.all(x <= data['col_upper'] + tol))
+
+
+# Benchmark -------------------------------------------------------------------
+def random_availability(n_workers, n_weeks=1, n_profiles=8, seed=0):
+    ''' Availability from n_profiles weekly profiles.
+
+        Half of the staff is fully available; every other profile rules out
+        one shift type and one day of the week.
+    '''
+    rng = np.random.default_rng(seed)
+    S = len(SHIFTS)
+    profiles = np.ones((n_profiles, 7, S), dtype=bool)
+    for p in range(1, n_profiles):
+        profiles[p, :, rng.integers(S)] = False
+        profiles[p, rng.integers(7), :] = False
+    choice = np.where(rng.random(n_workers) < 0.5, 0,
+                      rng.integers(1, max(n_profiles, 2), n_workers))
+    return np.tile(profiles[choice], (1, n_weeks, 1))
+
+
+def benchmark_decomposition(cases=((10, 1), (500, 4), (5000, 4)),
+                            n_workers_pool=None, monolithic_max_workers=500,
+                            time_limit=300):
+    ''' Decomposition vs the monolithic MIP on the same instances.
+
+        The monolithic HiGHS solve runs up to monolithic_max_workers.
+    '''
+    for W, weeks in cases:
+        availability = random_availability(W, weeks)
+        data = schedule_arrays(W, weeks, availability=availability)
+        res = decompose_schedule(W, weeks, availability=availability,
+                                 n_workers_pool=n_workers_pool,
+                                 time_limit=time_limit)
+        print('workers => {:>5} | weeks => {} | groups => {:>2} | '
+              'decomposition => {:7.2f}s | rounds => {:>3} | columns => {:>5}'
+              ' | UB => {:.0f} | LB => {:.1f} | gap => {:.3%} | feasible => '
+              '{}'.format(W, weeks, res['groups'], res['elapsed'],
+                          res['rounds'], res['columns'], res['objective'],
+                          res['lower_bound'], res['gap'],
+                          res['x'] is not None and is_feasible(data, res['x'])))
+        if W <= monolithic_max_workers:
+            start = time.perf_counter()
+            x, obj, bound, status = solve_schedule(data, time_limit=time_limit)
+            print('{:>34} monolithic => {:7.2f}s | {} | obj => {:.0f} | '
+                  'bound => {:.1f}'.format('', time.perf_counter() - start,
+                                           status, obj, bound))
+
+
+if __name__ == '__main__':
+    benchmark_decomposition()
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+The examples are flat scripts, not a package: put the repository root and
+the pyomo folder on sys.path so tests import them the way the scripts
+import each other.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, 'pyomo')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scipy_box_volume_sweep import sweep_box_volume, save_sweep
+
+
+def test_empty_budgets_give_empty_columns():
+    result = sweep_box_volume([])
+    assert result['xOpt'].shape == (0, 3)
+
+
+def test_npz_path_is_the_file_written(tmp_path):
+    result = sweep_box_volume([10.0], n_workers=1)
+    path = save_sweep(result, str(tmp_path / 'sweep'))
+    assert path.endswith('.npz') and os.path.exists(path)
+    assert save_sweep(result, str(tmp_path / 'b.npz')).endswith('b.npz')
+
+
+def test_parquet_without_engine_warns_and_writes_csv(tmp_path, monkeypatch):
+    def no_engine(*args, **kwargs):
+        raise ImportError('no engine')
+    monkeypatch.setattr(pd.DataFrame, 'to_parquet', no_engine)
+    result = sweep_box_volume([10.0], n_workers=1)
+    with pytest.warns(UserWarning):
+        path = save_sweep(result, str(tmp_path / 'sweep.parquet'))
+    assert path.endswith('sweep.csv')
+    np.testing.assert_allclose(pd.read_csv(path)['budget'], [10.0])
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from conftest import ROOT
+from scipy_constraints import as_variables, seed_variables, make_constraint
+from scipy_beginnners_guide_optimization import constraint2
+
+
+def test_constraint2_accepts_lists_and_duals():
+    assert constraint2([1, 5, 5, 1]) == -12.0
+    jac = make_constraint(constraint2, 'eq')['jac']
+    np.testing.assert_allclose(jac([1.0, 5, 5, 1]), [-2, -10, -10, -2])
+
+
+def test_as_variables_passes_duals_through():
+    x = seed_variables([1.0, 2.0])
+    assert as_variables(x) is x
+    assert as_variables([1, 2]).dtype == float
+
+
+def test_benchmark_runs_as_script():
+    out = subprocess.run([sys.executable, 'scipy_constraints.py'], cwd=ROOT,
+                         capture_output=True, text=True, timeout=300)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.count('analytic') == 2
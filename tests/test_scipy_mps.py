@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from scipy_mps import read_mps
+
+MPS = """NAME          TINY
+ROWS
+ N  COST
+ L  LIM1
+ E  BAL
+COLUMNS
+    X         COST         1.0   LIM1         1.0
+    Y         COST         2.0   BAL          1.0
+RHS
+    RHS       LIM1         4.0   BAL          3.0
+RANGES
+{ranges}
+ENDATA
+"""
+
+
+def _write(tmp_path, ranges):
+    path = tmp_path / 'tiny.mps'
+    path.write_text(MPS.format(ranges=ranges))
+    return str(path)
+
+
+def test_ranges_widen_known_rows(tmp_path):
+    model = read_mps(_write(tmp_path, '    RNG       LIM1         2.0'))
+    np.testing.assert_allclose(model['row_lower'], [2.0, 3.0])
+    np.testing.assert_allclose(model['row_upper'], [4.0, 3.0])
+
+
+@pytest.mark.parametrize('row', ['NOPE', 'COST'])
+def test_ranges_on_unknown_or_objective_row_raise(tmp_path, row):
+    path = _write(tmp_path, '    RNG       {:<8}     2.0'.format(row))
+    with pytest.raises(ValueError, match=row):
+        read_mps(path)
+
+
+def test_touched_source_refreshes_manifest_in_place(tmp_path, monkeypatch):
+    import json
+    import os
+    import scipy_mps
+    path = _write(tmp_path, '    RNG       LIM1         2.0')
+    folder = path + '.npycache'
+    scipy_mps.cached_read_mps(path)
+    os.utime(path, (1, 1))
+    # A touched file must not be re-parsed, only its manifest rewritten
+    monkeypatch.setattr(scipy_mps, 'read_mps', None)
+    model = scipy_mps.cached_read_mps(path)
+    np.testing.assert_allclose(model['row_lower'], [2.0, 3.0])
+    with open(os.path.join(folder, 'manifest.json')) as f:
+        assert json.load(f)['source']['mtime'] == 1
+    assert sorted(os.listdir(folder)) == sorted(
+        [key + '.npy' for key in scipy_mps._ARRAYS] + ['manifest.json'])
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from scipy_random_search import (random_search_topk,
+                                 parallel_random_search_topk)
+from scipy_rosen import rosen
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_k_must_be_positive(k):
+    with pytest.raises(ValueError, match='k must be at least 1'):
+        random_search_topk(rosen, 1000, 4, k=k)
+    with pytest.raises(ValueError, match='k must be at least 1'):
+        parallel_random_search_topk(rosen, 1000, 4, k=k, n_workers=1)
+
+
+def test_topk_is_sorted_ascending_by_y():
+    y, label, order = random_search_topk(rosen, 5000, 4, k=20, rng=0)
+    assert y.size == 20 and np.all(np.diff(y) >= 0)
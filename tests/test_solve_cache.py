@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from pyomo.environ import ConcreteModel, Param, Var, Objective, exp
+
+from solve_cache import model_hash, canonical_form
+
+
+def _exp_model(p):
+    model = ConcreteModel()
+    model.p = Param(initialize=p, mutable=True)
+    model.x = Var(bounds=(0, 2))
+    model.obj = Objective(expr=exp(model.p * model.x) + model.x)
+    return model
+
+
+def test_nonlinear_param_values_change_the_hash():
+    assert model_hash(_exp_model(1)) != model_hash(_exp_model(2))
+    assert model_hash(_exp_model(2)) == model_hash(_exp_model(2))
+
+
+def test_nonlinear_remainder_prints_param_values():
+    model = _exp_model(2)
+    nonlinear = canonical_form(model)['objectives'][0][2][3]
+    assert 'p*x' not in nonlinear and '2' in nonlinear
+    model.p = 3
+    assert canonical_form(model)['objectives'][0][2][3] != nonlinear